@@ -16,6 +16,7 @@ from .authentication.api.router import auth
 from .routes import (
     upload_proxy,
     download_proxy,
+    status_proxy,
     api_provider_proxy
 )
 from api_gateway.handlers.exception_handlers import register_exception_handlers
@@ -78,6 +79,8 @@ async def lifespan(app: FastAPI):
     await redis.close()
 
     await upload_proxy._client.aclose()
+    await download_proxy._client.aclose()
+    await status_proxy._client.aclose()
 
 
 app = FastAPI(
@@ -113,6 +116,7 @@ register_exception_handlers(app)
 
 app.include_router(upload_proxy.upload)
 app.include_router(download_proxy.download)
+app.include_router(status_proxy.status_proxy)
 app.include_router(api_provider_proxy.api_provider)
 app.include_router(auth)
 
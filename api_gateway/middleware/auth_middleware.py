@@ -107,12 +107,17 @@ class DualAuthMiddleware:
     scope_rules = {
         "/v1/upload/get": ["document:upload"],
         "/v1/upload/presigned": ["document:upload"],
+        "/v1/upload/complete": ["document:upload"],
         "/v1/upload/conversion/start": ["convert:create"],
         "/v1/upload/merge/start": ["convert:create"],
+        "/v1/upload/split/start": ["convert:create"],
+        "/v1/upload/image/start": ["convert:create"],
         "/v1/read": ["document:read"],
         "/v1/documents/delete": ["document:delete"],
         "/v1/convert/result": ["convert:read"],
+        "/v1/status": ["convert:read"],
         "/v1/convert/download": ["convert:download"],
+        "/v1/download": ["convert:download"],
         "/v1/convert/cancel": ["convert:cancel"],
         "/v1/api": ["api:read", "api:write"],
     }
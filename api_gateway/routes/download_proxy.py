@@ -1,17 +1,18 @@
 import httpx
-from fastapi import APIRouter, Request, Response, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Request
 
 from ..settings import settings
+from .streaming import stream_proxy
 
 download = APIRouter()
 
 
-_client = httpx.AsyncClient(timeout=10)
+# ZIP downloads stream for as long as the archive takes to build; the
+# read timeout only bounds the gap between two chunks.
+_client = httpx.AsyncClient(timeout=httpx.Timeout(10, read=60))
 
 STRIP_REQUEST_HEADERS = {"host", "content-length",
                          "connection", "transfer-encoding"}
-STRIP_RESPONSE_HEADERS = {"content-length", "connection", "transfer-encoding"}
 
 
 def _forward_headers(request: Request) -> dict:
@@ -28,40 +29,13 @@ def _forward_headers(request: Request) -> dict:
     return headers
 
 
-def _forward_response(upstream: httpx.Response) -> dict:
-
-    return Response(
-        content=upstream.content,
-        status_code=upstream.status_code,
-        headers={
-            key: value
-            for key, value in upstream.headers.items()
-            if key.lower() not in STRIP_RESPONSE_HEADERS
-        },
-        media_type=upstream.headers.get("content-type")
-    )
-
-
-@download.api_route("/v1/upload/{path:path}", methods=["GET", "POST"])
+@download.api_route("/v1/download{path:path}", methods=["GET", "POST"])
 async def proxy_download(path: str, request: Request):
 
-    body = None
-    if request.method in ['POST', 'PUT', "PATCH"]:
-        body = await request.body()
-
-    try:
-        upstream_response = await _client.request(
-            method=request.method,
-            url=f"{settings.DOWNLOAD_SERVICE_URL}/{path}",
-            headers=_forward_headers(request),
-            content=body,
-            params=request.query_params
-        )
-
-        return _forward_response(upstream=upstream_response)
-
-    except httpx.TimeoutException:
-        raise HTTPException(504, "Upload service timed out")
-
-    except httpx.RequestError:
-        raise HTTPException(502, "Upload service unreachable")
+    return await stream_proxy(
+        _client,
+        request,
+        url=f"{settings.DOWNLOAD_SERVICE_URL}/download{path}",
+        headers=_forward_headers(request),
+        service="Download service"
+    )
@@ -0,0 +1,43 @@
+import httpx
+from fastapi import APIRouter, Request
+
+from ..settings import settings
+from .streaming import stream_proxy
+
+status_proxy = APIRouter()
+
+# Long-polls hold a request for up to a minute and SSE streams stay open;
+# the read timeout only has to outlast the service's keepalives.
+_client = httpx.AsyncClient(timeout=httpx.Timeout(10, read=90))
+
+STRIP_REQUEST_HEADERS = {"host", "content-length",
+                         "connection", "transfer-encoding"}
+
+
+def _forward_headers(request: Request) -> dict:
+    headers = {
+        key: value
+        for key, value in request.headers.items()
+        if key.lower() not in STRIP_REQUEST_HEADERS
+    }
+
+    headers["User-Id"] = request.state.user.user_id
+    headers["Request-Id"] = request.state.request_id
+    headers["X-Auth-Type"] = request.state.user.auth_type
+
+    return headers
+
+
+@status_proxy.get("/v1/status/{path:path}")
+async def proxy_status(path: str, request: Request):
+    """
+    Streams the status service's response through as it arrives, so SSE
+    events and long-poll answers are not held back by the gateway.
+    """
+    return await stream_proxy(
+        _client,
+        request,
+        url=f"{settings.STATUS_SERVICE_URL}/status/{path}",
+        headers=_forward_headers(request),
+        service="Status service"
+    )
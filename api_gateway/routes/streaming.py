@@ -0,0 +1,83 @@
+from typing import AsyncIterator
+
+import httpx
+from fastapi import Request, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from ..settings import settings
+
+# Bodies are passed through as raw bytes, so the upstream length and
+# encoding still describe them.
+STRIP_RESPONSE_HEADERS = {"connection", "transfer-encoding"}
+
+
+class RequestBodyTooLarge(Exception):
+    pass
+
+
+async def _limited_body(request: Request, limit: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise RequestBodyTooLarge()
+        if chunk:
+            yield chunk
+
+
+async def stream_proxy(
+    client: httpx.AsyncClient,
+    request: Request,
+    url: str,
+    headers: dict,
+    service: str,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+) -> StreamingResponse:
+    """
+    Forwards ``request`` to ``url`` without buffering either body: the
+    request body is streamed upstream as it arrives, cut off with 413
+    past MAX_REQUEST_BODY_BYTES, and the upstream response is streamed
+    back byte for byte as soon as its headers are in.
+    """
+    content = None
+    if request.method in ["POST", "PUT", "PATCH"]:
+        length = request.headers.get("content-length")
+        if length and length.isdigit():
+            if int(length) > settings.MAX_REQUEST_BODY_BYTES:
+                raise HTTPException(413, "Request body too large")
+            headers["Content-Length"] = length
+        content = _limited_body(request, settings.MAX_REQUEST_BODY_BYTES)
+
+    upstream_request = client.build_request(
+        method=request.method,
+        url=url,
+        headers=headers,
+        content=content,
+        params=request.query_params,
+        timeout=timeout
+    )
+
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+
+    except RequestBodyTooLarge:
+        raise HTTPException(413, "Request body too large")
+
+    except httpx.TimeoutException:
+        raise HTTPException(504, f"{service} timed out")
+
+    except httpx.RequestError:
+        raise HTTPException(502, f"{service} unreachable")
+
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers={
+            key: value
+            for key, value in upstream.headers.items()
+            if key.lower() not in STRIP_RESPONSE_HEADERS
+        },
+        media_type=upstream.headers.get("content-type"),
+        background=BackgroundTask(upstream.aclose)
+    )
@@ -8,8 +8,12 @@ class Settings(BaseSettings):
 
     UPLOAD_SERVICE_URL: str
     DOWNLOAD_SERVICE_URL: str
+    STATUS_SERVICE_URL: str
     API_PROVIDER_SERVICE_URL: str
 
+    # Largest request body the proxies stream through to a service
+    MAX_REQUEST_BODY_BYTES: int = 1024 * 1024
+
     # Database
     DB_NAME: str
     DB_USER: str
@@ -0,0 +1,9 @@
+"""
+Offline benchmarks for the conversion engines in ``conversion_workers``.
+
+    python -m benchmarks --repeat 5 --output benchmark-results.json
+
+Every engine runs against local files only: ``sample.pdf`` plus a
+generated corpus of text, image and mixed documents, and any PDF/DOCX
+files in ``--corpus``.
+"""
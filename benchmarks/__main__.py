@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from pathlib import Path
+
+# The engines never touch storage or the queue, but conversion_workers
+# settings insists on these being present.
+for name in (
+    "SUPABASE_URL", "SUPABASE_SERVICE_KEY", "SUPABASE_CONVERTED_BUCKET",
+    "SUPABASE_RAW_BUCKET", "SUPABASE_COMPRESSED_BUCKET", "RABBITMQ_URL", "QUEUE_NAME",
+):
+    os.environ.setdefault(name, "offline-benchmark")
+
+from benchmarks.corpus import build_corpus
+from benchmarks.engines import ENGINES
+from benchmarks.runner import measure
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the conversion engines over a local document corpus.")
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help="comma separated engine names (default: all)")
+    parser.add_argument("--pages", default="1,10,40",
+                        help="page counts of the synthetic documents")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per engine and document")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="untimed runs before measuring")
+    parser.add_argument("--corpus", type=Path, default=None,
+                        help="directory with extra .pdf/.docx files")
+    parser.add_argument("--workdir", type=Path,
+                        default=Path(os.environ.get("TMPDIR", "/tmp")) / "docconvert-benchmark",
+                        help="where the synthetic corpus and scratch files live")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"),
+                        help="JSON report path")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    names = [name.strip() for name in args.engines.split(",") if name.strip()]
+    unknown = [name for name in names if name not in ENGINES]
+    if unknown:
+        print(f"[bench] unknown engines: {', '.join(unknown)}; known: {', '.join(ENGINES)}")
+        return 2
+
+    page_counts = [int(pages) for pages in args.pages.split(",") if pages.strip()]
+    corpus = build_corpus(args.workdir / "corpus", page_counts, args.corpus)
+    scratch = args.workdir / "scratch"
+    scratch.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for name in names:
+        engine = ENGINES[name]
+        for document in corpus:
+            if document.kind != engine.input_kind:
+                continue
+            result = measure(engine, document, args.repeat, args.warmup, scratch)
+            results.append(result)
+            print(_summary(result))
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "page_workers": os.environ.get("PAGE_WORKERS"),
+        },
+        "corpus": [document.to_dict() for document in corpus],
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"[bench] report written to {args.output}")
+
+    return 1 if any("error" in result for result in results) else 0
+
+
+def _summary(result: dict) -> str:
+    label = f"{result['engine']:<22} {result['document']:<14}"
+    if "skipped" in result:
+        return f"[bench] {label} skipped: {result['skipped']}"
+    if "error" in result:
+        return f"[bench] {label} error: {result['error']}"
+    return (
+        f"[bench] {label} p50={result['p50_seconds']:.3f}s p95={result['p95_seconds']:.3f}s "
+        f"pages/s={result['pages_per_second']} rss={result['peak_rss_mib']}MiB "
+        f"ratio={result['size_ratio']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import Optional
+
+import fitz
+import numpy as np
+from docx import Document as DocxDocument
+
+SAMPLE_PDF = Path(__file__).resolve().parents[1] / "sample.pdf"
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim "
+    "veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea "
+    "commodo consequat. "
+)
+
+
+class CorpusDocument:
+
+    def __init__(self, name: str, path: Path, kind: str, pages: int):
+        self.name = name
+        self.path = path
+        self.kind = kind  # "pdf" or "docx"
+        self.pages = pages
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "pages": self.pages,
+            "bytes": self.path.stat().st_size,
+        }
+
+
+def _photo(width: int, height: int, seed: int) -> fitz.Pixmap:
+    # Smooth gradients plus noise: compresses like a photo, not like a chart.
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([
+        x * 255 // width,
+        y * 255 // height,
+        (x + y + seed * 37) % 256,
+    ], axis=-1)
+    pixels = (pixels + rng.integers(0, 24, pixels.shape)).clip(0, 255).astype(np.uint8)
+    return fitz.Pixmap(fitz.csRGB, width, height, pixels.tobytes(), False)
+
+
+def make_pdf(path: Path, pages: int, text: bool = True, images: bool = False) -> Path:
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), f"Benchmark page {number + 1}", fontsize=18)
+            page.insert_textbox(fitz.Rect(72, 100, 523, 420), LOREM * 6, fontsize=11)
+            page.draw_rect(fitz.Rect(72, 430, 523, 440), color=(0, 0, 0), fill=(0.8, 0.8, 0.8))
+        if images:
+            page.insert_image(fitz.Rect(72, 450, 523, 770),
+                              pixmap=_photo(1800, 1280, number))
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def make_docx(path: Path, pages: int) -> Path:
+    document = DocxDocument()
+    for number in range(pages):
+        document.add_heading(f"Benchmark page {number + 1}", level=1)
+        for _ in range(4):
+            document.add_paragraph(LOREM * 2)
+        table = document.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = "cell"
+        if number < pages - 1:
+            document.add_page_break()
+    document.save(path)
+    return path
+
+
+def _page_count(path: Path) -> int:
+    if path.suffix.lower() != ".pdf":
+        return 0
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def build_corpus(workdir: Path, page_counts: list[int], extra_dir: Optional[Path] = None) -> list[CorpusDocument]:
+    """
+    Writes the synthetic documents into ``workdir`` (reused if already
+    there) and returns them together with sample.pdf and ``extra_dir``.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    corpus = [CorpusDocument("sample", SAMPLE_PDF, "pdf", _page_count(SAMPLE_PDF))]
+
+    for pages in page_counts:
+        for name, text, images in (("text", True, False), ("image", False, True), ("mixed", True, True)):
+            path = workdir / f"{name}_{pages}p.pdf"
+            if not path.exists():
+                make_pdf(path, pages, text=text, images=images)
+            corpus.append(CorpusDocument(f"{name}_{pages}p", path, "pdf", pages))
+
+        path = workdir / f"text_{pages}p.docx"
+        if not path.exists():
+            make_docx(path, pages)
+        # Page count of a DOCX is only known after layout; use the source one.
+        corpus.append(CorpusDocument(f"text_{pages}p", path, "docx", pages))
+
+    if extra_dir is not None:
+        for path in sorted(extra_dir.iterdir()):
+            kind = path.suffix.lower().lstrip(".")
+            if kind in ("pdf", "docx"):
+                corpus.append(CorpusDocument(path.stem, path, kind, _page_count(path)))
+
+    return corpus
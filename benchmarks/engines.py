@@ -0,0 +1,93 @@
+import shutil
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class BenchEngine:
+    """
+    One conversion path: which corpus documents it accepts, and how to
+    run it on a local input. ``available`` returns a reason when the
+    engine cannot run on this machine.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        input_kind: str,
+        output_suffix: str,
+        run: Callable[[Path, Path, Path], Path],
+        available: Callable[[], Optional[str]] = lambda: None,
+        copies: int = 1,
+    ):
+        self.name = name
+        self.input_kind = input_kind
+        self.output_suffix = output_suffix
+        self.run = run
+        self.available = available
+        # How many times one run consumes its input (merge joins copies)
+        self.copies = copies
+
+
+def _needs(binary: str) -> Callable[[], Optional[str]]:
+    def check() -> Optional[str]:
+        return None if shutil.which(binary) else f"{binary} not installed"
+    return check
+
+
+def _pdf2docx(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.docx_engine import PdfToDocxEngine
+    return PdfToDocxEngine().convert(input_path, output_path, scratch)
+
+
+def _pptx(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.pptx_engine import PdfToPptxEngine
+    return PdfToPptxEngine().convert(input_path, output_path)
+
+
+def _libreoffice(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.libreoffice import LibreOfficeConverter
+    return LibreOfficeConverter().convert(input_path, scratch / "libreoffice", "pdf")
+
+
+def _ghostscript(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.compress_engine import ghostscript_compress
+    ghostscript_compress("benchmark", input_path, output_path, "ebook")
+    return output_path
+
+
+def _pymupdf_compress(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.compress_engine import PdfImageCompressionEngine
+    return PdfImageCompressionEngine("ebook").compress(input_path, output_path)
+
+
+MERGE_COPIES = 4
+
+
+def _merge(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.merge_engine import PdfMergeEngine
+    return PdfMergeEngine().merge([input_path] * MERGE_COPIES, output_path)
+
+
+def _split(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.split_engine import PdfSplitEngine
+    return PdfSplitEngine("every", every=1).split(input_path, output_path)
+
+
+def _images(input_path: Path, output_path: Path, scratch: Path) -> Path:
+    from conversion_workers.converter.image_engine import PdfToImageEngine
+    return PdfToImageEngine(150, "png").convert(input_path, output_path)
+
+
+ENGINES = {
+    engine.name: engine
+    for engine in (
+        BenchEngine("pdf2docx", "pdf", ".docx", _pdf2docx),
+        BenchEngine("pymupdf_pptx", "pdf", ".pptx", _pptx),
+        BenchEngine("libreoffice_pdf", "docx", ".pdf", _libreoffice, _needs("soffice")),
+        BenchEngine("ghostscript_compress", "pdf", ".pdf", _ghostscript, _needs("gs")),
+        BenchEngine("pymupdf_compress", "pdf", ".pdf", _pymupdf_compress),
+        BenchEngine("merge", "pdf", ".pdf", _merge, copies=MERGE_COPIES),
+        BenchEngine("split", "pdf", ".zip", _split),
+        BenchEngine("pymupdf_image", "pdf", ".zip", _images),
+    )
+}
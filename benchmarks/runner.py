@@ -0,0 +1,97 @@
+import shutil
+import time
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.corpus import CorpusDocument
+from benchmarks.engines import BenchEngine, ENGINES
+
+
+def run_case(engine_name: str, input_path: str, repeat: int, warmup: int, workdir: str) -> dict:
+    """
+    Runs one engine on one document ``warmup + repeat`` times. Executed in
+    a fresh process so peak RSS belongs to this case alone; page workers
+    the engine spawns are included through RUSAGE_CHILDREN.
+    """
+    engine = ENGINES[engine_name]
+    timings = []
+    output_bytes = None
+
+    for run in range(warmup + repeat):
+        scratch = Path(tempfile.mkdtemp(prefix="bench_", dir=workdir))
+        try:
+            start = time.perf_counter()
+            output = engine.run(Path(input_path),
+                                scratch / f"output{engine.output_suffix}", scratch)
+            elapsed = time.perf_counter() - start
+
+            if run >= warmup:
+                timings.append(elapsed)
+                output_bytes = output.stat().st_size
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    # ru_maxrss is in KiB on Linux
+    peak_kib = max(
+        _own_peak_kib(),
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return {"timings": timings, "output_bytes": output_bytes, "peak_rss_bytes": peak_kib * 1024}
+
+
+def _own_peak_kib() -> int:
+    # ru_maxrss survives exec, so a spawned process would report the
+    # benchmark driver's peak; VmHWM belongs to this address space only.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(engine: BenchEngine, document: CorpusDocument, repeat: int, warmup: int, workdir: Path) -> dict:
+    input_bytes = document.path.stat().st_size * engine.copies
+    pages = document.pages * engine.copies
+
+    result = {
+        "engine": engine.name,
+        "document": document.name,
+        "pages": pages,
+        "input_bytes": input_bytes,
+    }
+
+    skipped = engine.available()
+    if skipped:
+        return {**result, "skipped": skipped}
+
+    executor = ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        raw = executor.submit(
+            run_case, engine.name, str(document.path), repeat, warmup, str(workdir)).result()
+    except Exception as e:
+        return {**result, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        executor.shutdown(wait=True)
+
+    timings = raw["timings"]
+    p50 = float(np.percentile(timings, 50))
+    return {
+        **result,
+        "output_bytes": raw["output_bytes"],
+        "size_ratio": round(raw["output_bytes"] / input_bytes, 4),
+        "runs": len(timings),
+        "p50_seconds": round(p50, 4),
+        "p95_seconds": round(float(np.percentile(timings, 95)), 4),
+        "mean_seconds": round(float(np.mean(timings)), 4),
+        "pages_per_second": round(pages / p50, 2) if pages and p50 > 0 else None,
+        "peak_rss_mib": round(raw["peak_rss_bytes"] / 2**20, 1),
+    }
@@ -0,0 +1,183 @@
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import fitz
+import numpy as np
+
+from conversion_workers.settings import settings
+from conversion_workers.converter.parallel import page_workers, map_in_processes
+from conversion_workers.exception import CompressionFailedError
+
+# Same preset names as Ghostscript's -dPDFSETTINGS: (target dpi, JPEG quality)
+QUALITY_PRESETS = {
+    "screen": (72, 50),
+    "ebook": (150, 70),
+    "printer": (300, 85),
+    "prepress": (300, 90),
+}
+
+# Only downsample images whose effective resolution is this much above
+# the target, like Ghostscript's default downsample threshold.
+DOWNSAMPLE_THRESHOLD = 1.5
+
+
+def recompress_images(input_pdf: str, targets: list[tuple[int, int, int]], quality: int) -> list[tuple]:
+    """
+    Downsamples and JPEG-encodes the given ``(xref, width, height)``
+    images. Returns ``(xref, data, width, height, colorspace)`` for every
+    image that came out smaller than its original stream. Runs in a pool
+    process; the document is opened per call.
+    """
+    results = []
+    with fitz.open(input_pdf) as doc:
+        for xref, width, height in targets:
+            pix = fitz.Pixmap(doc, xref)
+            if pix.alpha:
+                pix = fitz.Pixmap(pix, 0)
+            if pix.colorspace is None:
+                continue
+            if pix.colorspace.n not in (1, 3):
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+                pix.height, pix.stride)[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+            if pix.n == 3:
+                pixels = pixels[:, :, ::-1]  # opencv expects BGR
+
+            if (width, height) != (pix.width, pix.height):
+                pixels = cv2.resize(pixels, (width, height), interpolation=cv2.INTER_AREA)
+
+            ok, encoded = cv2.imencode(
+                ".jpg", pixels, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                continue
+
+            data = encoded.tobytes()
+            if len(data) < len(doc.xref_stream_raw(xref)):
+                colorspace = "/DeviceRGB" if pix.n == 3 else "/DeviceGray"
+                results.append((xref, data, width, height, colorspace))
+    return results
+
+
+def ghostscript_compress(job_id: str, input_pdf: Path, output_pdf: Path, quality: str) -> None:
+    result = subprocess.run(
+        [
+            "gs",
+            "-sDEVICE=pdfwrite",
+            "-dCompatibilityLevel=1.4",
+            f"-dPDFSETTINGS=/{quality}",
+            "-dNOPAUSE",
+            "-dQUIET",
+            "-dBATCH",
+            f"-sOutputFile={output_pdf}",
+            str(input_pdf),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        print(
+            f"[worker] error during compression for job {job_id}: {result.stderr.decode(errors='ignore')}")
+        raise CompressionFailedError(
+            f"Compression failed: {result.stderr.decode(errors='ignore')}")
+
+
+class PdfImageCompressionEngine:
+    """
+    Compresses a PDF by re-encoding its embedded images only.
+
+    Each image is downsampled to the preset resolution at the largest size
+    it is drawn on any page and re-encoded as JPEG, in parallel across
+    processes. Page content streams, fonts and vector graphics are copied
+    unchanged, and an image is only replaced when the result is smaller.
+    """
+
+    def __init__(self, quality: str = "ebook", workers: Optional[int] = None):
+        if quality not in QUALITY_PRESETS:
+            raise CompressionFailedError(
+                f"Unsupported compression quality: {quality}")
+        self.dpi, self.jpeg_quality = QUALITY_PRESETS[quality]
+        self.workers = page_workers(workers)
+
+    def compress(self, input_pdf: Path, output_pdf: Path) -> Path:
+        try:
+            with fitz.open(input_pdf) as doc:
+                if doc.needs_pass:
+                    raise CompressionFailedError(
+                        "Compression failed: document is password protected")
+
+                targets = self._plan(doc)
+                chunks = [targets[i::self.workers] for i in range(self.workers)]
+                tasks = [(str(input_pdf), chunk, self.jpeg_quality)
+                         for chunk in chunks if chunk]
+                replaced = map_in_processes(recompress_images, tasks, self.workers)
+
+                for result in replaced:
+                    for xref, data, width, height, colorspace in result:
+                        self._replace(doc, xref, data, width, height, colorspace)
+
+                doc.save(output_pdf, garbage=3, deflate=True)
+
+        except CompressionFailedError:
+            raise
+        except Exception as e:
+            raise CompressionFailedError(f"Compression failed: {e}") from e
+
+        return output_pdf
+
+    def _plan(self, doc: fitz.Document) -> list[tuple[int, int, int]]:
+        """
+        Target pixel size for every image worth re-encoding, from the
+        largest rectangle it is drawn into.
+        """
+        largest: dict[int, tuple[float, float]] = {}
+        sizes: dict[int, tuple[int, int]] = {}
+
+        for page in doc:
+            for image in page.get_images(full=True):
+                xref, smask, width, height = image[0], image[1], image[2], image[3]
+                if xref in sizes or not self._eligible(doc, xref):
+                    continue
+                rects = page.get_image_rects(xref)
+                if not rects:
+                    continue
+                shown = largest.get(xref, (0.0, 0.0))
+                largest[xref] = (
+                    max([shown[0]] + [rect.width for rect in rects]),
+                    max([shown[1]] + [rect.height for rect in rects]),
+                )
+                sizes.setdefault(xref, (width, height))
+
+        targets = []
+        for xref, (shown_w, shown_h) in largest.items():
+            width, height = sizes[xref]
+            target_w = max(1, round(shown_w / 72 * self.dpi))
+            target_h = max(1, round(shown_h / 72 * self.dpi))
+            if width <= target_w * DOWNSAMPLE_THRESHOLD or height <= target_h * DOWNSAMPLE_THRESHOLD:
+                target_w, target_h = width, height
+            targets.append((xref, target_w, target_h))
+        return targets
+
+    @staticmethod
+    def _eligible(doc: fitz.Document, xref: int) -> bool:
+        # Stencil masks, images with custom decode arrays and tiny images
+        # are left as they are.
+        if doc.xref_get_key(xref, "ImageMask")[1] == "true":
+            return False
+        if doc.xref_get_key(xref, "Decode")[0] != "null":
+            return False
+        if doc.xref_get_key(xref, "BitsPerComponent")[1] not in ("8", "null"):
+            return False
+        return len(doc.xref_stream_raw(xref)) >= settings.COMPRESSION_MIN_IMAGE_BYTES
+
+    @staticmethod
+    def _replace(doc: fitz.Document, xref: int, data: bytes, width: int, height: int, colorspace: str) -> None:
+        doc.update_stream(xref, data, compress=0)
+        doc.xref_set_key(xref, "Filter", "/DCTDecode")
+        doc.xref_set_key(xref, "DecodeParms", "null")
+        doc.xref_set_key(xref, "Width", str(width))
+        doc.xref_set_key(xref, "Height", str(height))
+        doc.xref_set_key(xref, "ColorSpace", colorspace)
+        doc.xref_set_key(xref, "BitsPerComponent", "8")
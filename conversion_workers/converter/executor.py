@@ -0,0 +1,230 @@
+import os
+import signal
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from conversion_workers.settings import settings
+from conversion_workers.exception import (
+    LibreOfficeNotFoundError,
+    FileNotFoundError,
+    ConversionTimeoutError,
+    ConversionFailedError,
+    UploadFailedError,
+    CompressionFailedError,
+    ScratchQuotaExceededError,
+)
+
+# Exceptions that cross the process boundary unchanged. Anything else is
+# wrapped in ConversionFailedError so the parent never receives an
+# exception it cannot unpickle.
+TYPED_ERRORS = (
+    LibreOfficeNotFoundError,
+    FileNotFoundError,
+    ConversionTimeoutError,
+    ConversionFailedError,
+    UploadFailedError,
+    CompressionFailedError,
+    ScratchQuotaExceededError,
+)
+
+# Extra time the parent waits past the in-process alarm before it gives
+# up on a child that is stuck inside native code.
+TIMEOUT_GRACE_SECONDS = 30
+
+
+def fetch_job(data: dict):
+    """
+    Pipeline fetch stage. Returns a StagedJob whose scratch space the
+    caller must release once the job is done.
+    """
+    from conversion_workers.storage.s3_client import supabase
+    from conversion_workers.converter.worker import JobStages, StagedJob
+    from shared_database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return JobStages(supabase, db).fetch(StagedJob(data))
+    finally:
+        db.close()
+
+
+def publish_job(staged) -> None:
+    """
+    Pipeline publish stage.
+    """
+    from conversion_workers.storage.s3_client import supabase
+    from conversion_workers.converter.worker import JobStages
+    from shared_database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        JobStages(supabase, db).publish(staged)
+    finally:
+        db.close()
+
+
+def fail_job(staged) -> None:
+    """
+    Marks a job failed after its convert stage raised.
+    """
+    from conversion_workers.storage.s3_client import supabase
+    from conversion_workers.converter.worker import JobStages
+    from shared_database.connection import SessionLocal
+
+    db = SessionLocal()
+    try:
+        JobStages(supabase, db).fail(staged)
+    finally:
+        db.close()
+
+
+def _raise_timeout(signum, frame):
+    raise ConversionTimeoutError("Conversion exceeded the task timeout")
+
+
+def _init_process():
+    # Ctrl-C goes to the whole process group; let the parent decide.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGALRM, _raise_timeout)
+
+
+def convert_job(staged, timeout: int):
+    """
+    Pool entry point for the pipeline convert stage.
+    """
+    from conversion_workers.converter.worker import convert_staged
+
+    return run_task(convert_staged, timeout, staged)
+
+
+def convert_batch_job(batch: list, timeout: int) -> list:
+    """
+    Pool entry point for a LibreOffice micro-batch.
+    """
+    from conversion_workers.converter.worker import convert_batch
+
+    return run_task(convert_batch, timeout, batch)
+
+
+def run_task(fn, timeout: int, *args):
+    """
+    Arms a per-task alarm around ``fn(*args)`` and normalises exceptions
+    so they pickle cleanly back to the event loop process.
+    """
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    except TYPED_ERRORS:
+        raise
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ConversionFailedError(f"{type(e).__name__}: {e}") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ConversionPool:
+    """
+    Process pool that runs CPU-bound conversions on separate cores so the
+    aio-pika event loop keeps serving heartbeats and acks.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        task_timeout: Optional[int] = None,
+        max_tasks_per_child: Optional[int] = None,
+    ):
+        self.size = size or settings.CONVERSION_POOL_SIZE or os.cpu_count() or 1
+        self.task_timeout = task_timeout or settings.CONVERSION_TASK_TIMEOUT
+        self.max_tasks_per_child = max_tasks_per_child or settings.CONVERSION_MAX_TASKS_PER_CHILD
+        if settings.LIBREOFFICE_POOL_SIZE > 0 and self.max_tasks_per_child < settings.LIBREOFFICE_MAX_CONVERSIONS:
+            # Replacing a process kills the soffice it owns; recycling
+            # sooner would cut every instance short of its own limit.
+            print(f"[worker] raising max tasks per conversion process from "
+                  f"{self.max_tasks_per_child} to LIBREOFFICE_MAX_CONVERSIONS "
+                  f"({settings.LIBREOFFICE_MAX_CONVERSIONS})")
+            self.max_tasks_per_child = settings.LIBREOFFICE_MAX_CONVERSIONS
+        # One single-process executor per slot, so a hung or crashed
+        # conversion takes down only its own process and not the jobs
+        # running next to it.
+        self._executors: list[Optional[ProcessPoolExecutor]] = [None] * self.size
+        self._free_slots: Optional[asyncio.Queue] = None
+
+    def _get_executor(self, slot: int) -> ProcessPoolExecutor:
+        if self._executors[slot] is None:
+            self._executors[slot] = ProcessPoolExecutor(
+                max_workers=1,
+                # spawn: never fork a process holding DB, HTTP and AMQP sockets
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+            print(f"[worker] conversion process {slot + 1}/{self.size} started")
+        return self._executors[slot]
+
+    async def submit(self, fn, *args, timeout: Optional[int] = None):
+        """
+        Runs ``fn(*args)`` in a free pool process, waiting for one if all
+        are busy. The callable must be a module-level function so it can
+        be pickled.
+        """
+        if self._free_slots is None:
+            self._free_slots = asyncio.Queue()
+            for slot in range(self.size):
+                self._free_slots.put_nowait(slot)
+
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.task_timeout
+        slot = await self._free_slots.get()
+        try:
+            future = loop.run_in_executor(self._get_executor(slot), fn, *args)
+            return await asyncio.wait_for(future, timeout + TIMEOUT_GRACE_SECONDS)
+
+        except asyncio.TimeoutError as e:
+            # The child ignored its alarm (stuck in native code). A running
+            # task cannot be cancelled, so replace its process; the other
+            # slots keep converting.
+            print(f"[worker] conversion process {slot + 1} hung, replacing it")
+            self._recycle(slot)
+            raise ConversionTimeoutError(
+                "Conversion exceeded the task timeout") from e
+
+        except BrokenProcessPool as e:
+            print(f"[worker] conversion process {slot + 1} died, replacing it")
+            self._recycle(slot)
+            raise ConversionFailedError(
+                "Conversion process terminated unexpectedly") from e
+
+        finally:
+            self._free_slots.put_nowait(slot)
+
+    async def convert(self, staged):
+        return await self.submit(convert_job, staged, self.task_timeout)
+
+    async def convert_batch(self, batch: list) -> list:
+        # One soffice run converts the whole batch, so it gets each job's
+        # allowance rather than one job's.
+        timeout = self.task_timeout * len(batch)
+        return await self.submit(convert_batch_job, batch, timeout, timeout=timeout)
+
+    def _recycle(self, slot: int) -> None:
+        executor, self._executors[slot] = self._executors[slot], None
+        if executor is None:
+            return
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        for slot, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+                self._executors[slot] = None
+
+
+conversion_pool = ConversionPool()
@@ -0,0 +1,143 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import fitz
+import numpy as np
+
+from conversion_workers.settings import settings
+from conversion_workers.converter.parallel import page_workers, page_ranges, map_in_processes
+from conversion_workers.converter.split_engine import parse_ranges
+from conversion_workers.exception import ConversionFailedError
+
+# format -> (file suffix, content type)
+IMAGE_FORMATS = {
+    "png": (".png", "image/png"),
+    "jpeg": (".jpg", "image/jpeg"),
+    "webp": (".webp", "image/webp"),
+}
+
+
+def render_pages(input_pdf: str, numbers: list[int], dpi: int, image_format: str, quality: int, output_dir: str) -> list[str]:
+    """
+    Renders the given (0-based) pages to image files in ``output_dir`` and
+    returns their paths. Runs in a pool process; the document is opened
+    per call and images go straight to disk instead of back to the parent.
+    """
+    suffix = IMAGE_FORMATS[image_format][0]
+    paths = []
+    with fitz.open(input_pdf) as doc:
+        for number in numbers:
+            try:
+                paths.append(_render_page(doc[number], number, dpi, image_format, quality, output_dir, suffix))
+            except ConversionFailedError:
+                raise
+            except Exception as e:
+                # MuPDF errors do not pickle back to the parent process
+                raise ConversionFailedError(
+                    f"Rendering page {number + 1} failed: {e}") from None
+    return paths
+
+
+def _render_page(page: fitz.Page, number: int, dpi: int, image_format: str, quality: int, output_dir: str, suffix: str) -> str:
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    path = os.path.join(output_dir, f"page_{number + 1:04d}{suffix}")
+
+    if image_format == "png":
+        pix.save(path)
+        return path
+
+    pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+        pix.height, pix.stride)[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+    if pix.n == 3:
+        pixels = pixels[:, :, ::-1]  # opencv expects BGR
+    flag = cv2.IMWRITE_JPEG_QUALITY if image_format == "jpeg" else cv2.IMWRITE_WEBP_QUALITY
+    ok, encoded = cv2.imencode(suffix, pixels, [flag, quality])
+    if not ok:
+        raise ConversionFailedError(
+            f"Could not encode page {number + 1} as {image_format}")
+    with open(path, "wb") as f:
+        f.write(encoded.tobytes())
+    return path
+
+
+class PdfToImageEngine:
+    """
+    PDF -> one image per page, rendered in parallel processes.
+
+    Each process renders a contiguous run of the selected pages and
+    writes the images to the scratch directory itself. ``convert`` then
+    either leaves them there as separate files or moves them into a ZIP
+    one at a time, so only one rendered page is ever held in memory per
+    process.
+    """
+
+    def __init__(
+        self,
+        dpi: Optional[int] = None,
+        image_format: str = "png",
+        pages: Optional[str] = None,
+        quality: Optional[int] = None,
+        workers: Optional[int] = None,
+    ):
+        if image_format not in IMAGE_FORMATS:
+            raise ConversionFailedError(f"Unsupported image format: {image_format}")
+        self.dpi = dpi or settings.IMAGE_RENDER_DPI
+        if not 1 <= self.dpi <= settings.IMAGE_MAX_DPI:
+            raise ConversionFailedError(
+                f"DPI must be between 1 and {settings.IMAGE_MAX_DPI}")
+        self.image_format = image_format
+        self.pages = pages
+        self.quality = quality or settings.IMAGE_QUALITY
+        self.workers = page_workers(workers)
+
+    def render(self, input_pdf: Path, output_dir: Path) -> list[Path]:
+        try:
+            with fitz.open(input_pdf) as doc:
+                if doc.needs_pass:
+                    raise ConversionFailedError(
+                        "Encrypted PDF cannot be converted")
+                page_count = doc.page_count
+        except ConversionFailedError:
+            raise
+        except Exception as e:
+            raise ConversionFailedError(f"Unreadable PDF: {e}") from e
+
+        if page_count == 0:
+            raise ConversionFailedError("PDF has no pages")
+
+        if self.pages:
+            numbers = sorted({n for pages in parse_ranges(self.pages, page_count) for n in pages})
+        else:
+            numbers = list(range(page_count))
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        workers = self.workers if len(numbers) >= settings.PAGE_PARALLEL_MIN_PAGES else 1
+        tasks = [
+            (str(input_pdf), numbers[start:end], self.dpi, self.image_format,
+             self.quality, str(output_dir))
+            for start, end in page_ranges(len(numbers), workers)
+        ]
+        chunks = map_in_processes(render_pages, tasks, workers)
+        return [Path(path) for chunk in chunks for path in chunk]
+
+    def convert(self, input_pdf: Path, output: Path, as_zip: bool = True) -> Path:
+        """
+        Renders into ``output``: a ZIP file when ``as_zip``, otherwise a
+        directory of page images.
+        """
+        if not as_zip:
+            self.render(input_pdf, output)
+            return output
+
+        pages_dir = output.with_name(output.stem + "_pages")
+        images = self.render(input_pdf, pages_dir)
+        # Images are already compressed; store them as they are.
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for image in images:
+                archive.write(image, image.name)
+                image.unlink()
+        pages_dir.rmdir()
+        return output
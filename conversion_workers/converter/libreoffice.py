@@ -0,0 +1,140 @@
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from conversion_workers.converter.office_pool import LibreOfficePool, get_office_pool
+from conversion_workers.exception import (
+    LibreOfficeNotFoundError,
+    ConversionTimeoutError,
+    ConversionFailedError,
+)
+
+
+class LibreOfficeConverter:
+
+    def __init__(
+        self,
+        soffice_path: Optional[str] = None,
+        timeout_seconds: int = 120,
+        pool: Optional[LibreOfficePool] = None,
+    ):
+        self.soffice_path = soffice_path or self._detect_soffice()
+        self.timeout_second = timeout_seconds
+        self._pool = pool or get_office_pool(self.soffice_path)
+
+    def convert(self, input_path: Path, output_dir: Path, target_ext: str) -> Path:
+        """
+        Converts through a warm pooled LibreOffice instance when one is
+        available, otherwise spawns a one-shot soffice process.
+        """
+
+        if self._pool is not None and self._pool.supports(input_path, target_ext):
+            return self._pool.convert(input_path, output_dir, target_ext)
+
+        return self._convert_once(input_path, output_dir, target_ext)
+
+    def convert_many(self, input_paths: list[Path], output_dir: Path, target_ext: str) -> dict[Path, Path]:
+        """
+        Converts several files in a single one-shot soffice run, so the
+        process start-up is paid once per batch instead of once per file,
+        and returns the output of every input that produced one. Input
+        stems must be unique, since outputs are named after them.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        outputs = {}
+
+        cmd = [
+            self.soffice_path,
+            "--headless",
+            "--nologo",
+            "--nofirststartwizard",
+            "--norestore",
+            "--convert-to",
+            target_ext,
+            "--outdir",
+            str(output_dir),
+            *[str(p) for p in input_paths],
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout_second * len(input_paths),
+            )
+        except subprocess.TimeoutExpired as e:
+            raise ConversionTimeoutError(
+                "LibreOffice Conversion timeout error") from e
+
+        for input_path in input_paths:
+            output = output_dir / f"{input_path.stem}.{target_ext.lower()}"
+            if output.exists():
+                outputs[input_path] = output
+
+        if not outputs:
+            raise ConversionFailedError(
+                f"LibreOffice produced no output.\nSTDERR:\n{result.stderr.decode(errors='ignore')}")
+        return outputs
+
+    def _convert_once(self, input_path: Path, output_dir: Path, target_ext: str) -> Path:
+
+        cmd = [
+            self.soffice_path,
+            "--headless",
+            "--nologo",
+            "--nofirststartwizard",
+            "--norestore",
+            "--convert-to",
+            target_ext,
+            "--outdir",
+            str(output_dir),
+            str(input_path)
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout_second,
+                check=True,
+            )
+
+        except subprocess.TimeoutExpired as e:
+            raise ConversionTimeoutError(
+                "LibreOffice Conversion timeout error") from e
+
+        except subprocess.CalledProcessError as e:
+            print(
+                f"[DEBUG] CalledProcessError STDERR: {e.stderr.decode(errors='ignore')}")
+            raise ConversionFailedError(
+                e.stderr.decode(errors="ignore")) from e
+
+        expected_output = output_dir / \
+            f"{input_path.stem}.{target_ext.lower()}"
+        if expected_output.exists():
+            return expected_output
+
+        for file in output_dir.iterdir():
+            if file.suffix.lower() == f".{target_ext.lower()}" and file != input_path:
+                return file
+
+        raise ConversionFailedError(
+            f"LibreOffice produced no output.\nSTDERR:\n{result.stderr.decode(errors='ignore')}"
+        )
+
+    def _detect_soffice(self) -> str:
+        candidates = [
+            shutil.which("soffice"),
+            "/usr/bin/soffice",
+            "/usr/local/bin/soffice",
+            "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
+        ]
+
+        for path in candidates:
+            if path and Path(path).exists():
+                return str(path)
+        raise LibreOfficeNotFoundError(
+            "Libreoffice not installed in the system")
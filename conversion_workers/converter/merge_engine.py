@@ -0,0 +1,267 @@
+import io
+import mmap
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Union
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    PdfObject,
+    StreamObject,
+)
+
+from conversion_workers.exception import ConversionFailedError
+
+PdfSource = Union[Path, str, bytes, bytearray, memoryview, BinaryIO]
+
+XREF_ENTRY = "{:010d} 00000 n \n"
+
+
+class _Document:
+    """
+    Per-input state: object numbers already assigned in the output and
+    the objects currently being written (for reference cycles).
+    """
+
+    def __init__(self, reader: PdfReader):
+        self.reader = reader
+        self.mapping: dict[int, int] = {}
+        self.visiting: set[int] = set()
+
+
+class _Output:
+    """
+    Write-only stream wrapper that tracks the offset itself, so objects
+    can be written to streams without tell() (e.g. a ZIP member).
+    """
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.offset = 0
+
+    def write(self, data: bytes) -> None:
+        self.raw.write(data)
+        self.offset += len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+
+class PdfMergeEngine:
+    """
+    Streaming PDF merger.
+
+    Inputs are opened one at a time, straight from memory or an mmapped
+    file, and every object is serialized to the output as soon as its
+    dependencies are written, so memory is bounded by the largest single
+    input rather than the sum of all of them. Non-page objects with
+    identical bytes (the same font or image embedded in several inputs)
+    are written once and shared.
+
+    Only the page tree is merged; outlines, form fields and document
+    level metadata of the inputs are not carried over.
+    """
+
+    def __init__(self, dedupe: bool = True):
+        self.dedupe = dedupe
+
+    def merge(self, sources: list[PdfSource], output_pdf: Path) -> Path:
+        with open(output_pdf, "wb") as out:
+            self._begin(out)
+            for source in sources:
+                self._append(source)
+            self._finish()
+
+        return output_pdf
+
+    def write_pages(self, reader: PdfReader, pages: Iterable[int], out: BinaryIO) -> None:
+        """
+        Writes the given (0-based) pages of an open reader to ``out`` as a
+        standalone document, copying them the same way as ``merge``.
+        """
+        self._begin(out)
+        try:
+            self._append_pages(reader, pages)
+        except (PdfReadError, ValueError, KeyError, RecursionError) as e:
+            raise ConversionFailedError(
+                f"Could not copy pages: {e}") from e
+        self._finish()
+
+    def _begin(self, out: BinaryIO) -> None:
+        self._offsets: list[int] = []
+        self._digests: dict[bytes, int] = {}
+        self._kids: list[int] = []
+
+        self._out = _Output(out)
+        self._out.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+        self._pages_root = self._allocate()
+        self._catalog = self._allocate()
+
+    def _finish(self) -> None:
+        self._write_object(self._pages_root, (
+            f"<< /Type /Pages /Count {len(self._kids)} /Kids [ "
+            + " ".join(f"{num} 0 R" for num in self._kids)
+            + " ] >>").encode())
+        self._write_object(
+            self._catalog, f"<< /Type /Catalog /Pages {self._pages_root} 0 R >>".encode())
+
+        self._write_trailer(self._catalog)
+        self._out = None
+
+    def _append(self, source: PdfSource) -> None:
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    self._append_stream(view, str(source))
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._append_stream(io.BytesIO(source), "<memory>")
+        else:
+            self._append_stream(source, "<stream>")
+
+    def _append_stream(self, stream, name: str) -> None:
+        try:
+            reader = PdfReader(stream)
+            if reader.is_encrypted and not reader.decrypt(""):
+                raise ConversionFailedError(
+                    f"Merging failed: {name} is password protected")
+            self._append_pages(reader, range(len(reader.pages)))
+
+        except ConversionFailedError:
+            raise
+        except (PdfReadError, ValueError, KeyError, RecursionError) as e:
+            raise ConversionFailedError(
+                f"Merging failed: could not read {name}: {e}") from e
+
+    def _append_pages(self, reader: PdfReader, indices: Iterable[int]) -> None:
+        doc = _Document(reader)
+        pages = []
+        for index in indices:
+            page = reader.pages[index]
+            num = self._allocate()
+            doc.mapping[page.indirect_reference.idnum] = num
+            pages.append((num, page))
+
+        for num, page in pages:
+            body = self._serialize(doc, page, skip=("/Parent",))
+            self._write_object(num, body[:-2] + (
+                f"/Parent {self._pages_root} 0 R\n>>".encode()))
+            self._kids.append(num)
+
+    def _resolve(self, doc: _Document, ref: IndirectObject) -> Optional[int]:
+        """
+        Returns the output object number for ``ref``, writing the object
+        (and everything it references) first if needed.
+        """
+        idnum = ref.idnum
+        if idnum in doc.mapping:
+            return doc.mapping[idnum]
+
+        if idnum in doc.visiting:
+            # A cycle: reserve the number now, the object is written once
+            # the outer call finishes serializing it.
+            num = self._allocate()
+            doc.mapping[idnum] = num
+            return num
+
+        obj = ref.get_object()
+        if obj is None or isinstance(obj, NullObject):
+            return None
+        if isinstance(obj, DictionaryObject) and obj.get("/Type") in ("/Page", "/Pages"):
+            # Pages that are not part of the merged tree (or intermediate
+            # page tree nodes) are not copied.
+            return self._pages_root if obj.get("/Type") == "/Pages" else None
+
+        doc.visiting.add(idnum)
+        body = self._serialize(doc, obj)
+        doc.visiting.discard(idnum)
+
+        if idnum in doc.mapping:
+            num = doc.mapping[idnum]
+            self._write_object(num, body)
+            return num
+
+        digest = hashlib.sha256(body).digest() if self.dedupe else None
+        if digest is not None and digest in self._digests:
+            num = self._digests[digest]
+        else:
+            num = self._allocate()
+            self._write_object(num, body)
+            if digest is not None:
+                self._digests[digest] = num
+
+        doc.mapping[idnum] = num
+        return num
+
+    def _serialize(self, doc: _Document, obj: PdfObject, skip: tuple = ()) -> bytes:
+        buffer = io.BytesIO()
+        self._write_value(buffer, obj, lambda ref: self._resolve(doc, ref), skip)
+        return buffer.getvalue()
+
+    def _write_value(
+        self,
+        out: BinaryIO,
+        obj: PdfObject,
+        resolve: Callable[[IndirectObject], Optional[int]],
+        skip: tuple = (),
+    ) -> None:
+        if isinstance(obj, IndirectObject):
+            num = resolve(obj)
+            out.write(b"null" if num is None else f"{num} 0 R".encode())
+
+        elif isinstance(obj, DictionaryObject):
+            out.write(b"<<\n")
+            for key, value in obj.items():
+                # /Length is rewritten below; it may be an indirect number.
+                if key in skip or (isinstance(obj, StreamObject) and key == "/Length"):
+                    continue
+                NameObject(key).write_to_stream(out)
+                out.write(b" ")
+                self._write_value(out, value, resolve)
+                out.write(b"\n")
+
+            if isinstance(obj, StreamObject):
+                # Raw (still encoded) bytes are copied as is.
+                data = obj._data
+                out.write(f"/Length {len(data)}\n>>\nstream\n".encode())
+                out.write(data)
+                out.write(b"\nendstream")
+            else:
+                out.write(b">>")
+
+        elif isinstance(obj, ArrayObject):
+            out.write(b"[")
+            for item in obj:
+                out.write(b" ")
+                self._write_value(out, item, resolve)
+            out.write(b" ]")
+
+        else:
+            obj.write_to_stream(out)
+
+    def _allocate(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets)
+
+    def _write_object(self, num: int, body: bytes) -> None:
+        self._offsets[num - 1] = self._out.tell()
+        self._out.write(f"{num} 0 obj\n".encode())
+        self._out.write(body)
+        self._out.write(b"\nendobj\n")
+
+    def _write_trailer(self, catalog: int) -> None:
+        xref_offset = self._out.tell()
+        size = len(self._offsets) + 1
+
+        self._out.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        self._out.write("".join(XREF_ENTRY.format(offset)
+                        for offset in self._offsets).encode())
+        self._out.write((
+            f"trailer\n<< /Size {size} /Root {catalog} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode())
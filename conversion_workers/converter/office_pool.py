@@ -0,0 +1,413 @@
+import atexit
+import multiprocessing.util
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Queue, Empty
+from typing import Optional
+
+from conversion_workers.settings import settings
+from conversion_workers.exception import (
+    LibreOfficeNotFoundError,
+    ConversionTimeoutError,
+    ConversionFailedError,
+)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:  # UNO bridge ships with LibreOffice, not with pip
+    uno = None
+    PropertyValue = None
+
+
+TEXT_FORMATS = {".doc", ".docx", ".odt", ".rtf", ".txt"}
+PRESENTATION_FORMATS = {".ppt", ".pptx", ".odp"}
+
+# (document family, target extension) -> LibreOffice export filter
+EXPORT_FILTERS = {
+    ("text", "pdf"): "writer_pdf_Export",
+    ("text", "docx"): "MS Word 2007 XML",
+    ("text", "odt"): "writer8",
+    ("presentation", "pdf"): "impress_pdf_Export",
+    ("presentation", "pptx"): "Impress MS PowerPoint 2007 XML",
+    ("presentation", "odp"): "impress8",
+}
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _props(**kwargs) -> tuple:
+    props = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+class _Watchdog:
+    """
+    Kills the soffice process if a UNO call does not return in time,
+    which unblocks the caller with a disposed-bridge error.
+    """
+
+    def __init__(self, instance: "OfficeInstance", timeout: int):
+        self.fired = False
+        self._instance = instance
+        self._timer = threading.Timer(timeout, self._fire)
+        self._timer.daemon = True
+
+    def _fire(self):
+        self.fired = True
+        self._instance.kill()
+
+    def __enter__(self):
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.cancel()
+        return False
+
+
+class OfficeInstance:
+    """
+    One long-lived headless soffice process listening on a local UNO socket,
+    with its own user profile so instances never share a lock file.
+    """
+
+    def __init__(self, soffice_path: str, max_conversions: int):
+        self.soffice_path = soffice_path
+        self.max_conversions = max_conversions
+        self.conversions = 0
+        self.port: Optional[int] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.profile_dir: Optional[Path] = None
+        self.broken = False
+        self._desktop = None
+
+    def start(self, startup_timeout: int) -> None:
+        self.port = _free_port()
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="lo_profile_"))
+        self.conversions = 0
+        self.broken = False
+
+        cmd = [
+            self.soffice_path,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--nofirststartwizard",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={self.profile_dir.as_uri()}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+        ]
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx)
+
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            returncode = self.process.poll()
+            if returncode is not None:
+                self.stop()
+                raise ConversionFailedError(
+                    f"LibreOffice exited during startup (code {returncode})")
+            try:
+                ctx = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext")
+                self._desktop = ctx.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", ctx)
+                break
+            except Exception:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise ConversionTimeoutError(
+                        "LibreOffice did not accept connections in time")
+                time.sleep(0.25)
+
+        print(f"[office-pool] soffice ready on port {self.port}")
+
+    def stop(self) -> None:
+        self._desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def kill(self) -> None:
+        self.broken = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def restart(self, startup_timeout: int) -> None:
+        self.stop()
+        self.start(startup_timeout)
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.conversions >= self.max_conversions
+
+    def is_healthy(self, timeout: int = 10) -> bool:
+        if self.broken or not self.running or self._desktop is None:
+            return False
+        try:
+            with _Watchdog(self, timeout):
+                self._desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, input_path: Path, output_dir: Path, target_ext: str, timeout: int) -> Path:
+        family = document_family(input_path)
+        export_filter = EXPORT_FILTERS[(family, target_ext.lower())]
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"{input_path.stem}.{target_ext.lower()}"
+
+        with _Watchdog(self, timeout) as watchdog:
+            try:
+                doc = self._desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(str(input_path.resolve())),
+                    "_blank",
+                    0,
+                    _props(Hidden=True, ReadOnly=True),
+                )
+                if doc is None:
+                    raise ConversionFailedError(
+                        f"LibreOffice could not open {input_path.name}")
+                try:
+                    doc.storeToURL(
+                        uno.systemPathToFileUrl(str(output_path.resolve())),
+                        _props(FilterName=export_filter, Overwrite=True),
+                    )
+                finally:
+                    doc.close(True)
+
+            except ConversionFailedError:
+                raise
+            except Exception as e:
+                if not self.running:
+                    self.broken = True
+                if watchdog.fired:
+                    raise ConversionTimeoutError(
+                        "LibreOffice Conversion timeout error") from e
+                raise ConversionFailedError(
+                    f"LibreOffice conversion failed: {e}") from e
+
+        self.conversions += 1
+
+        if not output_path.exists():
+            raise ConversionFailedError("LibreOffice produced no output.")
+        return output_path
+
+
+def document_family(input_path: Path) -> Optional[str]:
+    suffix = input_path.suffix.lower()
+    if suffix in TEXT_FORMATS:
+        return "text"
+    if suffix in PRESENTATION_FORMATS:
+        return "presentation"
+    return None
+
+
+class LibreOfficePool:
+    """
+    Fixed-size pool of headless LibreOffice instances.
+
+    Instances are started once, health-checked before use and periodically
+    while idle, restarted when they crash or hang, and recycled after
+    ``max_conversions`` documents to keep memory leaks in check.
+    """
+
+    def __init__(
+        self,
+        soffice_path: str,
+        size: int,
+        max_conversions: int,
+        startup_timeout: int = 30,
+        convert_timeout: int = 120,
+        health_interval: int = 30,
+    ):
+        self.soffice_path = soffice_path
+        self.size = size
+        self.max_conversions = max_conversions
+        self.startup_timeout = startup_timeout
+        self.convert_timeout = convert_timeout
+        self.health_interval = health_interval
+
+        self._idle: Queue[OfficeInstance] = Queue()
+        self._instances: list[OfficeInstance] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def supports(self, input_path: Path, target_ext: str) -> bool:
+        family = document_family(input_path)
+        return (family, target_ext.lower()) in EXPORT_FILTERS
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                instance = OfficeInstance(
+                    self.soffice_path, self.max_conversions)
+                instance.start(self.startup_timeout)
+                self._instances.append(instance)
+                self._idle.put(instance)
+
+            self._monitor = threading.Thread(
+                target=self._monitor_idle, name="office-pool-monitor", daemon=True)
+            self._monitor.start()
+            self._started = True
+
+    def shutdown(self) -> None:
+        self._closed.set()
+        with self._lock:
+            for instance in self._instances:
+                instance.stop()
+            self._instances.clear()
+            self._started = False
+
+    @contextmanager
+    def acquire(self):
+        self.start()
+        try:
+            instance = self._idle.get(timeout=self.convert_timeout)
+        except Empty:
+            raise ConversionTimeoutError(
+                "No LibreOffice instance became available in time")
+
+        try:
+            if not instance.is_healthy():
+                print(f"[office-pool] restarting unhealthy soffice on port {instance.port}")
+                instance.restart(self.startup_timeout)
+            yield instance
+        finally:
+            self._release(instance)
+
+    def convert(self, input_path: Path, output_dir: Path, target_ext: str) -> Path:
+        with self.acquire() as instance:
+            return instance.convert(
+                input_path, output_dir, target_ext, self.convert_timeout)
+
+    def _release(self, instance: OfficeInstance) -> None:
+        if self._closed.is_set():
+            instance.stop()
+            return
+        try:
+            if instance.broken or not instance.running:
+                print(f"[office-pool] soffice on port {instance.port} crashed or hung, restarting")
+                instance.restart(self.startup_timeout)
+            elif instance.exhausted:
+                print(f"[office-pool] recycling soffice after {instance.conversions} conversions")
+                instance.restart(self.startup_timeout)
+        except Exception as e:
+            # Leave it stopped; the next acquire or health pass retries the start.
+            print(f"[office-pool] restart failed: {e}")
+            instance.stop()
+        self._idle.put(instance)
+
+    def _monitor_idle(self) -> None:
+        while not self._closed.wait(self.health_interval):
+            for _ in range(self._idle.qsize()):
+                try:
+                    instance = self._idle.get_nowait()
+                except Empty:
+                    break
+                try:
+                    if not instance.is_healthy():
+                        print(f"[office-pool] idle soffice on port {instance.port} failed health check")
+                        instance.restart(self.startup_timeout)
+                except Exception as e:
+                    print(f"[office-pool] restart failed: {e}")
+                    instance.stop()
+                finally:
+                    self._idle.put(instance)
+
+
+_pool: Optional[LibreOfficePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_office_pool(soffice_path: str) -> Optional[LibreOfficePool]:
+    """
+    Process-wide pool, created on first use. Returns None when the pool is
+    disabled or the UNO bridge is not importable, so callers fall back to
+    one-shot ``soffice --convert-to``.
+    """
+    global _pool
+
+    if settings.LIBREOFFICE_POOL_SIZE <= 0 or uno is None:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            if not soffice_path:
+                raise LibreOfficeNotFoundError(
+                    "Libreoffice not installed in the system")
+            _pool = LibreOfficePool(
+                soffice_path=soffice_path,
+                size=settings.LIBREOFFICE_POOL_SIZE,
+                max_conversions=settings.LIBREOFFICE_MAX_CONVERSIONS,
+                startup_timeout=settings.LIBREOFFICE_STARTUP_TIMEOUT,
+                convert_timeout=settings.LIBREOFFICE_CONVERT_TIMEOUT,
+                health_interval=settings.LIBREOFFICE_HEALTH_INTERVAL,
+            )
+            atexit.register(_pool.shutdown)
+            # pool processes leave through os._exit and never run atexit hooks
+            multiprocessing.util.Finalize(
+                _pool, _pool.shutdown, exitpriority=10)
+        return _pool
+
+
+def check_office_bridge() -> None:
+    """
+    Refuses to start a worker whose pool is enabled but can never run,
+    instead of quietly converting every document with one-shot soffice.
+    """
+    if settings.LIBREOFFICE_POOL_SIZE > 0 and uno is None:
+        raise LibreOfficeNotFoundError(
+            "LIBREOFFICE_POOL_SIZE is set but the LibreOffice UNO bridge "
+            "(python3-uno) cannot be imported by this interpreter; install "
+            "it or set LIBREOFFICE_POOL_SIZE=0 to use one-shot soffice")
+
+
+def shutdown_office_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
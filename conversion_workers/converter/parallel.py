@@ -0,0 +1,61 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from conversion_workers.settings import settings
+
+
+def page_workers(workers: Optional[int] = None) -> int:
+    """
+    Number of processes a single document may fan out to
+    (0 in settings means one per CPU core).
+    """
+    if workers is None:
+        workers = settings.PAGE_WORKERS
+    return max(1, workers or os.cpu_count() or 1)
+
+
+def page_ranges(page_count: int, chunk_count: int) -> list[tuple[int, int]]:
+    """
+    Splits ``[0, page_count)`` into at most ``chunk_count`` contiguous
+    half-open ranges of near-equal size.
+    """
+    chunk_count = max(1, min(chunk_count, page_count))
+    size, extra = divmod(page_count, chunk_count)
+
+    ranges = []
+    start = 0
+    for index in range(chunk_count):
+        end = start + size + (1 if index < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def map_in_processes(fn: Callable, tasks: list[tuple], workers: int) -> list:
+    """
+    Calls ``fn(*task)`` for every task and returns the results in task
+    order. Runs inline when there is nothing to parallelise; otherwise in
+    a short-lived spawn pool, since PyMuPDF documents cannot be shared
+    across a fork.
+    """
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return [fn(*task) for task in tasks]
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        futures = [executor.submit(fn, *task) for task in tasks]
+        return [future.result() for future in futures]
+    except BaseException:
+        # A failed page or the task timeout alarm: don't wait for siblings.
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,187 @@
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import fitz
+from pptx import Presentation
+from pptx.util import Emu, Pt
+from pptx.dml.color import RGBColor
+from pptx.enum.text import MSO_AUTO_SIZE
+
+from conversion_workers.settings import settings
+from conversion_workers.converter.parallel import page_workers, page_ranges, map_in_processes
+from conversion_workers.exception import ConversionFailedError
+
+EMU_PER_POINT = 12700
+
+
+def _font_name(raw: str) -> str:
+    # "ABCDEF+Calibri-Bold" -> "Calibri"
+    name = raw.split("+")[-1]
+    return name.split("-")[0] or raw
+
+
+def _extract_lines(page: fitz.Page) -> list[dict]:
+    lines = []
+    text = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+    for block in text["blocks"]:
+        for line in block.get("lines", []):
+            # horizontal text only; rotated runs stay in the rendered image
+            if abs(line["dir"][1]) > 0.01:
+                continue
+            runs = [
+                {
+                    "text": span["text"],
+                    "size": span["size"],
+                    "color": span["color"],
+                    "font": _font_name(span["font"]),
+                    "bold": bool(span["flags"] & fitz.TEXT_FONT_BOLD),
+                    "italic": bool(span["flags"] & fitz.TEXT_FONT_ITALIC),
+                }
+                for span in line["spans"]
+                if span["text"].strip()
+            ]
+            if runs:
+                lines.append({"bbox": tuple(line["bbox"]), "runs": runs})
+    return lines
+
+
+def render_page_range(input_pdf: str, start: int, end: int, dpi: int, text_layer: bool, image_dir: str) -> list[dict]:
+    """
+    Renders pages ``[start, end)`` to slide payloads. With ``text_layer``
+    the text is lifted out as editable lines and redacted from the page
+    before rendering, so the background image does not repeat it. Page
+    images are written to ``image_dir`` and only their paths returned.
+    Runs in a pool process; the document is opened per call.
+    """
+    slides = []
+    with fitz.open(input_pdf) as doc:
+        for number in range(start, end):
+            page = doc[number]
+            lines = _extract_lines(page) if text_layer else []
+
+            if lines:
+                for line in lines:
+                    page.add_redact_annot(line["bbox"], fill=False)
+                page.apply_redactions(
+                    images=fitz.PDF_REDACT_IMAGE_NONE,
+                    graphics=fitz.PDF_REDACT_LINE_ART_NONE,
+                    text=fitz.PDF_REDACT_TEXT_REMOVE,
+                )
+
+            image = str(Path(image_dir) / f"page_{number:05d}.png")
+            page.get_pixmap(dpi=dpi, alpha=False).save(image)
+            slides.append({
+                "number": number,
+                "width": page.rect.width,
+                "height": page.rect.height,
+                "image": image,
+                "lines": lines,
+            })
+    return slides
+
+
+class PdfToPptxEngine:
+    """
+    Single-pass PDF -> PPTX: every page becomes one slide holding a
+    rendered background image plus editable text boxes. Page ranges are
+    rendered in parallel processes for long documents.
+    """
+
+    def __init__(
+        self,
+        dpi: Optional[int] = None,
+        workers: Optional[int] = None,
+        text_layer: bool = True,
+    ):
+        self.dpi = dpi or settings.PPTX_RENDER_DPI
+        self.workers = page_workers(workers)
+        self.text_layer = text_layer
+
+    def convert(self, input_pdf: Path, output_pptx: Path) -> Path:
+        try:
+            with fitz.open(input_pdf) as doc:
+                if doc.needs_pass:
+                    raise ConversionFailedError(
+                        "Encrypted PDF cannot be converted")
+                page_count = doc.page_count
+        except ConversionFailedError:
+            raise
+        except Exception as e:
+            raise ConversionFailedError(f"Unreadable PDF: {e}") from e
+
+        if page_count == 0:
+            raise ConversionFailedError("PDF has no pages")
+
+        # Page images go to the job's scratch directory next to the output
+        image_dir = output_pptx.parent / f"{output_pptx.stem}_pages"
+        image_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            workers = self.workers if page_count >= settings.PAGE_PARALLEL_MIN_PAGES else 1
+            tasks = [
+                (str(input_pdf), start, end, self.dpi, self.text_layer, str(image_dir))
+                for start, end in page_ranges(page_count, workers)
+            ]
+            chunks = map_in_processes(render_page_range, tasks, workers)
+
+            slides = [slide for chunk in chunks for slide in chunk]
+            self._write(slides, output_pptx)
+        finally:
+            shutil.rmtree(image_dir, ignore_errors=True)
+        return output_pptx
+
+    def _write(self, slides: list[dict], output_pptx: Path) -> None:
+        prs = Presentation()
+        # one slide size per deck; the first page sets it, others are fitted
+        slide_w = int(slides[0]["width"] * EMU_PER_POINT)
+        slide_h = int(slides[0]["height"] * EMU_PER_POINT)
+        prs.slide_width = Emu(slide_w)
+        prs.slide_height = Emu(slide_h)
+        blank = prs.slide_layouts[6]
+
+        for data in slides:
+            slide = prs.slides.add_slide(blank)
+
+            scale = min(
+                slide_w / (data["width"] * EMU_PER_POINT),
+                slide_h / (data["height"] * EMU_PER_POINT),
+            )
+            emu = EMU_PER_POINT * scale
+            left = int((slide_w - data["width"] * emu) / 2)
+            top = int((slide_h - data["height"] * emu) / 2)
+
+            slide.shapes.add_picture(
+                data["image"],
+                Emu(left),
+                Emu(top),
+                Emu(int(data["width"] * emu)),
+                Emu(int(data["height"] * emu)),
+            )
+
+            for line in data["lines"]:
+                x0, y0, x1, y1 = line["bbox"]
+                box = slide.shapes.add_textbox(
+                    Emu(left + int(x0 * emu)),
+                    Emu(top + int(y0 * emu)),
+                    Emu(max(1, int((x1 - x0) * emu))),
+                    Emu(max(1, int((y1 - y0) * emu))),
+                )
+                frame = box.text_frame
+                frame.word_wrap = False
+                frame.auto_size = MSO_AUTO_SIZE.NONE
+                frame.margin_left = frame.margin_right = 0
+                frame.margin_top = frame.margin_bottom = 0
+
+                paragraph = frame.paragraphs[0]
+                for run_data in line["runs"]:
+                    run = paragraph.add_run()
+                    run.text = run_data["text"]
+                    font = run.font
+                    font.size = Pt(max(1.0, run_data["size"] * scale))
+                    font.name = run_data["font"]
+                    font.bold = run_data["bold"]
+                    font.italic = run_data["italic"]
+                    font.color.rgb = RGBColor.from_string(
+                        f"{run_data['color']:06X}")
+
+        prs.save(str(output_pptx))
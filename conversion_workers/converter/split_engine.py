@@ -0,0 +1,128 @@
+import re
+import mmap
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+from conversion_workers.converter.merge_engine import PdfMergeEngine
+from conversion_workers.exception import ConversionFailedError
+from shared_database import page_spec
+
+SPLIT_MODES = ("ranges", "every", "bookmarks")
+
+
+def parse_ranges(spec: str, page_count: int) -> list[range]:
+    """
+    Parses 1-based, inclusive page ranges such as ``"1-3,5,8-"`` into
+    0-based ``range`` objects. An open end runs to the last page.
+    """
+    try:
+        return page_spec.parse_ranges(spec, page_count)
+    except ValueError as e:
+        raise ConversionFailedError(str(e)) from None
+
+
+class PdfSplitEngine:
+    """
+    Splits a PDF into parts by page ranges, every N pages or by top-level
+    bookmarks, and writes the parts into a ZIP.
+
+    Pages are copied object by object (see ``PdfMergeEngine``) without
+    re-rendering. Each part is streamed straight into its ZIP member and
+    the objects parsed for it are dropped before the next one, so memory
+    stays flat however large the input is.
+    """
+
+    def __init__(self, mode: str = "every", ranges: Optional[str] = None, every: Optional[int] = None):
+        if mode not in SPLIT_MODES:
+            raise ConversionFailedError(f"Unsupported split mode: {mode}")
+        if mode == "ranges" and not ranges:
+            raise ConversionFailedError(
+                "Splitting failed: page ranges are required")
+        if mode == "every" and (every or 1) < 1:
+            raise ConversionFailedError(
+                "Splitting failed: pages per part must be at least 1")
+        self.mode = mode
+        self.ranges = ranges
+        self.every = every or 1
+
+    def split(self, input_pdf: Path, output_zip: Path) -> Path:
+        with open(input_pdf, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                try:
+                    reader = PdfReader(view)
+                    if reader.is_encrypted and not reader.decrypt(""):
+                        raise ConversionFailedError(
+                            "Splitting failed: document is password protected")
+                    parts = self._parts(reader)
+                except ConversionFailedError:
+                    raise
+                except (PdfReadError, ValueError, KeyError, RecursionError) as e:
+                    raise ConversionFailedError(
+                        f"Splitting failed: could not read {input_pdf.name}: {e}") from e
+
+                # PDF streams are already compressed; storing the parts
+                # keeps the ZIP step cheap.
+                force_zip64 = len(view) >= zipfile.ZIP64_LIMIT
+                with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+                    for name, pages in parts:
+                        with archive.open(name, "w", force_zip64=force_zip64) as member:
+                            PdfMergeEngine().write_pages(reader, pages, member)
+                        # Parts are independent documents; drop what was
+                        # parsed for this one.
+                        reader.resolved_objects.clear()
+
+        return output_zip
+
+    def _parts(self, reader: PdfReader) -> list[tuple[str, range]]:
+        page_count = len(reader.pages)
+        if page_count == 0:
+            raise ConversionFailedError("Splitting failed: document has no pages")
+
+        if self.mode == "ranges":
+            ranges = parse_ranges(self.ranges, page_count)
+        elif self.mode == "every":
+            ranges = [range(start, min(start + self.every, page_count))
+                      for start in range(0, page_count, self.every)]
+        else:
+            return self._bookmark_parts(reader, page_count)
+
+        return [(f"{index:03d}_{_range_name(pages)}", pages)
+                for index, pages in enumerate(ranges, start=1)]
+
+    @staticmethod
+    def _bookmark_parts(reader: PdfReader, page_count: int) -> list[tuple[str, range]]:
+        starts: dict[int, str] = {}
+        # Nested lists in the outline are children of the previous entry;
+        # only top-level bookmarks start a part.
+        for item in reader.outline:
+            if isinstance(item, list):
+                continue
+            page = reader.get_destination_page_number(item)
+            if page is not None and page >= 0:
+                starts.setdefault(page, str(item.title or ""))
+
+        if not starts:
+            raise ConversionFailedError(
+                "Splitting failed: document has no bookmarks")
+
+        if 0 not in starts:
+            starts[0] = ""
+
+        bounds = sorted(starts) + [page_count]
+        return [
+            (f"{index:03d}_{_safe_name(starts[first]) or 'part'}.pdf", range(first, end))
+            for index, (first, end) in enumerate(zip(bounds, bounds[1:]), start=1)
+        ]
+
+
+def _range_name(pages: range) -> str:
+    first, last = pages.start + 1, pages.stop
+    return f"page_{first}.pdf" if first == last else f"pages_{first}-{last}.pdf"
+
+
+def _safe_name(title: str) -> str:
+    return re.sub(r"[^\w\-]+", "_", title).strip("_")[:80]
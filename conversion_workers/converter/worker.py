@@ -1,18 +1,30 @@
-import tempfile
 import shutil
-import subprocess
 import time
 import os
-from pypdf import PdfWriter, PdfReader
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
+import fitz
 from supabase import Client
-from pdf2docx import Converter
 
 from conversion_workers.settings import settings
+from conversion_workers.converter.libreoffice import LibreOfficeConverter
+from conversion_workers.converter.pptx_engine import PdfToPptxEngine
+from conversion_workers.converter.docx_engine import PdfToDocxEngine
+from conversion_workers.converter.merge_engine import PdfMergeEngine
+from conversion_workers.converter.split_engine import PdfSplitEngine
+from conversion_workers.converter.image_engine import PdfToImageEngine, IMAGE_FORMATS
+from conversion_workers.converter.compress_engine import PdfImageCompressionEngine, ghostscript_compress
+from conversion_workers.storage.transfer import StorageTransfer, storage_transfer
+from conversion_workers.storage.result_cache import ResultCache, result_cache, content_hash
+from conversion_workers.storage.scratch import Scratch, ScratchSpace, scratch_space
+from conversion_workers.storage.checkpoint import CheckpointStore, checkpoint_store
+from conversion_workers.storage.job_state import JobStateWriter, job_state_writer
+from conversion_workers.metrics import Download_Duration, Upload_Duration, Conversion_Duration, DB_Duration, Estimate_Ratio
 
 from sqlalchemy.orm import Session
-from shared_database.repository import JobRepository
+from shared_database.repository import JobRepository, ConversionCostRepository
+from shared_database.cost_model import observed_rates
 from shared_database.models import JobStatus, Jobs
 
 # Exceptions
@@ -26,332 +38,532 @@ from conversion_workers.exception import (
 )
 
 
-class LibreOfficeConverter:
+class StorageIO:
+    """
+    Streaming download/upload helpers shared by the converters. Inputs go
+    straight from storage to the scratch directory and outputs straight
+    back, in bounded chunks.
+    """
 
     def __init__(
         self,
-        soffice_path: Optional[str] = None,
-        timeout_seconds: int = 120,
+        supabase: Client,
+        transfer: Optional[StorageTransfer] = None,
+        cache: Optional[ResultCache] = None,
     ):
-        self.soffice_path = soffice_path or self._detect_soffice()
-        self.timeout_second = timeout_seconds
-
-    def convert(self, input_path: Path, output_dir: Path, target_ext: str) -> Path:
-
-        cmd = [
-            self.soffice_path,
-            "--headless",
-            "--nologo",
-            "--nofirststartwizard",
-            "--norestore",
-            "--convert-to",
-            target_ext,
-            "--outdir",
-            str(output_dir),
-            str(input_path)
-        ]
+        self.supabase_client = supabase
+        self.transfer = transfer or storage_transfer
+        self.cache = cache or result_cache
 
+    def _download(self, job_id: str, bucket: str, path: str, dest: Path, size: Optional[int] = None) -> Path:
         try:
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=self.timeout_second,
-                check=True,
-            )
-
-        except subprocess.TimeoutExpired as e:
-            raise ConversionTimeoutError(
-                "LibreOffice Conversion timeout error") from e
-
-        except subprocess.CalledProcessError as e:
+            with Download_Duration.labels(bucket=bucket).time():
+                self.transfer.download_to(bucket, path, dest, size)
+        except FileNotFoundError as e:
             print(
-                f"[DEBUG] CalledProcessError STDERR: {e.stderr.decode(errors='ignore')}")
-            raise ConversionFailedError(
-                e.stderr.decode(errors="ignore")) from e
-
-        expected_output = output_dir / \
-            f"{input_path.stem}.{target_ext.lower()}"
-        if expected_output.exists():
-            return expected_output
-
-        for file in output_dir.iterdir():
-            if file.suffix.lower() == f".{target_ext.lower()}" and file != input_path:
-                return file
-
-        raise ConversionFailedError(
-            f"LibreOffice produced no output.\nSTDERR:\n{result.stderr.decode(errors='ignore')}"
-        )
-
-    def _detect_soffice(self) -> str:
-        candidates = [
-            shutil.which("soffice"),
-            "/usr/bin/soffice",
-            "/usr/local/bin/soffice",
-            "C:\\Program Files\\LibreOffice\\program\\soffice.exe",
-        ]
+                f"[worker] error downloading file for job {job_id}: {str(e)}")
+            raise
+        return dest
 
-        for path in candidates:
-            if path and Path(path).exists():
-                return str(path)
-        raise LibreOfficeNotFoundError(
-            "Libreoffice not installed in the system")
+    def _upload(self, job_id: str, bucket: str, src: Path, storage_path: str, content_type: str) -> None:
+        try:
+            with Upload_Duration.labels(bucket=bucket).time():
+                self.transfer.upload_from(bucket, storage_path, src, content_type)
+        except UploadFailedError as e:
+            print(
+                f"[worker] error uploading file for job {job_id}: {str(e)}")
+            raise
 
+    def _upload_many(self, job_id: str, bucket: str, files: list[tuple[Path, str]], content_type: str) -> None:
+        try:
+            with Upload_Duration.labels(bucket=bucket).time():
+                self.transfer.upload_many(bucket, files, content_type)
+        except UploadFailedError as e:
+            print(
+                f"[worker] error uploading files for job {job_id}: {str(e)}")
+            raise
 
-class Conversion:
-    def __init__(self, supabase: Client, db: Session):
-        self.supabase_client = supabase
-        self._libreoffice_converter = LibreOfficeConverter()
-        self.job_repo = JobRepository(db)
+    def _cache_key(self, inputs: list[Path], conversion_type: str, **params) -> Optional[str]:
+        if not self.cache.enabled:
+            return None
+        return ResultCache.make_key(content_hash(inputs), conversion_type, **params)
 
-    def convert_pdf_to_ppt(self, job_id: str, path: str, user_id: str):
+    def _reuse_cached(self, job_id: str, cache_key: Optional[str], conversion_type: str, bucket: str, storage_path: str) -> bool:
         """
-        Docstring for convert_pdf_to_ppt
-
-        :param self: Description
-        :param job_id: Description
-        :type job_id: str
-        :param path: Description
-        :type path: str
-        Converter PDF (supabase) -> PPT -> Supabase
+        On a cache hit, copies the earlier output to this job's path in
+        the same bucket instead of converting again.
         """
+        if cache_key is None:
+            return False
 
-        record = self.job_repo.get_by_job_id(job_id)
-        if not record:
-            raise Exception("Job not found")
-
-        payload = {
-            "input_url": path,
-            "conversion_type": "convert_pdf_to_ppt"
-        }
-
-        record = self._update_record(record, **payload)
-
-        try:
-
-            file_byte = self.supabase_client.storage.from_(
-                settings.SUPABASE_RAW_BUCKET).download(path=path)
-        except Exception as e:
-            self._update_status(record, JobStatus.failed)
-            raise FileNotFoundError(
-                f"File not found in storage: {path}") from e
-
-        with tempfile.TemporaryDirectory() as tempdir:
-            tempdir = Path(tempdir)
-
-            suffix = Path(path).suffix.lower()
+        entry = self.cache.lookup(cache_key, conversion_type)
+        if entry is None or entry["bucket"] != bucket:
+            return False
 
-            if suffix != ".pdf":
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    f"Unsupported input format: {suffix}")
+        if entry["path"] != storage_path:
+            try:
+                self.supabase_client.storage.from_(bucket).copy(
+                    entry["path"], storage_path)
+            except Exception as e:
+                print(
+                    f"[worker] cached output unusable for job {job_id}: {str(e)}")
+                self.cache.invalidate(cache_key)
+                return False
 
-            input_pdf = tempdir / "input.pdf"
-            output_dir = tempdir
+        print(f"[worker] cache hit for job {job_id}, reused {entry['path']}")
+        return True
 
-            with open(input_pdf, "wb") as f:
-                f.write(file_byte)
+    def _remember(self, cache_key: Optional[str], bucket: str, storage_path: str) -> None:
+        if cache_key is not None:
+            self.cache.store(cache_key, bucket, storage_path)
 
-            output_file = self._libreoffice_converter.convert(
-                input_path=input_pdf, output_dir=output_dir, target_ext='odp')
 
-            output_file = self._libreoffice_converter.convert(
-                input_path=output_file, output_dir=output_dir, target_ext='pptx')
+class JobType:
+    """
+    What a target_format reads, writes and records.
+    """
 
-            if not output_file.exists():
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    "Conversion failed: No output file found")
+    def __init__(
+        self,
+        conversion_type: str,
+        input_suffix: str,
+        output_name: str,
+        bucket: str,
+        content_type: str,
+        tracked: bool = True,
+        cache_params: tuple = (),
+    ):
+        self.conversion_type = conversion_type
+        self.input_suffix = input_suffix
+        self.output_name = output_name
+        self.bucket = bucket
+        self.content_type = content_type
+        # Whether the job row is updated (merge and compress never had one)
+        self.tracked = tracked
+        self.cache_params = cache_params
+
+    def output_bucket(self) -> str:
+        return getattr(settings, self.bucket)
+
+    def output_path(self, path) -> str:
+        if isinstance(path, list):
+            return str(Path(path[0]).with_name(self.output_name))
+        return path.replace(f"original{self.input_suffix}", self.output_name)
+
+
+PDF = "application/pdf"
+PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+ZIP = "application/zip"
+
+JOB_TYPES = {
+    "pptx": JobType("convert_pdf_to_ppt", ".pdf", "converted.pptx", "SUPABASE_CONVERTED_BUCKET", PPTX),
+    "pdf": JobType("convert_docx_to_pdf", ".docx", "converted.pdf", "SUPABASE_CONVERTED_BUCKET", PDF),
+    "docx": JobType("convert_pdf_to_docx", ".pdf", "converted.docx", "SUPABASE_CONVERTED_BUCKET", DOCX),
+    "compress": JobType("compress_pdf", ".pdf", "compressed.pdf", "SUPABASE_COMPRESSED_BUCKET", PDF,
+                        tracked=False, cache_params=("quality", "engine")),
+    "merge": JobType("merge_pdf", ".pdf", "merged.pdf", "SUPABASE_CONVERTED_BUCKET", PDF,
+                     tracked=False),
+    "split": JobType("split_pdf", ".pdf", "split.zip", "SUPABASE_CONVERTED_BUCKET", ZIP,
+                     cache_params=("mode", "ranges", "every")),
+    "image": JobType("convert_pdf_to_image", ".pdf", "images.zip", "SUPABASE_CONVERTED_BUCKET", ZIP,
+                     cache_params=("dpi", "image_format", "pages", "quality")),
+}
+
+
+class StagedJob:
+    """
+    A job's state between the fetch, convert and publish stages. Holds
+    only plain values so it can be handed to a pool process.
+    """
+
+    def __init__(self, data: dict, scratch: Optional[Scratch] = None):
+        self.data = data
+        self.job_id = data["job_id"]
+        self.target_format = data["target_format"]
+        self.scratch = scratch
+        self.inputs: list[Path] = []
+        self.output: Optional[Path] = None
+        self.storage_path: Optional[str] = None
+        self.cache_key: Optional[str] = None
+        self.cached = False
+        # Filled in by the convert stage, for the cost model
+        self.convert_seconds: Optional[float] = None
+        self.page_count: Optional[int] = None
+
+        if self.target_format not in JOB_TYPES:
+            raise ValueError("Unsupported Formate")
+
+        if self.target_format == "compress":
+            data.setdefault("quality", "ebook")
+            # Scanned documents are mostly images, which the PyMuPDF
+            # engine recompresses directly.
+            scanned = (data.get("metadata") or {}).get("scanned")
+            data["engine"] = data.get("engine") or (
+                "pymupdf" if scanned else settings.COMPRESSION_ENGINE)
+
+        if self.target_format == "split":
+            data.setdefault("mode", "every")
+            if data["mode"] == "every":
+                data["every"] = data.get("every") or 1
+
+        if self.target_format == "image":
+            data["image_format"] = data.get("image_format") or "png"
+            data["dpi"] = data.get("dpi") or settings.IMAGE_RENDER_DPI
+            data["quality"] = data.get("quality") or settings.IMAGE_QUALITY
+            data.setdefault("delivery", "zip")
+
+    @property
+    def job_type(self) -> JobType:
+        return JOB_TYPES[self.target_format]
+
+    @property
+    def scratch_dir(self) -> Path:
+        return self.scratch.path
+
+    @property
+    def multi_output(self) -> bool:
+        """
+        The output is a directory uploaded as separate objects under
+        ``storage_path`` instead of a single file.
+        """
+        return self.target_format == "image" and self.data.get("delivery") == "files"
 
-            output_storage_path = path.replace(
-                "original.pdf", "converted.pptx")
+    @property
+    def batchable(self) -> bool:
+        """
+        Small DOCX -> PDF jobs on their first attempt may share one
+        one-shot LibreOffice run; retries always convert alone. A warm
+        office pool has no start-up to amortise, so it never batches.
+        """
+        return (
+            self.target_format == "pdf"
+            and settings.LIBREOFFICE_BATCH_SIZE > 1
+            and settings.LIBREOFFICE_POOL_SIZE == 0
+            and not self.cached
+            and not self.data.get("retry_count")
+            and self.inputs[0].stat().st_size <= settings.LIBREOFFICE_BATCH_MAX_BYTES
+        )
 
-            try:
-                with open(output_file, "rb") as f:
-                    self.supabase_client.storage.from_(settings.SUPABASE_CONVERTED_BUCKET).upload(
-                        output_storage_path,
-                        f,
-                        {
-                            "content-type": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                            "x-upsert": "true"
-                        },
-                    )
-                self._update_output_url(record, output_storage_path)
-                self._update_status(record, JobStatus.completed)
 
-            except Exception as e:
-                self._update_status(record, JobStatus.failed)
-                raise UploadFailedError(f"Upload failed: {str(e)}") from e
-        print(f"[worker] upload complete for job {job_id}")
+def convert_staged(staged: StagedJob) -> StagedJob:
+    """
+    Convert stage: local inputs -> local output, no network or database.
+    Runs in a conversion pool process.
+    """
+    start = time.perf_counter()
+    _convert(staged)
+    staged.convert_seconds = time.perf_counter() - start
+    staged.page_count = (staged.data.get("metadata") or {}).get("page_count") \
+        or _page_count(staged.inputs)
 
-    def convert_docx_to_pdf(self, job_id: str, path: str, user_id: str):
-        """
-        Docstring for convert_docx_to_pdf
+    scratch_space.check(staged.scratch)
+    return staged
 
-        :param self: Description
-        :param job_id: Description
-        :type job_id: str
-        :param path: Description
-        :type path: str
 
-        Converter DOCX (supabase) -> PDF -> Supabase
-        """
+def _convert(staged: StagedJob) -> None:
+    data = staged.data
+    scratch = staged.scratch_dir
+    target_format = staged.target_format
 
-        record = self.job_repo.get_by_job_id(job_id)
-        if not record:
-            raise Exception("Job not found")
-        payload = {
-            "input_url": path,
-            "conversion_type": "convert_docx_to_pdf"
-        }
+    if target_format == "pptx":
+        with Conversion_Duration.labels(converter="pymupdf", target_format="pptx").time():
+            staged.output = PdfToPptxEngine().convert(
+                staged.inputs[0], scratch / "output.pptx")
 
-        record = self._update_record(record, **payload)
+    elif target_format == "pdf":
+        with Conversion_Duration.labels(converter="libreoffice", target_format="pdf").time():
+            staged.output = LibreOfficeConverter().convert(
+                input_path=staged.inputs[0], output_dir=scratch / "output.pdf", target_ext='pdf')
 
+    elif target_format == "docx":
         try:
-
-            file_byte = self.supabase_client.storage.from_(
-                settings.SUPABASE_RAW_BUCKET).download(path=path)
+            with Conversion_Duration.labels(converter="pdf2docx", target_format="docx").time():
+                staged.output = PdfToDocxEngine().convert(
+                    staged.inputs[0], scratch / "output.docx", scratch,
+                    checkpoint_store.get(staged.job_id))
         except Exception as e:
-            self._update_status(record, JobStatus.failed)
             print(
-                f"[worker] error downloading file for job {job_id}: {str(e)}")
-            raise FileNotFoundError(
-                f"File not found in storage: {path}") from e
-
-        with tempfile.TemporaryDirectory() as tempdir:
-            tempdir = Path(tempdir)
-
-            suffix = Path(path).suffix.lower()
-
-            if suffix != ".docx":
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    f"Unsupported input format: {suffix}")
-
-            input_docx = tempdir / 'input.docx'
-            output_dir = tempdir / "output.pdf"
+                f"[worker] error during conversion for job {staged.job_id}: {str(e)}")
+            raise ConversionFailedError(
+                f"Conversion failed: {str(e)}") from e
+
+    elif target_format == "compress":
+        engine = data["engine"]
+        if engine not in ("pymupdf", "ghostscript"):
+            raise CompressionFailedError(
+                f"Unsupported compression engine: {engine}")
+
+        output_pdf = scratch / "compressed.pdf"
+        with Conversion_Duration.labels(converter=engine, target_format="compress").time():
+            if engine == "pymupdf":
+                PdfImageCompressionEngine(data["quality"]).compress(
+                    staged.inputs[0], output_pdf)
+            else:
+                ghostscript_compress(staged.job_id, staged.inputs[0],
+                                     output_pdf, data["quality"])
+        staged.output = output_pdf
+
+    elif target_format == "merge":
+        output_pdf = scratch / "merged.pdf"
+        with Conversion_Duration.labels(converter="pypdf", target_format="merge").time():
+            PdfMergeEngine().merge(staged.inputs, output_pdf)
+        staged.output = output_pdf
+
+    elif target_format == "split":
+        output_zip = scratch / "split.zip"
+        with Conversion_Duration.labels(converter="pypdf", target_format="split").time():
+            PdfSplitEngine(data["mode"], data.get("ranges"), data.get("every")).split(
+                staged.inputs[0], output_zip)
+        staged.output = output_zip
+
+    elif target_format == "image":
+        engine = PdfToImageEngine(
+            data["dpi"], data["image_format"], data.get("pages"), data["quality"])
+        output = scratch / ("images" if staged.multi_output else "images.zip")
+        with Conversion_Duration.labels(converter="pymupdf", target_format="image").time():
+            staged.output = engine.convert(
+                staged.inputs[0], output, as_zip=not staged.multi_output)
+
+    if staged.output is None or not staged.output.exists():
+        if target_format == "compress":
+            raise CompressionFailedError(
+                "Compression failed: No output file found")
+        raise ConversionFailedError(
+            "Conversion failed: No output file found")
 
-            with open(input_docx, "wb") as f:
-                f.write(file_byte)
 
-            output_file = self._libreoffice_converter.convert(
-                input_path=input_docx, output_dir=output_dir, target_ext='pdf')
+def _page_count(inputs: list[Path]) -> Optional[int]:
+    if not inputs or any(p.suffix.lower() != ".pdf" for p in inputs):
+        return None
+    try:
+        total = 0
+        for p in inputs:
+            with fitz.open(p) as doc:
+                total += doc.page_count
+        return total
+    except Exception:
+        return None
 
-            if not output_file.exists():
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    "Conversion failed: No output file found")
-            output_storage_path = path.replace(
-                "original.docx", "converted.pdf")
 
+def convert_batch(batch: list[StagedJob]) -> list[tuple[StagedJob, Optional[Exception]]]:
+    """
+    Convert stage for a batch of DOCX -> PDF jobs, in one LibreOffice
+    run. Returns every job with the error that failed it, if any, so one
+    bad document does not fail the rest. Runs in a conversion pool process.
+    """
+    batch_dir = batch[0].scratch_dir / "batch"
+    batch_dir.mkdir()
+    try:
+        links = []
+        for index, staged in enumerate(batch):
+            # Every job's input is called input.docx; give each a unique stem.
+            link = batch_dir / f"{index}_{staged.job_id}.docx"
             try:
-                with open(output_file, "rb") as f:
-                    self.supabase_client.storage.from_(settings.SUPABASE_CONVERTED_BUCKET).upload(
-                        output_storage_path,
-                        f,
-                        {
-                            "content-type": "application/pdf",
-                            "x-upsert": "true"
-                        },
-                    )
-                self._update_output_url(record, output_storage_path)
-                self._update_status(record, JobStatus.completed)
+                os.link(staged.inputs[0], link)
+            except OSError:
+                shutil.copyfile(staged.inputs[0], link)
+            links.append(link)
 
-            except Exception as e:
-                self._update_status(record, JobStatus.failed)
-                print(
-                    f"[worker] error uploading file for job {job_id}: {str(e)}")
-                raise UploadFailedError(f"Upload failed: {str(e)}") from e
-        print(f"[worker] upload complete for job {job_id}")
+        try:
+            with Conversion_Duration.labels(converter="libreoffice_batch", target_format="pdf").time():
+                outputs = LibreOfficeConverter().convert_many(
+                    links, batch_dir / "output", "pdf")
+        except (ConversionFailedError, ConversionTimeoutError, LibreOfficeNotFoundError) as e:
+            return [(staged, e) for staged in batch]
+
+        results = []
+        for link, staged in zip(links, batch):
+            output = outputs.get(link)
+            if output is None:
+                results.append((staged, ConversionFailedError(
+                    "Conversion failed: No output file found")))
+                continue
+            staged.output = Path(shutil.move(output, staged.scratch_dir / "output.pdf"))
+            results.append((staged, None))
+        return results
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+class JobStages(StorageIO):
+    """
+    Fetch and publish stages of a job, around ``convert_staged``.
+
+    The worker pipeline runs them on separate jobs at the same time;
+    ``run`` chains them for a single job in the current process.
+    """
 
-    def convert_pdf_to_docx(self, job_id: str, path: str, user_id: str):
+    def __init__(
+        self,
+        supabase: Client,
+        db: Optional[Session] = None,
+        transfer: Optional[StorageTransfer] = None,
+        cache: Optional[ResultCache] = None,
+        scratch: Optional[ScratchSpace] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        state: Optional[JobStateWriter] = None,
+    ):
+        super().__init__(supabase, transfer, cache)
+        self.job_repo = JobRepository(db) if db is not None else None
+        self.cost_repo = ConversionCostRepository(db) if db is not None else None
+        self.scratch = scratch or scratch_space
+        self.checkpoints = checkpoints or checkpoint_store
+        # Job row updates are written behind, in batches
+        self.state = state or job_state_writer
+
+    def run(self, data: dict, pdf_bytes: Optional[bytes] = None) -> None:
+        staged = self.fetch(StagedJob(data), pdf_bytes)
+        try:
+            if not staged.cached:
+                try:
+                    convert_staged(staged)
+                except Exception:
+                    self.fail(staged)
+                    raise
+            self.publish(staged)
+        finally:
+            self.scratch.release(staged.scratch)
+
+    def fetch(self, staged: StagedJob, pdf_bytes: Optional[bytes] = None) -> StagedJob:
         """
-        Docstring for convert_pdf_to_docx
-
-        PDF (supabase) -> DOX -> Supabase
+        Fetch stage: marks the job row, reserves scratch space, downloads
+        the inputs into it and checks the result cache. The caller releases
+        ``staged.scratch`` once the job is done.
         """
+        job_type = staged.job_type
+        path = staged.data["path"]
+        paths = path if isinstance(path, list) else [path]
 
-        record = self.job_repo.get_by_job_id(job_id)
-        if not record:
-            raise Exception("Job not found")
-
-        payload = {
-            "input_url": path,
-            "conversion_type": "convert_pdf_to_docx"
-        }
+        if staged.target_format == "merge" and len(paths) < 2:
+            raise ValueError(
+                "At least two PDF files are required for merging.")
 
-        record = self._update_record(record, **payload)
+        print(f"[worker] fetching {job_type.conversion_type} job {staged.job_id}")
 
-        print(f"[wroker] starting convertion for job id {job_id}")
+        if job_type.tracked:
+            record = self._get_record(staged.job_id)
+            if not record:
+                raise Exception("Job not found")
+            self.state.write(
+                staged.job_id, input_url=path, conversion_type=job_type.conversion_type,
+                status=JobStatus.processing, started_at=datetime.now(timezone.utc))
 
         try:
+            for p in paths:
+                suffix = Path(p).suffix.lower()
+                if suffix != job_type.input_suffix:
+                    raise ConversionFailedError(
+                        f"Unsupported input format: {suffix}")
+
+            if pdf_bytes is not None:
+                staged.scratch = self.scratch.acquire(len(pdf_bytes))
+                input_file = staged.scratch_dir / f"input{job_type.input_suffix}"
+                input_file.write_bytes(pdf_bytes)
+                staged.inputs = [input_file]
+            else:
+                sizes = [self.transfer.object_size(settings.SUPABASE_RAW_BUCKET, p) for p in paths]
+                staged.scratch = self.scratch.acquire(
+                    None if None in sizes else sum(sizes))
+
+                names = ([f"input{job_type.input_suffix}"] if len(paths) == 1
+                         else [f"temp_{i}.pdf" for i in range(len(paths))])
+                if len(paths) == 1 and self.checkpoints.restore_input(
+                        staged.job_id, staged.scratch_dir / names[0], sizes[0]):
+                    # A retry; the input was kept by the earlier attempt.
+                    staged.inputs = [staged.scratch_dir / names[0]]
+                else:
+                    staged.inputs = [
+                        self._download(staged.job_id, settings.SUPABASE_RAW_BUCKET, p,
+                                       staged.scratch_dir / name, size)
+                        for p, name, size in zip(paths, names, sizes)
+                    ]
+                self.scratch.check(staged.scratch)
+
+            staged.storage_path = job_type.output_path(path)
+            if staged.multi_output:
+                # A prefix; the cache only holds single objects.
+                staged.storage_path = staged.storage_path.rsplit(".", 1)[0]
+            else:
+                staged.cache_key = self._cache_key(
+                    staged.inputs, job_type.conversion_type,
+                    **{name: staged.data.get(name) for name in job_type.cache_params})
+            staged.cached = self._reuse_cached(
+                staged.job_id, staged.cache_key, job_type.conversion_type,
+                job_type.output_bucket(), staged.storage_path)
+
+        except Exception:
+            self.fail(staged)
+            self.scratch.release(staged.scratch)
+            staged.scratch = None
+            raise
+
+        return staged
+
+    def publish(self, staged: StagedJob) -> None:
+        """
+        Publish stage: uploads the output and completes the job row. A
+        cache hit was already copied in place during fetch.
+        """
+        job_type = staged.job_type
 
-            file_byte = self.supabase_client.storage.from_(
-                settings.SUPABASE_RAW_BUCKET).download(path=path)
-        except Exception as e:
-            self._update_status(record, JobStatus.failed)
-            print(
-                f"[worker] error downloading file for job {job_id}: {str(e)}")
-            raise FileNotFoundError(
-                f"File not found in storage: {path}") from e
-
-        with tempfile.TemporaryDirectory() as tempdir:
-            tempdir = Path(tempdir)
-
-            suffix = Path(path).suffix.lower()
-
-            if suffix != ".pdf":
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    f"Unsupported input format: {suffix}")
-
-            input_pdf = Path(tempdir) / "input.pdf"
-            output_dir = Path(tempdir) / "output.docx"
-
-            with open(input_pdf, "wb") as f:
-                f.write(file_byte)
-
-            try:
-                cv = Converter(str(input_pdf))
-                cv.convert(str(output_dir))
-                cv.close()
-            except Exception as e:
-                self._update_status(record, JobStatus.failed)
-                print(
-                    f"[worker] error during conversion for job {job_id}: {str(e)}")
-                raise ConversionFailedError(
-                    f"Conversion failed: {str(e)}") from e
-
-            if not output_dir.exists():
-                self._update_status(record, JobStatus.failed)
-                raise ConversionFailedError(
-                    "Conversion failed: No output file found")
-
-            output_storage_path = path.replace(
-                "original.pdf", "converted.docx")
-
+        if not staged.cached:
             try:
+                if staged.multi_output:
+                    files = [(image, f"{staged.storage_path}/{image.name}")
+                             for image in sorted(staged.output.iterdir())]
+                    self._upload_many(staged.job_id, job_type.output_bucket(), files,
+                                      IMAGE_FORMATS[staged.data["image_format"]][1])
+                else:
+                    self._upload(staged.job_id, job_type.output_bucket(),
+                                 staged.output, staged.storage_path, job_type.content_type)
+            except UploadFailedError:
+                self.fail(staged)
+                raise
+
+        if job_type.tracked:
+            self.state.write(
+                staged.job_id, output_url=staged.storage_path,
+                status=JobStatus.completed, finished_at=datetime.now(timezone.utc))
+
+        if not staged.cached:
+            self._remember(
+                staged.cache_key, job_type.output_bucket(), staged.storage_path)
+        self.checkpoints.discard(staged.job_id)
+        self._observe_cost(staged)
+
+        print(f"[worker] upload complete for job {staged.job_id}")
+
+    def _observe_cost(self, staged: StagedJob) -> None:
+        """
+        Feeds the conversion time back into the cost model used to
+        estimate queued jobs. Batched jobs share one LibreOffice start,
+        so they are not representative and are skipped.
+        """
+        if staged.convert_seconds is None:
+            return
+
+        estimate = staged.data.get("estimated_seconds")
+        if estimate:
+            Estimate_Ratio.labels(target_format=staged.target_format).observe(
+                staged.convert_seconds / estimate)
+
+        if self.cost_repo is None:
+            return
+        size = sum(p.stat().st_size for p in staged.inputs if p.exists())
+        per_mb, per_page = observed_rates(
+            staged.target_format, size, staged.page_count, staged.convert_seconds)
+        try:
+            with DB_Duration.labels(operation="observe_cost").time():
+                self.cost_repo.observe(staged.target_format, per_mb, per_page)
+        except Exception as e:
+            print(f"[worker] could not record conversion cost: {e}")
 
-                with open(output_dir, "rb") as f:
-                    self.supabase_client.storage.from_(settings.SUPABASE_CONVERTED_BUCKET).upload(
-                        output_storage_path,
-                        f,
-                        {
-                            "content-type": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            "x-upsert": "true"
-                        },
-                    )
-                self._update_output_url(record, output_storage_path)
-                self._update_status(record, JobStatus.completed)
-
-            except Exception as e:
-                self._update_status(record, JobStatus.failed)
-
-                print(
-                    f"[worker] error uploading file for job {job_id}: {str(e)}")
-                raise UploadFailedError(f"Upload failed: {str(e)}") from e
-
-        print(f"[worker] upload complete for job {job_id}")
+    def fail(self, staged: StagedJob) -> None:
+        if not staged.job_type.tracked:
+            return
+        self.state.write(
+            staged.job_id, status=JobStatus.failed, finished_at=datetime.now(timezone.utc))
 
     def _create_job_record(self, job_id, path, user_id, conversion_type) -> Jobs:
         payload = {
@@ -361,174 +573,98 @@ class Conversion:
             "conversion_type": conversion_type,
             "status": JobStatus.processing
         }
-        return self.job_repo.create(**payload)
+        with DB_Duration.labels(operation="create").time():
+            return self.job_repo.create(**payload)
 
-    def _update_status(self, record, status) -> None:
-        self.job_repo.update_status(record, status)
-        return None
-
-    def _update_record(self, record, **kw) -> Jobs:
-        return self.job_repo.update_records(record, **kw)
+    def _get_record(self, job_id) -> Optional[Jobs]:
+        with DB_Duration.labels(operation="get").time():
+            return self.job_repo.get_by_job_id(job_id)
 
 
-class Compression:
-    def __init__(self, supabase: Client):
-        self.supabase_client = supabase
+class Conversion(JobStages):
+    def __init__(
+        self,
+        supabase: Client,
+        db: Session,
+        transfer: Optional[StorageTransfer] = None,
+        cache: Optional[ResultCache] = None,
+    ):
+        super().__init__(supabase, db, transfer, cache)
 
-    def compress_pdf(self, job_id: str, path: str, quality: str = "ebook", pdf_bytes: Optional[bytes] = None):
+    def convert_pdf_to_ppt(self, job_id: str, path: str, user_id: str):
         """
-        Docstring for compress_pdf
-
-        PDF (supabase) -> Compressed PDF -> Supabase
+        Converter PDF (supabase) -> PPT -> Supabase
         """
+        self.run({"job_id": job_id, "path": path,
+                 "user_id": user_id, "target_format": "pptx"})
 
-        print(f"[wroker] starting compression for job id {job_id}")
-
-        try:
-
-            file_byte = self.supabase_client.storage.from_(
-                settings.SUPABASE_RAW_BUCKET).download(path=path)
-        except Exception as e:
-            print(
-                f"[worker] error downloading file for job {job_id}: {str(e)}")
-            raise FileNotFoundError(
-                f"File not found in storage: {path}") from e
-
-        with tempfile.TemporaryDirectory() as tempdir:
-            tempdir = Path(tempdir)
-
-            suffix = Path(path).suffix.lower()
-
-            if suffix != ".pdf":
-                raise ConversionFailedError(
-                    f"Unsupported input format: {suffix}")
-
-            input_pdf = Path(tempdir) / "input.pdf"
-            output_pdf = Path(tempdir) / "compressed.pdf"
-
-            with open(input_pdf, "wb") as f:
-                f.write(file_byte)
-
-            result = subprocess.run(
-                [
-                    "gs",
-                    "-sDEVICE=pdfwrite",
-                    "-dCompatibilityLevel=1.4",
-                    f"-dPDFSETTINGS=/{quality}",
-                    "-dNOPAUSE",
-                    "-dQUIET",
-                    "-dBATCH",
-                    f"-sOutputFile={output_pdf}",
-                    str(input_pdf),
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if result.returncode != 0:
-                print(
-                    f"[worker] error during compression for job {job_id}: {result.stderr.decode(errors='ignore')}")
-                raise CompressionFailedError(
-                    f"Compression failed: {result.stderr.decode(errors='ignore')}")
+    def convert_docx_to_pdf(self, job_id: str, path: str, user_id: str):
+        """
+        Converter DOCX (supabase) -> PDF -> Supabase
+        """
+        self.run({"job_id": job_id, "path": path,
+                 "user_id": user_id, "target_format": "pdf"})
 
-            if not output_pdf.exists():
-                raise CompressionFailedError(
-                    "Compression failed: No output file found")
+    def convert_pdf_to_docx(self, job_id: str, path: str, user_id: str):
+        """
+        PDF (supabase) -> DOX -> Supabase
+        """
+        self.run({"job_id": job_id, "path": path,
+                 "user_id": user_id, "target_format": "docx"})
 
-            output_storage_path = path.replace(
-                "original.pdf", "compressed.pdf")
+    def convert_pdf_to_image(
+        self,
+        job_id: str,
+        path: str,
+        user_id: str,
+        dpi: Optional[int] = None,
+        image_format: str = "png",
+        pages: Optional[str] = None,
+        delivery: str = "zip",
+    ):
+        """
+        PDF (supabase) -> page images (ZIP or separate files) -> Supabase
+        """
+        self.run({"job_id": job_id, "path": path, "user_id": user_id,
+                  "target_format": "image", "dpi": dpi, "image_format": image_format,
+                  "pages": pages, "delivery": delivery})
 
-            try:
 
-                with open(output_pdf, "rb") as f:
-                    self.supabase_client.storage.from_(settings.SUPABASE_COMPRESSED_BUCKET).upload(
-                        output_storage_path,
-                        f,
-                        {
-                            "content-type": "application/pdf",
-                            "x-upsert": "true"
-                        },
-                    )
-            except Exception as e:
-                print(
-                    f"[worker] error uploading file for job {job_id}: {str(e)}")
-                raise UploadFailedError(f"Upload failed: {str(e)}") from e
+class Compression(JobStages):
 
-        print(f"[worker] upload complete for job {job_id}")
+    def compress_pdf(
+        self,
+        job_id: str,
+        path: str,
+        quality: str = "ebook",
+        pdf_bytes: Optional[bytes] = None,
+        engine: Optional[str] = None,
+    ):
+        """
+        PDF (supabase) -> Compressed PDF -> Supabase
+        """
+        self.run({"job_id": job_id, "path": path, "target_format": "compress",
+                  "quality": quality, "engine": engine}, pdf_bytes)
 
 
-class Customization:
-    def __init__(self, supabase: Client):
-        self.supabase_client = supabase
+class Customization(JobStages):
 
     def merge_pdf(self, job_id: str, path: list[str]):
         """
-        Docstring for merge_pdf
-
         PDF (supabase) -> Merged PDF -> Supabase
         """
+        self.run({"job_id": job_id, "path": path, "target_format": "merge"})
 
-        file_bytes_list = self._download_pdf(job_id, path)
-
-        output_pdf_bytes = self._merge_pdfs(file_bytes_list)
-        output_storage_path = str(Path(path[0]).with_name('merged.pdf'))
-        try:
-            self.supabase_client.storage.from_(settings.SUPABASE_CONVERTED_BUCKET).upload(
-                output_storage_path,
-                output_pdf_bytes,
-                {
-                    "content-type": "application/pdf",
-                    "x-upsert": "true"
-                },
-            )
-        except Exception as e:
-            print(f"[worker] error uploading file for job {job_id}: {str(e)}")
-            raise UploadFailedError(f"Upload failed: {str(e)}") from e
-        print(f"[worker] upload complete for job {job_id}")
-
-    def _merge_pdfs(self, pdf_bytes_list: list[bytes]):
-
-        if len(pdf_bytes_list) < 2:
-            raise ValueError(
-                "At least two PDF files are required for merging.")
-
-        with tempfile.TemporaryDirectory() as tempdir:
-            tempdir = Path(tempdir)
-
-            merger = PdfWriter()
-
-            for i, pdf_bytes in enumerate(pdf_bytes_list):
-                temp_pdf_path = tempdir / f"temp_{i}.pdf"
-                with open(temp_pdf_path, "wb") as f:
-                    f.write(pdf_bytes)
-                reader = PdfReader(str(temp_pdf_path))
-                merger.append(reader)
-
-            output_pdf_path = tempdir / "merged.pdf"
-            merger.write(str(output_pdf_path))
-            merger.close()
-
-            if not output_pdf_path.exists():
-                raise ConversionFailedError(
-                    "Merging failed: No output file found")
-
-            return output_pdf_path.read_bytes()
-
-    def _download_pdf(self, job_id: str, path: list[str]) -> list[bytes]:
+    def split_pdf(
+        self,
+        job_id: str,
+        path: str,
+        mode: str = "every",
+        ranges: Optional[str] = None,
+        every: Optional[int] = None,
+    ):
         """
-        Docstring for download_pdf
-
-        PDF (supabase) -> bytes
+        PDF (supabase) -> ZIP of split PDFs -> Supabase
         """
-        pdf_bytes = []
-        for p in path:
-            try:
-
-                file_byte = self.supabase_client.storage.from_(
-                    settings.SUPABASE_RAW_BUCKET).download(path=p)
-                pdf_bytes.append(file_byte)
-            except Exception as e:
-                print(
-                    f"[worker] error downloading file for job {job_id}: {str(e)}")
-                raise FileNotFoundError(
-                    f"File not found in storage: {p}") from e
-        return pdf_bytes
+        self.run({"job_id": job_id, "path": path, "target_format": "split",
+                  "mode": mode, "ranges": ranges, "every": every})
@@ -15,4 +15,7 @@ class UploadFailedError(Exception):
     pass
 
 class CompressionFailedError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class ScratchQuotaExceededError(Exception):
+    pass
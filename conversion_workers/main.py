@@ -1,11 +1,31 @@
 import asyncio
+from conversion_workers.settings import settings
+from conversion_workers.metrics import start_metrics_server
 from conversion_workers.queue.rabbitmq import init_rabbitmq
 from conversion_workers.queue.consumer import start_consumer
+from conversion_workers.converter.office_pool import check_office_bridge, shutdown_office_pool
+from conversion_workers.converter.executor import conversion_pool
+from conversion_workers.queue.pipeline import job_pipeline
+from conversion_workers.storage.scratch import scratch_space
+from conversion_workers.storage.checkpoint import checkpoint_store
+from conversion_workers.storage.job_state import job_state_writer
 
 
 async def main():
+    check_office_bridge()
+    if settings.METRICS_PORT:
+        start_metrics_server(settings.METRICS_PORT)
+    scratch_space.reset()
+    checkpoint_store.sweep()
+
     connection, channel, retry_exchange, dlx_exchange = await init_rabbitmq()
-    await start_consumer(connection, channel, retry_exchange, dlx_exchange)
+    try:
+        await start_consumer(connection, channel, retry_exchange, dlx_exchange)
+    finally:
+        await job_pipeline.stop()
+        job_state_writer.close()
+        conversion_pool.shutdown()
+        shutdown_office_pool()
 
 
 if __name__ == "__main__":
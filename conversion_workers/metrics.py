@@ -0,0 +1,157 @@
+import os
+import glob
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+# Conversions run in pool processes, so the metrics are written to
+# PROMETHEUS_MULTIPROC_DIR when it is set and aggregated on scrape.
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+Cache_Hits = Counter(
+    "conversion_cache_hits_total",
+    "Conversions served from the content-addressed result cache",
+    ["conversion_type"]
+)
+
+Cache_Misses = Counter(
+    "conversion_cache_misses_total",
+    "Conversions not found in the content-addressed result cache",
+    ["conversion_type"]
+)
+
+Queue_Wait = Histogram(
+    "conversion_queue_wait_seconds",
+    "Time between publishing a job and a worker picking it up",
+    ["target_format", "plan"],
+    buckets=STAGE_BUCKETS
+)
+
+Download_Duration = Histogram(
+    "conversion_download_duration_seconds",
+    "Storage download time per input file",
+    ["bucket"],
+    buckets=STAGE_BUCKETS
+)
+
+Conversion_Duration = Histogram(
+    "conversion_duration_seconds",
+    "Time spent in the converter itself",
+    ["converter", "target_format"],
+    buckets=STAGE_BUCKETS
+)
+
+Upload_Duration = Histogram(
+    "conversion_upload_duration_seconds",
+    "Storage upload time per output file",
+    ["bucket"],
+    buckets=STAGE_BUCKETS
+)
+
+DB_Duration = Histogram(
+    "conversion_db_duration_seconds",
+    "Job table reads and updates made by the worker",
+    ["operation"],
+    buckets=STAGE_BUCKETS
+)
+
+Job_State_Batch = Histogram(
+    "conversion_job_state_batch_size",
+    "Jobs whose row updates were written in one flush",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 200, 500)
+)
+
+Job_Retries = Counter(
+    "conversion_job_retries_total",
+    "Failed jobs republished to the retry queue",
+    ["target_format"]
+)
+
+Job_Dead_Lettered = Counter(
+    "conversion_job_dead_lettered_total",
+    "Failed jobs moved to the DLQ after their last retry",
+    ["target_format"]
+)
+
+Jobs_In_Flight = Gauge(
+    "conversion_jobs_in_flight",
+    "Jobs currently being processed by this worker",
+    ["target_format"],
+    multiprocess_mode="livesum"
+)
+
+Pipeline_Queue_Depth = Gauge(
+    "conversion_pipeline_queue_depth",
+    "Jobs waiting in front of each pipeline stage",
+    ["stage"],
+    multiprocess_mode="livesum"
+)
+
+Scratch_Reserved_Bytes = Gauge(
+    "conversion_scratch_reserved_bytes",
+    "Scratch bytes reserved by running jobs",
+    ["tier"],
+    multiprocess_mode="livesum"
+)
+
+Scratch_Job_Bytes = Histogram(
+    "conversion_scratch_job_bytes",
+    "Scratch bytes a job left behind when it finished",
+    ["tier"],
+    buckets=(2**20, 2**22, 2**24, 2**26, 2**28, 2**30, 2**32)
+)
+
+Scratch_Reclaim_Duration = Histogram(
+    "conversion_scratch_reclaim_seconds",
+    "Time to empty a finished job's scratch directory",
+    ["tier"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+
+Scratch_Rejections = Counter(
+    "conversion_scratch_rejections_total",
+    "Jobs refused because they would exceed a scratch quota",
+    ["reason"]
+)
+
+Estimate_Ratio = Histogram(
+    "conversion_estimate_ratio",
+    "Actual conversion time divided by the estimate the job was queued with",
+    ["target_format"],
+    buckets=(0.1, 0.25, 0.5, 0.8, 1.25, 2, 4, 10)
+)
+
+Checkpoint_Reused = Counter(
+    "conversion_checkpoint_reused_total",
+    "Inputs and page chunks reused from an earlier attempt of the same job",
+    ["kind"]
+)
+
+
+def start_metrics_server(port: int) -> None:
+    """
+    Serves /metrics on ``port``. In multiprocess mode, files left behind
+    by earlier runs are removed first.
+    """
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        start_http_server(port)
+        return
+
+    os.makedirs(multiproc_dir, exist_ok=True)
+    own = f"_{os.getpid()}.db"
+    for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+        if not path.endswith(own):
+            os.remove(path)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=multiproc_dir)
+    start_http_server(port, registry=registry)
+
@@ -1,90 +1,147 @@
 import asyncio
 import json
+import time
 import aio_pika
 
-from conversion_workers.storage.s3_client import supabase
 from conversion_workers.settings import settings
-from conversion_workers.converter.worker import Conversion, Compression, Customization
-from shared_database.connection import SessionLocal
+from conversion_workers.queue.pipeline import job_pipeline
+from conversion_workers.queue.scheduler import JobScheduler
+from conversion_workers.storage.checkpoint import checkpoint_store
+from conversion_workers.metrics import Queue_Wait, Job_Retries, Job_Dead_Lettered, Jobs_In_Flight
 
 MAX_RETRIES = 3
 
 
 async def process_job(data):
-    target_format = data["target_format"]
-    user_id = data["user_id"]
+    """
+    Runs the job through the fetch/convert/publish pipeline. Conversion
+    happens in the process pool, so the event loop stays free for
+    heartbeats and acks.
+    """
+    await job_pipeline.run(data)
+
+
+async def handle_failure(data, message, retry_exchange, dlx_exchange):
+    """
+    Republishes a failed job to the retry exchange, or to the DLQ once it
+    has used up its retries.
+    """
     job_id = data["job_id"]
-    path = data["path"]
-    db = SessionLocal()
+    retry_count = data["retry_count"]
+
+    if retry_count < MAX_RETRIES:
+        retry_count += 1
+
+        await retry_exchange.publish(
+            aio_pika.Message(
+                body=json.dumps({
+                    **data,
+                    "retry_count": retry_count,
+                    "published_at": time.time(),
+                }).encode(),
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                priority=message.priority
+            ),
+            routing_key="retry"
+        )
+        Job_Retries.labels(target_format=data.get("target_format")).inc()
+        print(f"[worker] retry {job_id} ({retry_count})")
+    else:
 
-    if target_format == "docx":
-        Conversion(supabase, db).convert_pdf_to_docx(
-            job_id, path, user_id)
+        await dlx_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                priority=message.priority
+            ),
+            routing_key="dead"
+        )
+        Job_Dead_Lettered.labels(target_format=data.get("target_format")).inc()
+        await asyncio.to_thread(checkpoint_store.discard, job_id)
+        print(f"[worker] moved to DLQ {job_id}")
 
-    elif target_format == "pdf":
-        Conversion(supabase, db).convert_docx_to_pdf(
-            job_id, path, user_id)
 
-    elif target_format == "pptx":
-        Conversion(supabase, db).convert_pdf_to_ppt(
-            job_id, path, user_id)
+async def handle_message(message, retry_exchange, dlx_exchange):
+    async with message.process(requeue=False):
 
-    elif target_format == "merge":
-        Customization(supabase).merge_pdf(
-            job_id, path, user_id)
+        data = json.loads(message.body)
+        job_id = data["job_id"]
+        retry_count = data["retry_count"]
+        target_format = data.get("target_format")
 
-    elif target_format == "compress":
-        Compression(supabase).compress_pdf(
-            job_id, path, user_id)
+        published_at = data.get("published_at")
+        if published_at is not None:
+            Queue_Wait.labels(target_format=target_format, plan=data.get("plan", "free")).observe(
+                max(0.0, time.time() - published_at))
 
-    else:
-        raise ValueError("Unsupported Formate")
+        try:
+            print(f"[worker] processing {job_id}, retry={retry_count}")
+
+            with Jobs_In_Flight.labels(target_format=target_format).track_inprogress():
+                await process_job(data)
+
+            print(f"[worker] finished job {job_id}")
+
+        except Exception as e:
+            print(f"[Worker] Job failed: {e}")
+
+            await handle_failure(data, message, retry_exchange, dlx_exchange)
 
 
 async def start_consumer(connection, channel, retry_exchange, dlx_exchange):
+    """
+    Consumes up to WORKER_CONCURRENCY messages at a time. The broker never
+    pushes more than WORKER_PREFETCH_COUNT unacked messages to this
+    consumer, and every message is still acked, retried or dead-lettered
+    on its own.
+
+    Prefetched messages wait in a JobScheduler, which starts the shortest
+    estimated job first whenever a slot frees up.
+
+    Priorities only reorder messages still in the broker, so a small
+    prefetch lets a paid-plan job overtake a backlog of free ones sooner.
+    """
+    concurrency = max(1, settings.WORKER_CONCURRENCY)
+    prefetch_count = max(concurrency, settings.WORKER_PREFETCH_COUNT)
+
+    await channel.set_qos(prefetch_count=prefetch_count)
 
     queue = await channel.get_queue("main_queue")
 
-    print(f"[worker] waiting for conversion job...")
-
-    async with queue.iterator() as queue_iter:
-        async for message in queue_iter:
-            async with message.process(requeue=False):
-
-                data = json.loads(message.body)
-                job_id = data["job_id"]
-                retry_count = data["retry_count"]
-                try:
-                    print(f"[worker] processing {job_id}, retry={retry_count}")
-
-                    await process_job(data)
-
-                    print(f"[worker] finished job {job_id}")
-
-                except Exception as e:
-                    print(f"[Worker] Job failed: {e}")
-
-                    if retry_count < MAX_RETRIES:
-                        retry_count += 1
-
-                        await retry_exchange.publish(
-                            aio_pika.Message(
-                                body=json.dumps({
-                                    **data,
-                                    "retry_count": retry_count,
-                                }).encode(),
-                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-                            ),
-                            routing_key="retry"
-                        )
-                        print(f"[worker] retry {job_id} ({retry_count})")
-                    else:
-
-                        await dlx_exchange.publish(
-                            aio_pika.Message(
-                                body=message.body,
-                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-                            ),
-                            routing_key="dead"
-                        )
-                        print(f"[worker] moved to DLQ {job_id}")
+    scheduler = JobScheduler()
+    semaphore = asyncio.Semaphore(concurrency)
+    in_flight = set()
+
+    async def run(message):
+        try:
+            await handle_message(message, retry_exchange, dlx_exchange)
+        finally:
+            semaphore.release()
+
+    async def dispatch():
+        while True:
+            await semaphore.acquire()
+            message = await scheduler.pop()
+
+            task = asyncio.create_task(run(message))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+    print(
+        f"[worker] waiting for conversion job... "
+        f"(concurrency={concurrency}, prefetch={prefetch_count}, "
+        f"scheduler={scheduler.policy})")
+
+    dispatcher = asyncio.create_task(dispatch())
+    try:
+        async with queue.iterator() as queue_iter:
+            async for message in queue_iter:
+                scheduler.push(message)
+    finally:
+        # Messages still in the scheduler are unacked; the broker
+        # redelivers them once the channel closes.
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+        if in_flight:
+            print(f"[worker] draining {len(in_flight)} in-flight jobs")
+            await asyncio.gather(*in_flight, return_exceptions=True)
@@ -0,0 +1,197 @@
+import asyncio
+from typing import Optional
+
+from conversion_workers.settings import settings
+from conversion_workers.metrics import Pipeline_Queue_Depth
+from conversion_workers.storage.scratch import scratch_space
+from conversion_workers.converter.executor import (
+    ConversionPool,
+    conversion_pool,
+    fetch_job,
+    publish_job,
+    fail_job,
+)
+
+
+class JobPipeline:
+    """
+    Runs jobs through fetch -> convert -> publish stages connected by
+    bounded queues, so one job can download while another converts and a
+    third uploads.
+
+    Fetch and publish are network bound and run in threads; convert runs
+    in the conversion process pool, one job per pool process. A full
+    queue holds back the stage in front of it, and ``run`` itself waits
+    when the fetch queue is full.
+
+    Small DOCX -> PDF jobs skip the per-job convert path and are gathered
+    into micro-batches of up to LIBREOFFICE_BATCH_SIZE jobs, or whatever
+    arrived within LIBREOFFICE_BATCH_WINDOW_MS, converted in one
+    LibreOffice run and then published one by one.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ConversionPool] = None,
+        fetch_workers: Optional[int] = None,
+        publish_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self.pool = pool or conversion_pool
+        self.fetch_workers = max(1, fetch_workers or settings.PIPELINE_FETCH_WORKERS)
+        self.publish_workers = max(1, publish_workers or settings.PIPELINE_PUBLISH_WORKERS)
+        self.queue_size = max(1, queue_size or settings.PIPELINE_QUEUE_SIZE)
+        self.batch_size = settings.LIBREOFFICE_BATCH_SIZE
+        self.batch_window = settings.LIBREOFFICE_BATCH_WINDOW_MS / 1000
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._batches: set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _start(self) -> None:
+        self._queues = {
+            stage: asyncio.Queue(maxsize=self.queue_size)
+            for stage in ("fetch", "convert", "publish")
+        }
+        # Jobs waiting for a batch already left the convert queue; a batch
+        # is flushed at LIBREOFFICE_BATCH_SIZE, so this one stays small.
+        self._queues["batch"] = asyncio.Queue()
+        # Single conversions and batches share the pool processes.
+        self._slots = asyncio.Semaphore(self.pool.size)
+        stages = (
+            [self._fetch_stage] * self.fetch_workers
+            + [self._convert_stage] * self.pool.size
+            + [self._batch_stage]
+            + [self._publish_stage] * self.publish_workers
+        )
+        self._tasks = [asyncio.create_task(stage()) for stage in stages]
+        print(
+            f"[worker] pipeline started (fetch={self.fetch_workers}, "
+            f"convert={self.pool.size}, publish={self.publish_workers})")
+
+    async def run(self, data: dict) -> None:
+        """
+        Runs one job through every stage; returns when it is published or
+        raises the error of the stage that failed.
+        """
+        if not self._tasks:
+            self._start()
+
+        done = asyncio.get_running_loop().create_future()
+        await self._put("fetch", (data, done))
+        await done
+
+    async def _put(self, stage: str, item) -> None:
+        await self._queues[stage].put(item)
+        Pipeline_Queue_Depth.labels(stage=stage).set(self._queues[stage].qsize())
+
+    async def _get(self, stage: str):
+        item = await self._queues[stage].get()
+        Pipeline_Queue_Depth.labels(stage=stage).set(self._queues[stage].qsize())
+        return item
+
+    async def _fetch_stage(self) -> None:
+        while True:
+            data, done = await self._get("fetch")
+            try:
+                staged = await asyncio.to_thread(fetch_job, data)
+            except Exception as e:
+                _settle(done, e)
+                continue
+
+            await self._put("publish" if staged.cached else "convert", (staged, done))
+
+    async def _convert_stage(self) -> None:
+        while True:
+            staged, done = await self._get("convert")
+            if staged.batchable:
+                await self._put("batch", (staged, done))
+                continue
+
+            try:
+                async with self._slots:
+                    staged = await self.pool.convert(staged)
+            except Exception as e:
+                await self._fail(staged, done, e)
+                continue
+
+            await self._put("publish", (staged, done))
+
+    async def _batch_stage(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._get("batch")]
+            deadline = loop.time() + self.batch_window
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._get("batch"), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep collecting the next batch while this one converts.
+            task = asyncio.create_task(self._convert_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _convert_batch(self, batch: list) -> None:
+        print(f"[worker] converting batch of {len(batch)} DOCX jobs")
+        try:
+            async with self._slots:
+                results = await self.pool.convert_batch([staged for staged, _ in batch])
+        except Exception as e:
+            for staged, done in batch:
+                await self._fail(staged, done, e)
+            return
+
+        for (staged, error), (_, done) in zip(results, batch):
+            if error is not None:
+                await self._fail(staged, done, error)
+            else:
+                await self._put("publish", (staged, done))
+
+    async def _fail(self, staged, done: asyncio.Future, error: Exception) -> None:
+        try:
+            await asyncio.to_thread(fail_job, staged)
+        except Exception as db_error:
+            print(f"[worker] could not mark job {staged.job_id} failed: {db_error}")
+        await _cleanup(staged)
+        _settle(done, error)
+
+    async def _publish_stage(self) -> None:
+        while True:
+            staged, done = await self._get("publish")
+            try:
+                await asyncio.to_thread(publish_job, staged)
+            except Exception as e:
+                _settle(done, e)
+            else:
+                _settle(done)
+            finally:
+                await _cleanup(staged)
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._batches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+
+def _settle(done: asyncio.Future, error: Optional[BaseException] = None) -> None:
+    if done.done():
+        return
+    if error is None:
+        done.set_result(None)
+    else:
+        done.set_exception(error)
+
+
+async def _cleanup(staged) -> None:
+    await asyncio.to_thread(scratch_space.release, staged.scratch)
+
+
+job_pipeline = JobPipeline()
@@ -9,6 +9,9 @@ main_exchange = None
 retry_exchange = None
 dlx_exchange = None
 
+# Jobs carry a per-plan message priority (see upload_service producer).
+MAX_PRIORITY = 10
+
 
 async def init_rabbitmq():
     global connection, channel
@@ -25,7 +28,8 @@ async def init_rabbitmq():
         "main_queue",
         durable=True,
         arguments={
-            "x-dead-letter-exchange": "retry_exchange"
+            "x-dead-letter-exchange": "retry_exchange",
+            "x-max-priority": MAX_PRIORITY
         }
     )
 
@@ -34,7 +38,8 @@ async def init_rabbitmq():
         durable=True,
         arguments={
             "x-message-ttl": 5000,
-            "x-dead-letter-exchange": "main_queue"
+            "x-dead-letter-exchange": "main_exchange",
+            "x-dead-letter-routing-key": "main"
         }
     )
 
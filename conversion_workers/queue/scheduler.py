@@ -0,0 +1,61 @@
+import json
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Optional
+
+from conversion_workers.settings import settings
+from shared_database.cost_model import estimate_seconds
+
+
+class JobScheduler:
+    """
+    Holds prefetched messages and hands them out shortest job first.
+
+    Higher message priority (the user's plan) still goes first. Within a
+    priority, a message ranks by its estimated conversion time
+    (``estimated_seconds`` from the producer) plus SCHEDULER_AGING_RATE
+    times its publish time, so every second a job waits counts as that
+    many seconds less work and a long job is never overtaken forever.
+    With SCHEDULER_POLICY "fifo" messages run in publish order.
+
+    Only messages the broker has already delivered are reordered, so the
+    window is WORKER_PREFETCH_COUNT minus the jobs in flight.
+    """
+
+    def __init__(self, policy: Optional[str] = None, aging_rate: Optional[float] = None):
+        self.policy = policy or settings.SCHEDULER_POLICY
+        self.aging_rate = settings.SCHEDULER_AGING_RATE if aging_rate is None else aging_rate
+        self._heap: list = []
+        self._order = itertools.count()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def rank(self, message) -> float:
+        try:
+            data = json.loads(message.body)
+        except ValueError:
+            return 0.0  # let it fail fast in handle_message
+
+        published_at = data.get("published_at") or time.time()
+        if self.policy == "fifo":
+            return published_at
+
+        estimate = data.get("estimated_seconds")
+        if estimate is None:
+            estimate = estimate_seconds(data.get("target_format"), None)
+        return estimate + self.aging_rate * published_at
+
+    def push(self, message) -> None:
+        heapq.heappush(self._heap, (
+            -(message.priority or 0), self.rank(message), next(self._order), message))
+        self._ready.set()
+
+    async def pop(self):
+        while not self._heap:
+            self._ready.clear()
+            await self._ready.wait()
+        return heapq.heappop(self._heap)[-1]
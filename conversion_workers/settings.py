@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Optional
 import os
 
 
@@ -14,6 +15,114 @@ class Settings(BaseSettings):
     RABBITMQ_URL: str
     QUEUE_NAME: str
 
+    # LibreOffice daemon pool per conversion process
+    # (0 disables it and falls back to one-shot soffice). It needs the
+    # python3-uno bridge; the worker will not start without it otherwise.
+    # Every conversion process starts its own LIBREOFFICE_POOL_SIZE soffice
+    # instances on its first office job, each taking roughly 150-300 MB,
+    # recycled after LIBREOFFICE_MAX_CONVERSIONS documents.
+    LIBREOFFICE_POOL_SIZE: int = 1
+    LIBREOFFICE_MAX_CONVERSIONS: int = 200
+    LIBREOFFICE_STARTUP_TIMEOUT: int = 30
+    LIBREOFFICE_CONVERT_TIMEOUT: int = 120
+    LIBREOFFICE_HEALTH_INTERVAL: int = 30
+
+    # Micro-batching of small DOCX -> PDF jobs into one LibreOffice run:
+    # at most BATCH_SIZE files (1 disables it), collected for at most
+    # BATCH_WINDOW_MS, each no larger than BATCH_MAX_BYTES. Only used when
+    # LIBREOFFICE_POOL_SIZE is 0; warm instances gain nothing from it.
+    LIBREOFFICE_BATCH_SIZE: int = 8
+    LIBREOFFICE_BATCH_WINDOW_MS: int = 200
+    LIBREOFFICE_BATCH_MAX_BYTES: int = 1024 * 1024
+
+    # Conversion process pool (0 = one process per CPU core). Each process
+    # costs roughly 100 MB on its own, plus its soffice instances, plus up to
+    # PAGE_WORKERS short-lived processes while it renders one document's
+    # pages in parallel. A process, and the soffice it owns, is replaced
+    # after CONVERSION_MAX_TASKS_PER_CHILD tasks; with the LibreOffice pool
+    # on, that is never fewer than LIBREOFFICE_MAX_CONVERSIONS.
+    CONVERSION_POOL_SIZE: int = 0
+    CONVERSION_TASK_TIMEOUT: int = 600
+    CONVERSION_MAX_TASKS_PER_CHILD: int = 200
+
+    # Messages processed concurrently by one consumer, and the broker-side
+    # unacked window (never lower than the concurrency)
+    WORKER_CONCURRENCY: int = 4
+    WORKER_PREFETCH_COUNT: int = 8
+
+    # Order of prefetched jobs: "sjf" runs the shortest estimated job
+    # first, each second of waiting counting as SCHEDULER_AGING_RATE
+    # seconds less work; "fifo" keeps publish order.
+    SCHEDULER_POLICY: str = "sjf"
+    SCHEDULER_AGING_RATE: float = 1.0
+
+    # Pipelined stages: threads downloading / uploading at once, and how
+    # many jobs may wait between two stages. The convert stage runs one job
+    # per conversion pool process.
+    PIPELINE_FETCH_WORKERS: int = 2
+    PIPELINE_PUBLISH_WORKERS: int = 2
+    PIPELINE_QUEUE_SIZE: int = 2
+
+    # Job row updates are buffered and written in one batch every
+    # JOB_STATE_FLUSH_MS (0 writes each at once), or as soon as
+    # JOB_STATE_BATCH_SIZE jobs have updates waiting.
+    JOB_STATE_FLUSH_MS: int = 20
+    JOB_STATE_BATCH_SIZE: int = 200
+
+    # Page-parallel engines: processes one document may fan out to
+    # (0 = one per CPU core) and the page count below which they stay inline
+    PAGE_WORKERS: int = 4
+    PAGE_PARALLEL_MIN_PAGES: int = 8
+
+    PPTX_RENDER_DPI: int = 150
+    # pdf2docx pays a whole-document analysis per range, so it needs longer
+    # documents before splitting pays off
+    DOCX_PARALLEL_MIN_PAGES: int = 40
+
+    # PDF -> image rendering; IMAGE_QUALITY applies to JPEG and WebP
+    IMAGE_RENDER_DPI: int = 150
+    IMAGE_MAX_DPI: int = 600
+    IMAGE_QUALITY: int = 85
+
+    # compress_pdf engine: "ghostscript" re-renders the whole document,
+    # "pymupdf" only downsamples and re-encodes embedded images
+    COMPRESSION_ENGINE: str = "ghostscript"
+    # Images with a smaller raw stream are left alone
+    COMPRESSION_MIN_IMAGE_BYTES: int = 8 * 1024
+
+    # Streaming storage transfers
+    TRANSFER_CHUNK_SIZE: int = 1024 * 1024
+    TRANSFER_RANGED_THRESHOLD: int = 32 * 1024 * 1024
+    TRANSFER_RANGED_PARTS: int = 4
+    TRANSFER_TIMEOUT: int = 300
+
+    # Job scratch space: small jobs on tmpfs, the rest on disk. A job
+    # reserves its input size times SCRATCH_SIZE_FACTOR against the quotas.
+    SCRATCH_DISK_DIR: Optional[str] = None
+    SCRATCH_TMPFS_DIR: Optional[str] = "/dev/shm/docconvert"
+    SCRATCH_TMPFS_MAX_JOB_BYTES: int = 64 * 1024 * 1024
+    SCRATCH_TMPFS_QUOTA_BYTES: int = 512 * 1024 * 1024
+    SCRATCH_DISK_QUOTA_BYTES: int = 20 * 1024 * 1024 * 1024
+    SCRATCH_JOB_QUOTA_BYTES: int = 4 * 1024 * 1024 * 1024
+    SCRATCH_SIZE_FACTOR: int = 4
+    SCRATCH_REUSE_MAX: int = 8
+
+    # Page-chunk checkpoints of retried jobs (CHECKPOINT_TTL_SECONDS=0
+    # disables them); pdf2docx saves one per DOCX_CHECKPOINT_PAGES pages.
+    CHECKPOINT_DIR: Optional[str] = None
+    CHECKPOINT_TTL_SECONDS: int = 3600
+    DOCX_CHECKPOINT_PAGES: int = 100
+
+    # Content-addressed result cache (disabled when REDIS_URL is unset)
+    REDIS_URL: Optional[str] = None
+    RESULT_CACHE_TTL: int = 7 * 24 * 3600
+    RESULT_CACHE_MAX_ENTRIES: int = 100_000
+    # Job status cache read by the status service (same Redis)
+    STATUS_CACHE_TTL: int = 24 * 3600
+
+    # Prometheus /metrics port of the worker (0 disables the endpoint)
+    METRICS_PORT: int = 9101
+
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parents[0]/".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,130 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from conversion_workers.settings import settings
+from conversion_workers.metrics import Checkpoint_Reused
+
+
+class Checkpoint:
+    """
+    A job's checkpoint directory. Plain values only, so it travels with
+    the job into pool processes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def input_path(self, suffix: str) -> Path:
+        return self.path / f"input{suffix}"
+
+    def keep_input(self, src: Path) -> None:
+        """
+        Keeps the downloaded input, so a retry of the job does not have
+        to download it again.
+        """
+        dest = self.input_path(src.suffix)
+        if dest.exists():
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+
+    def chunk(self, name: str) -> Optional[Path]:
+        """
+        A completed chunk, if an earlier attempt saved it.
+        """
+        path = self.path / name
+        if path.exists():
+            Checkpoint_Reused.labels(kind="chunk").inc()
+            return path
+        return None
+
+
+class CheckpointStore:
+    """
+    Per-job checkpoint directories on local disk, keyed by job_id.
+
+    Engines that convert in page chunks save each finished chunk here,
+    together with the input, so a retry or a redelivered message resumes
+    from the chunks that are already done. A job's checkpoints are
+    removed once it is published or dead-lettered; anything older than
+    CHECKPOINT_TTL_SECONDS is swept.
+    """
+
+    def __init__(self):
+        root = settings.CHECKPOINT_DIR or os.path.join(
+            settings.SCRATCH_DISK_DIR or tempfile.gettempdir(), "docconvert_checkpoints")
+        self.root = Path(root)
+        self.ttl = settings.CHECKPOINT_TTL_SECONDS
+        self.enabled = self.ttl > 0
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def get(self, job_id: str) -> Optional[Checkpoint]:
+        if not self.enabled:
+            return None
+        return Checkpoint(self.root / _safe(job_id))
+
+    def restore_input(self, job_id: str, dest: Path, size: Optional[int]) -> bool:
+        """
+        Copies the input kept by an earlier attempt to ``dest``. Only when
+        its size matches the object in storage.
+        """
+        checkpoint = self.get(job_id)
+        if checkpoint is None:
+            return False
+
+        kept = checkpoint.input_path(dest.suffix)
+        try:
+            if size is None or kept.stat().st_size != size:
+                return False
+            try:
+                os.link(kept, dest)
+            except OSError:
+                shutil.copyfile(kept, dest)
+        except OSError:
+            return False
+
+        Checkpoint_Reused.labels(kind="input").inc()
+        print(f"[worker] reusing checkpointed input for job {job_id}")
+        return True
+
+    def discard(self, job_id: str) -> None:
+        if not self.enabled:
+            return
+        shutil.rmtree(self.root / _safe(job_id), ignore_errors=True)
+        if time.time() - self._last_sweep > self.ttl / 4:
+            self.sweep()
+
+    def sweep(self) -> None:
+        """
+        Removes checkpoints of jobs that were never finished.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._last_sweep = time.time()
+            self.root.mkdir(parents=True, exist_ok=True)
+            cutoff = self._last_sweep - self.ttl
+            for entry in self.root.iterdir():
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        shutil.rmtree(entry, ignore_errors=True)
+                except OSError:
+                    pass
+
+
+def _safe(job_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(job_id))
+
+
+checkpoint_store = CheckpointStore()
@@ -0,0 +1,131 @@
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from conversion_workers.settings import settings
+from conversion_workers.metrics import DB_Duration, Job_State_Batch
+from conversion_workers.storage.status_cache import StatusCache, status_cache
+from shared_database.repository import JobRepository
+
+
+class JobStateWriter:
+    """
+    Write-behind buffer for job row updates.
+
+    The fetch, publish and fail stages hand their transitions (status,
+    input/output URLs, timings) to ``write`` instead of committing each
+    one. Updates to the same job are merged, and a background thread
+    writes everything pending every JOB_STATE_FLUSH_MS, or sooner once
+    JOB_STATE_BATCH_SIZE jobs are waiting, in one transaction on a
+    short-lived session. ``close`` flushes what is left, so a clean
+    shutdown loses nothing; JOB_STATE_FLUSH_MS=0 writes every update at
+    once.
+
+    Every flush also writes the same updates through to the job status
+    cache once they are committed, so readers never see a state the
+    database does not have.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        flush_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        cache: Optional[StatusCache] = None,
+    ):
+        self._session_factory = session_factory
+        self.cache = cache or status_cache
+        self.interval = (settings.JOB_STATE_FLUSH_MS if flush_ms is None else flush_ms) / 1000
+        self.batch_size = max(1, batch_size or settings.JOB_STATE_BATCH_SIZE)
+        self._pending: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def write(self, job_id, **fields) -> None:
+        key = str(job_id)
+        with self._lock:
+            self._pending.setdefault(key, {"id": key}).update(fields)
+            pending = len(self._pending)
+            if self.interval > 0 and not self._closed and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="job-state-writer", daemon=True)
+                self._thread.start()
+
+        if self.interval <= 0 or self._closed:
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        # One flush at a time keeps the updates of a job in order.
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = list(self._pending.values()), {}
+            if not rows:
+                return
+
+            try:
+                with DB_Duration.labels(operation="flush_job_state").time():
+                    db = self._session()
+                    try:
+                        JobRepository(db).bulk_update(rows)
+                    finally:
+                        db.close()
+                Job_State_Batch.observe(len(rows))
+            except Exception as e:
+                print(f"[worker] could not write {len(rows)} job updates: {e}")
+                self._requeue(rows)
+                raise
+            self.cache.publish(rows)
+
+    def close(self) -> None:
+        """
+        Stops the flush thread and writes everything still pending.
+        """
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+        try:
+            self.flush()
+        except Exception:
+            with self._lock:
+                lost = list(self._pending)
+            print(f"[worker] job updates not written for: {', '.join(lost)}")
+
+    def _run(self) -> None:
+        wait = self.interval
+        while True:
+            self._wake.wait(wait)
+            self._wake.clear()
+            with self._lock:
+                if self._closed:
+                    return
+            try:
+                self.flush()
+                wait = self.interval
+            except Exception:
+                # Requeued; back off while the database is unavailable.
+                wait = max(self.interval, 1.0)
+
+    def _requeue(self, rows: list[dict]) -> None:
+        # Updates made since the failed flush win over the requeued ones.
+        with self._lock:
+            for row in rows:
+                newer = self._pending.get(row["id"], {})
+                self._pending[row["id"]] = {**row, **newer}
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from shared_database.connection import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+
+job_state_writer = JobStateWriter()
@@ -0,0 +1,119 @@
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+import redis
+
+from conversion_workers.settings import settings
+from conversion_workers.metrics import Cache_Hits, Cache_Misses
+
+KEY_PREFIX = "convcache"
+INDEX_KEY = f"{KEY_PREFIX}:lru"
+
+
+def content_hash(files: list[Path]) -> str:
+    """
+    sha256 of one file, or of the ordered per-file digests for
+    multi-input jobs such as merges.
+    """
+    digests = []
+    for file in files:
+        with open(file, "rb") as f:
+            digests.append(hashlib.file_digest(f, "sha256").hexdigest())
+    if len(digests) == 1:
+        return digests[0]
+    return hashlib.sha256(":".join(digests).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed index of finished outputs, kept in Redis.
+
+    Keys combine the input hash, the conversion type and any parameters
+    that change the output. Entries expire after RESULT_CACHE_TTL seconds
+    without a hit, and the least recently used ones are evicted once the
+    index holds more than RESULT_CACHE_MAX_ENTRIES. A cache failure never
+    fails a job; it is reported and treated as a miss.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        redis_url = redis_url or settings.REDIS_URL
+        self.ttl = ttl or settings.RESULT_CACHE_TTL
+        self.max_entries = max_entries or settings.RESULT_CACHE_MAX_ENTRIES
+        self._redis = redis.Redis.from_url(
+            redis_url, decode_responses=True) if redis_url else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    @staticmethod
+    def make_key(digest: str, conversion_type: str, **params) -> str:
+        options = ",".join(
+            f"{name}={value}" for name, value in sorted(params.items()) if value is not None)
+        return f"{KEY_PREFIX}:{conversion_type}:{digest}:{options}"
+
+    def lookup(self, key: str, conversion_type: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            raw = self._redis.get(key)
+            if raw is None:
+                Cache_Misses.labels(conversion_type=conversion_type).inc()
+                return None
+
+            pipe = self._redis.pipeline()
+            pipe.expire(key, self.ttl)
+            pipe.zadd(INDEX_KEY, {key: time.time()})
+            pipe.execute()
+
+        except redis.RedisError as e:
+            print(f"[cache] lookup failed: {e}")
+            Cache_Misses.labels(conversion_type=conversion_type).inc()
+            return None
+
+        Cache_Hits.labels(conversion_type=conversion_type).inc()
+        return json.loads(raw)
+
+    def store(self, key: str, bucket: str, path: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            pipe = self._redis.pipeline()
+            pipe.set(key, json.dumps({"bucket": bucket, "path": path}), ex=self.ttl)
+            pipe.zadd(INDEX_KEY, {key: time.time()})
+            pipe.zcard(INDEX_KEY)
+            size = pipe.execute()[-1]
+
+            if size > self.max_entries:
+                self._evict(size - self.max_entries)
+
+        except redis.RedisError as e:
+            print(f"[cache] store failed: {e}")
+
+    def invalidate(self, key: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            pipe = self._redis.pipeline()
+            pipe.delete(key)
+            pipe.zrem(INDEX_KEY, key)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"[cache] invalidate failed: {e}")
+
+    def _evict(self, count: int) -> None:
+        # Index members whose key already expired are dropped here as well.
+        oldest = self._redis.zpopmin(INDEX_KEY, count)
+        if oldest:
+            self._redis.delete(*[member for member, _ in oldest])
+
+
+result_cache = ResultCache()
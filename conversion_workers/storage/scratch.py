@@ -0,0 +1,185 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from conversion_workers.settings import settings
+from conversion_workers.exception import ScratchQuotaExceededError
+from conversion_workers.metrics import (
+    Scratch_Reserved_Bytes,
+    Scratch_Job_Bytes,
+    Scratch_Reclaim_Duration,
+    Scratch_Rejections,
+)
+
+TMPFS = "tmpfs"
+DISK = "disk"
+
+# Reservation for jobs whose input size is unknown
+UNKNOWN_SIZE_RESERVATION = 64 * 1024 * 1024
+MIN_RESERVATION = 1024 * 1024
+
+
+class Scratch:
+    """
+    A job's scratch directory and the bytes reserved for it. Plain values
+    only, so it travels with the job into pool processes.
+    """
+
+    def __init__(self, path: Path, tier: str, reserved: int):
+        self.path = path
+        self.tier = tier
+        self.reserved = reserved
+
+
+def directory_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ScratchSpace:
+    """
+    Hands out per-job scratch directories.
+
+    Jobs whose reservation (input bytes x SCRATCH_SIZE_FACTOR) fits under
+    SCRATCH_TMPFS_MAX_JOB_BYTES go to the RAM-backed tmpfs root while its
+    total quota allows, everything else to disk. A job that fits nowhere
+    is rejected with ScratchQuotaExceededError and goes through the normal
+    retry path. Released directories are emptied and kept for the next
+    job instead of being removed and created again.
+    """
+
+    def __init__(self):
+        self.size_factor = settings.SCRATCH_SIZE_FACTOR
+        self.job_quota = settings.SCRATCH_JOB_QUOTA_BYTES
+        self.tmpfs_max_job = settings.SCRATCH_TMPFS_MAX_JOB_BYTES
+        self.reuse_max = settings.SCRATCH_REUSE_MAX
+
+        self._roots = {
+            DISK: Path(settings.SCRATCH_DISK_DIR or tempfile.gettempdir()) / "docconvert",
+        }
+        self._quotas = {
+            DISK: settings.SCRATCH_DISK_QUOTA_BYTES,
+            TMPFS: settings.SCRATCH_TMPFS_QUOTA_BYTES,
+        }
+        if settings.SCRATCH_TMPFS_DIR:
+            self._roots[TMPFS] = Path(settings.SCRATCH_TMPFS_DIR)
+
+        self._reserved = {tier: 0 for tier in self._roots}
+        self._free: dict[str, list[Path]] = {tier: [] for tier in self._roots}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _prepare(self) -> None:
+        if self._ready:
+            return
+        for tier, root in list(self._roots.items()):
+            try:
+                root.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                if tier == DISK:
+                    raise
+                print(f"[worker] tmpfs scratch disabled, {root} unusable: {e}")
+                del self._roots[tier]
+        self._ready = True
+
+    def reset(self) -> None:
+        """
+        Removes directories left behind by an earlier run. Only call it in
+        the process that owns the scratch roots.
+        """
+        with self._lock:
+            self._prepare()
+            for root in self._roots.values():
+                for entry in root.glob("job_*"):
+                    shutil.rmtree(entry, ignore_errors=True)
+            for free in self._free.values():
+                free.clear()
+
+    def acquire(self, input_bytes: Optional[int]) -> Scratch:
+        if input_bytes is None:
+            reservation = UNKNOWN_SIZE_RESERVATION
+        else:
+            reservation = max(MIN_RESERVATION, input_bytes * self.size_factor)
+
+        if reservation > self.job_quota:
+            Scratch_Rejections.labels(reason="job_quota").inc()
+            raise ScratchQuotaExceededError(
+                f"Job needs ~{reservation} scratch bytes, above the per-job quota of {self.job_quota}")
+
+        with self._lock:
+            self._prepare()
+            tier = self._pick_tier(reservation)
+            if tier is None:
+                Scratch_Rejections.labels(reason="total_quota").inc()
+                raise ScratchQuotaExceededError(
+                    "Scratch space is full, try again later")
+
+            self._reserved[tier] += reservation
+            Scratch_Reserved_Bytes.labels(tier=tier).set(self._reserved[tier])
+            free = self._free[tier]
+            path = free.pop() if free else None
+
+        if path is None:
+            path = Path(tempfile.mkdtemp(prefix="job_", dir=self._roots[tier]))
+        return Scratch(path, tier, reservation)
+
+    def _pick_tier(self, reservation: int) -> Optional[str]:
+        tiers = [TMPFS, DISK] if reservation <= self.tmpfs_max_job else [DISK]
+        for tier in tiers:
+            if tier in self._roots and self._reserved[tier] + reservation <= self._quotas[tier]:
+                return tier
+        return None
+
+    def check(self, scratch: Scratch) -> None:
+        """
+        Fails the job once its directory grows past the per-job quota.
+        """
+        used = directory_size(scratch.path)
+        if used > self.job_quota:
+            Scratch_Rejections.labels(reason="job_quota").inc()
+            raise ScratchQuotaExceededError(
+                f"Job used {used} scratch bytes, above the per-job quota of {self.job_quota}")
+
+    def release(self, scratch: Optional[Scratch]) -> None:
+        if scratch is None:
+            return
+
+        Scratch_Job_Bytes.labels(tier=scratch.tier).observe(directory_size(scratch.path))
+        start = time.perf_counter()
+
+        emptied = True
+        try:
+            for entry in os.scandir(scratch.path):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+        except OSError as e:
+            print(f"[worker] could not empty scratch {scratch.path}: {e}")
+            emptied = False
+
+        with self._lock:
+            self._reserved[scratch.tier] -= scratch.reserved
+            Scratch_Reserved_Bytes.labels(tier=scratch.tier).set(self._reserved[scratch.tier])
+            free = self._free[scratch.tier]
+            reuse = emptied and len(free) < self.reuse_max
+            if reuse:
+                free.append(scratch.path)
+
+        if not reuse:
+            shutil.rmtree(scratch.path, ignore_errors=True)
+        Scratch_Reclaim_Duration.labels(tier=scratch.tier).observe(
+            time.perf_counter() - start)
+
+
+scratch_space = ScratchSpace()
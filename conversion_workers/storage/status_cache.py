@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+import redis
+
+from conversion_workers.settings import settings
+from shared_database.job_status import STATUS_CHANNEL, status_key, to_cache
+
+
+class StatusCache:
+    """
+    Write-through side of the job status cache read by the status
+    service. Each batch of job updates becomes one Redis pipeline that
+    merges the new fields into the jobs' hashes, refreshes their TTL and
+    publishes the job_ids. Like the result cache, a Redis failure is
+    reported and never fails a job; readers fall back to Postgres.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: Optional[int] = None):
+        redis_url = redis_url or settings.REDIS_URL
+        self.ttl = ttl or settings.STATUS_CACHE_TTL
+        self._redis = redis.Redis.from_url(
+            redis_url, decode_responses=True) if redis_url else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    def publish(self, rows: list[dict]) -> None:
+        if not self.enabled or not rows:
+            return
+        updated_at = datetime.now(timezone.utc)
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for row in rows:
+                key = status_key(row["id"])
+                pipe.hset(key, mapping=to_cache({**row, "updated_at": updated_at}))
+                pipe.expire(key, self.ttl)
+                pipe.publish(STATUS_CHANNEL, row["id"])
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"[status] publish failed: {e}")
+
+
+status_cache = StatusCache()
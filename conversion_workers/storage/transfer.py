@@ -0,0 +1,157 @@
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from conversion_workers.settings import settings
+from conversion_workers.exception import FileNotFoundError, UploadFailedError
+
+
+class StorageTransfer:
+    """
+    Streams objects between Supabase Storage and the local scratch
+    directory in bounded chunks, so worker memory does not grow with
+    document size. Large downloads are split into parallel ranged GETs
+    written straight to their offsets in the destination file.
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        ranged_threshold: Optional[int] = None,
+        ranged_parts: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ):
+        self.chunk_size = chunk_size or settings.TRANSFER_CHUNK_SIZE
+        self.ranged_threshold = ranged_threshold or settings.TRANSFER_RANGED_THRESHOLD
+        self.ranged_parts = ranged_parts or settings.TRANSFER_RANGED_PARTS
+
+        self._base_url = f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1"
+        self._client = httpx.Client(
+            headers={
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+                "apikey": settings.SUPABASE_SERVICE_KEY,
+            },
+            timeout=httpx.Timeout(timeout or settings.TRANSFER_TIMEOUT, connect=10),
+            limits=httpx.Limits(max_connections=max(10, self.ranged_parts * 2)),
+        )
+
+    def _object_url(self, bucket: str, path: str) -> str:
+        return f"{self._base_url}/object/{bucket}/{quote(path.lstrip('/'))}"
+
+    def object_size(self, bucket: str, path: str) -> Optional[int]:
+        try:
+            response = self._client.head(self._object_url(bucket, path))
+            response.raise_for_status()
+        except Exception as e:
+            raise FileNotFoundError(
+                f"File not found in storage: {path}") from e
+        length = response.headers.get("content-length")
+        return int(length) if length else None
+
+    def download_to(self, bucket: str, path: str, dest: Path, size: Optional[int] = None) -> int:
+        """
+        Downloads ``bucket/path`` into ``dest`` and returns the byte count.
+        ``size`` skips the HEAD request when the caller already knows it.
+        """
+        try:
+            if size is None:
+                size = self.object_size(bucket, path)
+
+            if size and size >= self.ranged_threshold and self.ranged_parts > 1:
+                if self._ranged_download(bucket, path, dest, size):
+                    return size
+
+            return self._stream_download(bucket, path, dest)
+
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise FileNotFoundError(
+                f"File not found in storage: {path}") from e
+
+    def _stream_download(self, bucket: str, path: str, dest: Path) -> int:
+        written = 0
+        with self._client.stream("GET", self._object_url(bucket, path)) as response:
+            response.raise_for_status()
+            with open(dest, "wb") as f:
+                for chunk in response.iter_bytes(self.chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+        return written
+
+    def _ranged_download(self, bucket: str, path: str, dest: Path, size: int) -> bool:
+        """
+        Returns False when the server ignores Range, so the caller can
+        fall back to a single stream.
+        """
+        url = self._object_url(bucket, path)
+        part_size = -(-size // self.ranged_parts)
+        ranges = [
+            (start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+        ]
+
+        with open(dest, "wb") as f:
+            f.truncate(size)
+
+        fd = os.open(dest, os.O_WRONLY)
+        try:
+            def fetch(byte_range: tuple[int, int]) -> bool:
+                start, end = byte_range
+                headers = {"Range": f"bytes={start}-{end}"}
+                with self._client.stream("GET", url, headers=headers) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        return False
+                    offset = start
+                    for chunk in response.iter_bytes(self.chunk_size):
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                    if offset != end + 1:
+                        raise IOError(
+                            f"Short ranged read for {path}: {offset - start} of {end - start + 1} bytes")
+                return True
+
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                return all(pool.map(fetch, ranges))
+        finally:
+            os.close(fd)
+
+    def _iter_file(self, src: Path) -> Iterator[bytes]:
+        with open(src, "rb") as f:
+            while chunk := f.read(self.chunk_size):
+                yield chunk
+
+    def upload_from(self, bucket: str, path: str, src: Path, content_type: str) -> None:
+        """
+        Streams ``src`` to ``bucket/path`` (upsert) without reading it into
+        memory.
+        """
+        try:
+            response = self._client.post(
+                self._object_url(bucket, path),
+                content=self._iter_file(src),
+                headers={
+                    "content-type": content_type,
+                    "content-length": str(src.stat().st_size),
+                    "x-upsert": "true",
+                },
+            )
+            response.raise_for_status()
+        except Exception as e:
+            raise UploadFailedError(f"Upload failed: {str(e)}") from e
+
+    def upload_many(self, bucket: str, files: list[tuple[Path, str]], content_type: str) -> None:
+        """
+        Uploads ``(src, path)`` pairs, a few at a time.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, self.ranged_parts)) as pool:
+            for _ in pool.map(lambda item: self.upload_from(bucket, item[1], item[0], content_type), files):
+                pass
+
+
+storage_transfer = StorageTransfer()
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from conversion_workers.converter import executor
+from conversion_workers.converter.executor import ConversionPool
+from conversion_workers.exception import ConversionTimeoutError
+
+
+def hang() -> None:
+    # Stands in for a conversion stuck in native code: the alarm is ignored.
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(60)
+
+
+def slow_pid(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def test_a_hung_task_replaces_only_its_own_process(monkeypatch):
+    monkeypatch.setattr(executor, "TIMEOUT_GRACE_SECONDS", 0)
+    pool = ConversionPool(size=2, task_timeout=60)
+
+    async def run():
+        # Start both processes before the hang so the neighbour is mid-task
+        warm = await asyncio.gather(pool.submit(slow_pid, 0), pool.submit(slow_pid, 0.5))
+        hung = asyncio.create_task(pool.submit(hang, timeout=2))
+        neighbour = asyncio.create_task(pool.submit(slow_pid, 3))
+        with pytest.raises(ConversionTimeoutError):
+            await hung
+        return warm, await neighbour, await pool.submit(slow_pid, 0)
+
+    try:
+        warm, neighbour, after = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert neighbour in warm
+    # The hung slot came back with a fresh process
+    assert after not in warm
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from conversion_workers.converter.merge_engine import PdfMergeEngine
+
+SAMPLE_PDF = Path(__file__).resolve().parents[3] / "sample.pdf"
+
+
+def _fonts(page) -> dict:
+    return {name: ref.idnum for name, ref in page["/Resources"]["/Font"].items()}
+
+
+def test_merge_keeps_every_page_in_order(tmp_path):
+    output = PdfMergeEngine().merge([SAMPLE_PDF, SAMPLE_PDF.read_bytes()], tmp_path / "merged.pdf")
+
+    reader = PdfReader(output)
+    assert len(reader.pages) == 2
+    assert reader.pages[1].extract_text() == PdfReader(SAMPLE_PDF).pages[0].extract_text()
+
+
+def test_merge_writes_identical_objects_once(tmp_path):
+    deduped = PdfMergeEngine().merge([SAMPLE_PDF, SAMPLE_PDF], tmp_path / "deduped.pdf")
+    copied = PdfMergeEngine(dedupe=False).merge([SAMPLE_PDF, SAMPLE_PDF], tmp_path / "copied.pdf")
+
+    first, second = PdfReader(deduped).pages
+    assert _fonts(first) == _fonts(second)
+
+    first, second = PdfReader(copied).pages
+    assert set(_fonts(first).values()).isdisjoint(_fonts(second).values())
+
+    assert deduped.stat().st_size < copied.stat().st_size
@@ -0,0 +1,12 @@
+from conversion_workers.converter.parallel import page_ranges
+
+
+def test_page_ranges_covers_every_page_in_near_equal_chunks():
+    ranges = page_ranges(10, 3)
+
+    assert ranges == [(0, 4), (4, 7), (7, 10)]
+
+
+def test_page_ranges_never_makes_more_chunks_than_pages():
+    assert page_ranges(2, 8) == [(0, 1), (1, 2)]
+    assert page_ranges(5, 1) == [(0, 5)]
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from conversion_workers.queue import pipeline
+from conversion_workers.queue.pipeline import JobPipeline
+from conversion_workers.converter.worker import JobStages, StagedJob
+from conversion_workers.exception import ConversionFailedError, FileNotFoundError, UploadFailedError
+
+
+class FakePool:
+    size = 2
+
+    def __init__(self, error=None):
+        self.error = error
+        self.converted = []
+
+    async def convert(self, staged):
+        if self.error:
+            raise self.error
+        self.converted.append(staged.job_id)
+        return staged
+
+
+class Stages:
+    """
+    Thread-side stages of the pipeline, recording what ran.
+    """
+
+    def __init__(self, fetch_error=None, publish_error=None, cached=False):
+        self.fetch_error = fetch_error
+        self.publish_error = publish_error
+        self.cached = cached
+        self.published = []
+        self.failed = []
+        self.released = []
+
+    def fetch_job(self, data):
+        if self.fetch_error:
+            raise self.fetch_error
+        return SimpleNamespace(job_id=data["job_id"], scratch=f"scratch-{data['job_id']}",
+                               cached=self.cached, batchable=False)
+
+    def publish_job(self, staged):
+        if self.publish_error:
+            raise self.publish_error
+        self.published.append(staged.job_id)
+
+    def fail_job(self, staged):
+        self.failed.append(staged.job_id)
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    def install(**kwargs):
+        fake = Stages(**kwargs)
+        monkeypatch.setattr(pipeline, "fetch_job", fake.fetch_job)
+        monkeypatch.setattr(pipeline, "publish_job", fake.publish_job)
+        monkeypatch.setattr(pipeline, "fail_job", fake.fail_job)
+        monkeypatch.setattr(pipeline, "scratch_space", SimpleNamespace(release=fake.released.append))
+        return fake
+    return install
+
+
+def _run(pool: FakePool, jobs: list[str]) -> list:
+    async def run():
+        jobs_pipeline = JobPipeline(pool=pool, fetch_workers=1, publish_workers=1, queue_size=1)
+        try:
+            return await asyncio.wait_for(asyncio.gather(
+                *(jobs_pipeline.run({"job_id": job_id}) for job_id in jobs),
+                return_exceptions=True), 5)
+        finally:
+            await jobs_pipeline.stop()
+    return asyncio.run(run())
+
+
+def test_jobs_pass_every_stage_through_small_queues(stages):
+    fake = stages()
+    pool = FakePool()
+
+    results = _run(pool, [f"j{i}" for i in range(6)])
+
+    assert results == [None] * 6
+    assert sorted(pool.converted) == sorted(fake.published) == [f"j{i}" for i in range(6)]
+    assert sorted(fake.released) == [f"scratch-j{i}" for i in range(6)]
+
+
+def test_cached_jobs_skip_the_convert_stage(stages):
+    fake = stages(cached=True)
+    pool = FakePool()
+
+    assert _run(pool, ["j1"]) == [None]
+    assert pool.converted == []
+    assert fake.published == ["j1"]
+
+
+def test_fetch_error_settles_the_job(stages):
+    error = FileNotFoundError("missing input")
+    fake = stages(fetch_error=error)
+
+    assert _run(FakePool(), ["j1", "j2"]) == [error, error]
+    # Nothing was staged; the fetch stage releases its own scratch
+    assert fake.released == []
+
+
+def test_convert_error_marks_the_job_failed_and_releases_scratch(stages):
+    error = ConversionFailedError("bad document")
+    fake = stages()
+
+    assert _run(FakePool(error), ["j1"]) == [error]
+    assert fake.failed == ["j1"]
+    assert fake.published == []
+    assert fake.released == ["scratch-j1"]
+
+
+def test_publish_error_settles_the_job_and_releases_scratch(stages):
+    error = UploadFailedError("storage down")
+    fake = stages(publish_error=error)
+
+    assert _run(FakePool(), ["j1"]) == [error]
+    assert fake.released == ["scratch-j1"]
+
+
+def test_fetch_releases_its_scratch_when_the_download_fails():
+    scratch = MagicMock()
+    transfer = MagicMock()
+    transfer.object_size.return_value = 1024
+    transfer.download_to.side_effect = FileNotFoundError("gone")
+    checkpoints = MagicMock()
+    checkpoints.restore_input.return_value = False
+    stages = JobStages(MagicMock(), MagicMock(), transfer=transfer, cache=MagicMock(),
+                       scratch=scratch, checkpoints=checkpoints, state=MagicMock())
+
+    with pytest.raises(FileNotFoundError):
+        stages.fetch(StagedJob({"job_id": "j1", "path": "u/j1/in.pdf", "target_format": "pptx"}))
+
+    scratch.release.assert_called_once_with(scratch.acquire.return_value)
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+from conversion_workers.storage.result_cache import INDEX_KEY, ResultCache
+
+
+def _cache(max_entries: int) -> tuple[ResultCache, MagicMock]:
+    cache = ResultCache(max_entries=max_entries)
+    cache._redis = MagicMock()
+    return cache, cache._redis
+
+
+def test_make_key_ignores_parameter_order_and_unset_parameters():
+    key = ResultCache.make_key("abc", "compress_pdf", quality="low", dpi=150, pages=None)
+
+    assert key == "convcache:compress_pdf:abc:dpi=150,quality=low"
+    assert key == ResultCache.make_key("abc", "compress_pdf", dpi=150, quality="low")
+    assert key != ResultCache.make_key("abc", "compress_pdf", dpi=300, quality="low")
+    assert key != ResultCache.make_key("abd", "compress_pdf", dpi=150, quality="low")
+
+
+def test_store_evicts_the_least_recently_used_entries():
+    cache, redis = _cache(max_entries=2)
+    redis.pipeline.return_value.execute.return_value = [True, 1, 4]
+    redis.zpopmin.return_value = [("convcache:a", 1.0), ("convcache:b", 2.0)]
+
+    cache.store("convcache:d", "bucket", "path")
+
+    redis.zpopmin.assert_called_once_with(INDEX_KEY, 2)
+    redis.delete.assert_called_once_with("convcache:a", "convcache:b")
+
+
+def test_store_within_the_limit_evicts_nothing():
+    cache, redis = _cache(max_entries=2)
+    redis.pipeline.return_value.execute.return_value = [True, 1, 2]
+
+    cache.store("convcache:b", "bucket", "path")
+
+    redis.zpopmin.assert_not_called()
+
+
+def test_a_hit_refreshes_the_entry_in_the_lru_index():
+    cache, redis = _cache(max_entries=2)
+    redis.get.return_value = '{"bucket": "b", "path": "p"}'
+
+    assert cache.lookup("convcache:a", "compress_pdf") == {"bucket": "b", "path": "p"}
+    pipe = redis.pipeline.return_value
+    pipe.expire.assert_called_once_with("convcache:a", cache.ttl)
+    assert pipe.zadd.call_args.args[0] == INDEX_KEY
@@ -0,0 +1,50 @@
+import json
+import asyncio
+from types import SimpleNamespace
+
+from conversion_workers.queue.scheduler import JobScheduler
+
+
+def _message(name: str, estimated_seconds: float, published_at: float, priority: int = 0):
+    body = {"job_id": name, "target_format": "pdf",
+            "estimated_seconds": estimated_seconds, "published_at": published_at}
+    return SimpleNamespace(body=json.dumps(body).encode(), priority=priority)
+
+
+def _drain(scheduler: JobScheduler) -> list[str]:
+    async def drain():
+        return [json.loads((await scheduler.pop()).body)["job_id"] for _ in range(len(scheduler))]
+    return asyncio.run(drain())
+
+
+def test_shortest_estimated_job_runs_first():
+    scheduler = JobScheduler(policy="sjf", aging_rate=1.0)
+    scheduler.push(_message("long", 120, published_at=1000))
+    scheduler.push(_message("short", 5, published_at=1000))
+    scheduler.push(_message("medium", 30, published_at=1000))
+
+    assert _drain(scheduler) == ["short", "medium", "long"]
+
+
+def test_waiting_time_ages_a_long_job_ahead():
+    scheduler = JobScheduler(policy="sjf", aging_rate=1.0)
+    scheduler.push(_message("short_new", 5, published_at=1200))
+    scheduler.push(_message("long_old", 120, published_at=1000))
+
+    assert _drain(scheduler) == ["long_old", "short_new"]
+
+
+def test_higher_priority_goes_first_whatever_the_estimate():
+    scheduler = JobScheduler(policy="sjf", aging_rate=1.0)
+    scheduler.push(_message("free_short", 5, published_at=1000))
+    scheduler.push(_message("pro_long", 600, published_at=1000, priority=5))
+
+    assert _drain(scheduler) == ["pro_long", "free_short"]
+
+
+def test_fifo_keeps_publish_order():
+    scheduler = JobScheduler(policy="fifo")
+    scheduler.push(_message("second", 5, published_at=1001))
+    scheduler.push(_message("first", 600, published_at=1000))
+
+    assert _drain(scheduler) == ["first", "second"]
@@ -0,0 +1,67 @@
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from conversion_workers.converter.split_engine import PdfSplitEngine, parse_ranges
+from conversion_workers.exception import ConversionFailedError
+
+SAMPLE_PDF = Path(__file__).resolve().parents[3] / "sample.pdf"
+
+
+def _document(path: Path, pages: int, bookmarks: Optional[dict[int, str]] = None) -> Path:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.append(SAMPLE_PDF)
+    for page, title in (bookmarks or {}).items():
+        parent = writer.add_outline_item(title, page)
+        # Nested entries must not start parts of their own
+        writer.add_outline_item(f"{title} detail", page, parent=parent)
+    writer.write(path)
+    return path
+
+
+def _parts(output_zip: Path) -> dict[str, int]:
+    with zipfile.ZipFile(output_zip) as archive:
+        return {name: len(PdfReader(BytesIO(archive.read(name))).pages)
+                for name in archive.namelist()}
+
+
+def test_parse_ranges_reports_bad_ranges_as_conversion_failures():
+    assert parse_ranges("2-3", 4) == [range(1, 3)]
+    with pytest.raises(ConversionFailedError):
+        parse_ranges("3-9", 4)
+
+
+def test_split_by_ranges(tmp_path):
+    source = _document(tmp_path / "in.pdf", 5)
+
+    output = PdfSplitEngine(mode="ranges", ranges="1-2,4-").split(source, tmp_path / "out.zip")
+
+    assert _parts(output) == {"001_pages_1-2.pdf": 2, "002_pages_4-5.pdf": 2}
+
+
+def test_split_every_n_pages(tmp_path):
+    source = _document(tmp_path / "in.pdf", 5)
+
+    output = PdfSplitEngine(mode="every", every=2).split(source, tmp_path / "out.zip")
+
+    assert _parts(output) == {"001_pages_1-2.pdf": 2, "002_pages_3-4.pdf": 2, "003_page_5.pdf": 1}
+
+
+def test_split_by_top_level_bookmarks(tmp_path):
+    source = _document(tmp_path / "in.pdf", 5, {1: "Intro", 3: "Chapter 2"})
+
+    output = PdfSplitEngine(mode="bookmarks").split(source, tmp_path / "out.zip")
+
+    assert _parts(output) == {"001_part.pdf": 1, "002_Intro.pdf": 2, "003_Chapter_2.pdf": 2}
+
+
+def test_split_by_bookmarks_needs_bookmarks(tmp_path):
+    source = _document(tmp_path / "in.pdf", 2)
+
+    with pytest.raises(ConversionFailedError, match="no bookmarks"):
+        PdfSplitEngine(mode="bookmarks").split(source, tmp_path / "out.zip")
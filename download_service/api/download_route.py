@@ -1,25 +1,95 @@
+import asyncio
+from uuid import UUID
+
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from shared_database.connection import get_db
 from shared_database.repository import JobRepository
+from shared_database.models import Jobs
 from download_service.api.supabase_client import supabase
+from download_service.api.signed_urls import signed_urls
+from download_service.api.zip_stream import zip_stream
 from download_service.settings import settings
 
 
 downloader = APIRouter()
 
+CONVERTED = ["convert_pdf_to_ppt",
+             "convert_docx_to_pdf", "convert_pdf_to_docx", "merge_pdf",
+             "split_pdf", "convert_pdf_to_image"]
+
 
 class DownloadSchema(BaseModel):
     job_id: str
 
 
-@downloader.get("/download")
-async def get_downloadable_link(data: DownloadSchema, db: Session = Depends(get_db)):
+class BulkDownloadSchema(BaseModel):
+    job_ids: list[str] = Field(..., min_length=1)
+
+
+class ZipDownloadSchema(BaseModel):
+    job_ids: list[str] = Field(..., min_length=1)
+
+
+def _bucket(record: Jobs) -> str:
+    return (settings.SUPABASE_CONVERTED_BUCKET if record.conversion_type in CONVERTED
+            else settings.SUPABASE_COMPRESSED_BUCKET)
+
+
+def _is_multi_output(record: Jobs) -> bool:
+    # Page images uploaded as separate objects under output_url
+    return record.conversion_type == "convert_pdf_to_image" and not record.output_url.endswith(".zip")
+
+
+def _list_files(bucket: str, prefix: str) -> list[str]:
+    files = supabase.storage.from_(bucket).list(
+        prefix, {"limit": 10000, "sortBy": {"column": "name", "order": "asc"}})
+    return [f"{prefix}/{f['name']}" for f in files]
+
+
+def _user_records(db: Session, requested: list[str], user_id: str) -> tuple[list[str], list[Jobs]]:
+    """
+    The requested job ids, normalised and deduplicated, and the records
+    among them that belong to the user and have an output.
+    """
+    job_ids, ids = [], []
+    for job_id in dict.fromkeys(requested):
+        try:
+            ids.append(UUID(job_id))
+            job_ids.append(str(ids[-1]))
+        except ValueError:
+            job_ids.append(job_id)
+
+    records = [
+        record for record in (JobRepository(db).get_by_job_ids(ids) if ids else [])
+        if str(record.user_id) == user_id and record.output_url
+    ]
+    return job_ids, records
+
+
+async def _object_paths(records: list[Jobs]) -> dict[str, list[str]]:
+    """
+    job_id -> paths of the objects to sign; listings run concurrently.
+    """
+    multi = [record for record in records if _is_multi_output(record)]
+    listings = await asyncio.gather(*(
+        run_in_threadpool(_list_files, _bucket(record), record.output_url) for record in multi))
 
-    conversion = ["convert_pdf_to_ppt",
-                  "convert_docx_to_pdf", "convert_pdf_to_docx", "merge_pdf"]
+    paths = {str(record.id): [record.output_url] for record in records}
+    paths.update({str(record.id): listing for record, listing in zip(multi, listings)})
+    return paths
+
+
+@downloader.get("/download")
+async def get_downloadable_link(
+    data: DownloadSchema,
+    refresh: bool = Query(False, description="Sign the link again even if a cached one is still valid"),
+    db: Session = Depends(get_db)
+):
 
     repo = JobRepository(db)
     record = repo.get_by_job_id(data.job_id)
@@ -28,17 +98,99 @@ async def get_downloadable_link(data: DownloadSchema, db: Session = Depends(get_
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No conversion record found")
 
-    if record.dowload_url is None:
+    if not record.output_url:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Converted file not available yet")
+
+    bucket = _bucket(record)
+    paths = (await _object_paths([record]))[str(record.id)]
+    urls = await signed_urls.sign(bucket, paths, refresh)
+
+    if _is_multi_output(record):
+        return {"download_links": [urls[path] for path in paths if path in urls]}
+
+    if record.output_url not in urls:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail="Could not sign the download link")
+
+    return {"download_link": urls[record.output_url]}
 
-        bucket = (
-            settings.SUPABASE_CONVERTED_BUCKET if record.conversion_type in conversion else settings.SUPABASE_COMPRESSED_BUCKET)
 
-        url = supabase.storage.from_(
-            bucket).create_signed_url(record.output_url, 3600)
+@downloader.post("/download/bulk")
+async def get_downloadable_links(
+    data: BulkDownloadSchema,
+    refresh: bool = Query(False, description="Sign the links again even if cached ones are still valid"),
+    user_id: str = Header(..., alias="User-Id"),
+    db: Session = Depends(get_db)
+):
+    """
+    Download links of many jobs at once: cached links are reused and the
+    rest are signed with a single storage call per bucket. Jobs that do
+    not exist, belong to someone else or have no output yet are listed
+    under ``missing``.
+    """
+    if len(data.job_ids) > settings.BULK_SIGN_MAX_JOBS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {settings.BULK_SIGN_MAX_JOBS} jobs per request")
+
+    job_ids, records = _user_records(db, data.job_ids, user_id)
+    paths = await _object_paths(records)
+
+    by_bucket: dict[str, list[str]] = {}
+    for record in records:
+        by_bucket.setdefault(_bucket(record), []).extend(paths[str(record.id)])
+    signed = {
+        bucket: await signed_urls.sign(bucket, bucket_paths, refresh)
+        for bucket, bucket_paths in by_bucket.items()
+    }
+
+    links = {}
+    for record in records:
+        urls = signed[_bucket(record)]
+        job_id = str(record.id)
+        if _is_multi_output(record):
+            links[job_id] = [urls[path] for path in paths[job_id] if path in urls]
+        elif record.output_url in urls:
+            links[job_id] = urls[record.output_url]
+
+    return {
+        "download_links": links,
+        "missing": [job_id for job_id in job_ids if job_id not in links]
+    }
+
+
+@downloader.post("/download/zip")
+async def download_zip(
+    data: ZipDownloadSchema,
+    user_id: str = Header(..., alias="User-Id"),
+    db: Session = Depends(get_db)
+):
+    """
+    One ZIP with the outputs of many jobs, streamed while it is built.
+    Each job's files go under a folder named after the job; requested
+    jobs that are not the user's or have no output yet are listed in
+    missing.txt, along with objects that could not be fetched.
+    """
+    if len(data.job_ids) > settings.ZIP_MAX_JOBS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {settings.ZIP_MAX_JOBS} jobs per archive")
+
+    job_ids, records = _user_records(db, data.job_ids, user_id)
+    if not records:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="No converted files found")
+    paths = await _object_paths(records)
 
-        record.dowload_url = url["signedURL"]
-        db.add(record)
-        db.commit()
-        db.refresh(record)
+    entries = [
+        (f"{record.id}/{path.rsplit('/', 1)[-1]}", _bucket(record), path)
+        for record in records for path in paths[str(record.id)]
+    ]
+    found = {str(record.id) for record in records}
+    missing = [job_id for job_id in job_ids if job_id not in found]
 
-    return {"download_link": record.dowload_url}
+    return StreamingResponse(
+        zip_stream(entries, missing),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="download.zip"',
+                 "X-Accel-Buffering": "no"},
+    )
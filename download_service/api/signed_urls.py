@@ -0,0 +1,88 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from fastapi.concurrency import run_in_threadpool
+
+from download_service.api.supabase_client import supabase
+from download_service.settings import settings
+
+KEY_PREFIX = "signedurl"
+
+
+def _create_signed_urls(bucket: str, paths: list[str], expires_in: int) -> dict[str, str]:
+    signed = supabase.storage.from_(bucket).create_signed_urls(paths, expires_in)
+    return {
+        item["path"]: item["signedURL"]
+        for item in signed
+        if item.get("signedURL") and not item.get("error")
+    }
+
+
+class SignedUrlCache:
+    """
+    Signed download URLs, cached in Redis until shortly before the
+    signature expires.
+
+    URLs are signed for SIGNED_URL_TTL seconds and cached for
+    SIGNED_URL_EXPIRY_MARGIN seconds less, so a cached link always has at
+    least that long left to run. Whatever is not cached is signed with
+    one storage call per bucket, however many objects are asked for.
+    Without Redis, or when it fails, every URL is signed afresh.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: Optional[int] = None, margin: Optional[int] = None):
+        redis_url = redis_url or settings.REDIS_URL
+        self.ttl = ttl or settings.SIGNED_URL_TTL
+        margin = settings.SIGNED_URL_EXPIRY_MARGIN if margin is None else margin
+        self.cache_ttl = self.ttl - margin
+        self._redis = Redis.from_url(
+            redis_url, decode_responses=True) if redis_url and self.cache_ttl > 0 else None
+
+    @staticmethod
+    def make_key(bucket: str, path: str) -> str:
+        return f"{KEY_PREFIX}:{bucket}:{path}"
+
+    async def sign(self, bucket: str, paths: list[str], refresh: bool = False) -> dict[str, str]:
+        """
+        path -> signed URL for ``paths`` in ``bucket``. ``refresh`` signs
+        them again even when cached. Objects storage could not sign are
+        left out.
+        """
+        paths = list(dict.fromkeys(paths))
+        urls = {} if refresh else await self._cached(bucket, paths)
+
+        missing = [path for path in paths if path not in urls]
+        fresh = {}
+        for start in range(0, len(missing), settings.SIGNED_URL_BATCH_SIZE):
+            fresh.update(await run_in_threadpool(
+                _create_signed_urls, bucket,
+                missing[start:start + settings.SIGNED_URL_BATCH_SIZE], self.ttl))
+
+        if fresh:
+            await self._store(bucket, fresh)
+        return {**urls, **fresh}
+
+    async def _cached(self, bucket: str, paths: list[str]) -> dict[str, str]:
+        if self._redis is None or not paths:
+            return {}
+        try:
+            cached = await self._redis.mget([self.make_key(bucket, path) for path in paths])
+        except RedisError as e:
+            print(f"[download] signed url lookup failed: {e}")
+            return {}
+        return {path: url for path, url in zip(paths, cached) if url}
+
+    async def _store(self, bucket: str, urls: dict[str, str]) -> None:
+        if self._redis is None:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for path, url in urls.items():
+                pipe.set(self.make_key(bucket, path), url, ex=self.cache_ttl)
+            await pipe.execute()
+        except RedisError as e:
+            print(f"[download] signed url store failed: {e}")
+
+
+signed_urls = SignedUrlCache()
@@ -0,0 +1,150 @@
+import asyncio
+import time
+import zipfile
+from collections import deque
+from typing import AsyncIterator, Optional
+from urllib.parse import quote
+
+import httpx
+
+from download_service.settings import settings
+
+# Outputs whose content is already compressed; deflating them again
+# costs CPU for nothing.
+STORED_SUFFIXES = {".pdf", ".docx", ".pptx", ".zip", ".png", ".jpg", ".jpeg", ".webp"}
+
+_client = httpx.AsyncClient(
+    headers={
+        "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+        "apikey": settings.SUPABASE_SERVICE_KEY,
+    },
+    timeout=httpx.Timeout(60, connect=10),
+)
+
+
+class _Sink:
+    """
+    Write end of the ZIP: collects what zipfile writes until the
+    response takes it. It cannot seek, so zipfile writes sizes and CRCs
+    after each entry's data instead of going back to the header.
+    """
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+class _ObjectFetch:
+    """
+    Downloads one storage object in the background into a small bounded
+    queue: first its size (or the error), then its chunks, then None.
+    """
+
+    def __init__(self, bucket: str, path: str):
+        url = f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/{bucket}/{quote(path.lstrip('/'))}"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ZIP_BUFFER_CHUNKS)
+        self._task = asyncio.create_task(self._run(url))
+
+    async def _run(self, url: str) -> None:
+        try:
+            async with _client.stream("GET", url) as response:
+                response.raise_for_status()
+                length = response.headers.get("content-length")
+                await self._queue.put(int(length) if length else None)
+                async for chunk in response.aiter_bytes(settings.ZIP_CHUNK_SIZE):
+                    await self._queue.put(chunk)
+            await self._queue.put(None)
+        except Exception as e:
+            await self._queue.put(e)
+
+    async def size(self) -> Optional[int]:
+        item = await self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+
+async def zip_stream(entries: list[tuple[str, str, str]], missing: Optional[list[str]] = None) -> AsyncIterator[bytes]:
+    """
+    Streams a ZIP of ``entries`` (name in the archive, bucket, path) as it
+    is built. Up to ZIP_FETCH_CONCURRENCY objects download ahead of the
+    one being written, each buffering at most ZIP_BUFFER_CHUNKS chunks,
+    so memory stays bounded however large the archive gets. ``missing``
+    and the objects that cannot be fetched are listed in missing.txt at
+    the end; an object that fails halfway aborts the stream.
+    """
+    sink = _Sink()
+    archive = zipfile.ZipFile(sink, "w", allowZip64=True)
+    pending = deque(entries)
+    fetches: deque = deque()
+    missing = list(missing or [])
+
+    def fill() -> None:
+        while pending and len(fetches) < settings.ZIP_FETCH_CONCURRENCY:
+            name, bucket, path = pending.popleft()
+            fetches.append((name, _ObjectFetch(bucket, path)))
+
+    try:
+        fill()
+        while fetches:
+            name, fetch = fetches.popleft()
+            fill()
+            # Popped fetches are out of reach of the finally below; cancel
+            # this one here so an abandoned download does not sit on its
+            # full queue holding a pooled connection.
+            try:
+                try:
+                    size = await fetch.size()
+                except Exception as e:
+                    print(f"[download] could not add {name} to zip: {e}")
+                    missing.append(name)
+                    continue
+
+                info = zipfile.ZipInfo(name, time.localtime()[:6])
+                suffix = name[name.rfind("."):].lower() if "." in name else ""
+                info.compress_type = zipfile.ZIP_STORED if suffix in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+                info.file_size = size or 0
+                with archive.open(info, "w", force_zip64=size is None) as member:
+                    async for chunk in fetch.chunks():
+                        member.write(chunk)
+                        if data := sink.take():
+                            yield data
+                yield sink.take()
+            finally:
+                fetch.cancel()
+
+        if missing:
+            archive.writestr("missing.txt", "\n".join(missing) + "\n")
+        archive.close()
+        yield sink.take()
+
+    finally:
+        for _, fetch in fetches:
+            fetch.cancel()
@@ -1,8 +1,19 @@
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
+from download_service.api import zip_stream
 from download_service.api.download_route import downloader
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+
+    yield
+
+    await zip_stream._client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(downloader)
 
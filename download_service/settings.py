@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +11,23 @@ class Settings(BaseSettings):
     SUPABASE_RAW_BUCKET: str
     SUPABASE_COMPRESSED_BUCKET: str
 
+    # Signed download URLs: valid for SIGNED_URL_TTL seconds, cached in
+    # Redis until SIGNED_URL_EXPIRY_MARGIN seconds before they expire
+    # (no cache when REDIS_URL is unset)
+    REDIS_URL: Optional[str] = None
+    SIGNED_URL_TTL: int = 3600
+    SIGNED_URL_EXPIRY_MARGIN: int = 300
+    # Objects signed per storage call, and jobs per bulk request
+    SIGNED_URL_BATCH_SIZE: int = 1000
+    BULK_SIGN_MAX_JOBS: int = 500
+
+    # Streamed ZIP downloads: objects fetched ahead of the one being
+    # written, chunk size and chunks buffered per object, jobs per archive
+    ZIP_FETCH_CONCURRENCY: int = 4
+    ZIP_CHUNK_SIZE: int = 256 * 1024
+    ZIP_BUFFER_CHUNKS: int = 4
+    ZIP_MAX_JOBS: int = 1000
+
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parents[0]/".env",
         env_file_encoding="utf-8",
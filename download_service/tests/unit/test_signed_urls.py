@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+
+from download_service.api import signed_urls
+from download_service.api.signed_urls import SignedUrlCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    async def execute(self):
+        for key, value, ex in self.commands:
+            self.redis.values[key] = value
+            self.redis.expiry[key] = ex
+
+
+class FakeBucket:
+    calls = []
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    def create_signed_urls(self, paths, expires_in):
+        FakeBucket.calls.append((self.bucket, list(paths)))
+        return [{"path": path, "signedURL": f"https://storage/{self.bucket}/{path}?n={len(FakeBucket.calls)}",
+                 "error": None} for path in paths]
+
+
+def _cache(monkeypatch) -> SignedUrlCache:
+    FakeBucket.calls = []
+    monkeypatch.setattr(signed_urls, "supabase", SimpleNamespace(storage=SimpleNamespace(from_=FakeBucket)))
+    cache = SignedUrlCache(ttl=3600, margin=300)
+    cache._redis = FakeRedis()
+    return cache
+
+
+def test_misses_are_signed_in_one_call_and_cached_until_the_margin(monkeypatch):
+    cache = _cache(monkeypatch)
+
+    urls = asyncio.run(cache.sign("converted", ["a.pdf", "b.pdf", "a.pdf"]))
+
+    assert set(urls) == {"a.pdf", "b.pdf"}
+    assert FakeBucket.calls == [("converted", ["a.pdf", "b.pdf"])]
+    assert cache._redis.expiry[cache.make_key("converted", "a.pdf")] == 3300
+
+
+def test_hits_are_served_from_the_cache(monkeypatch):
+    cache = _cache(monkeypatch)
+    first = asyncio.run(cache.sign("converted", ["a.pdf"]))
+
+    second = asyncio.run(cache.sign("converted", ["a.pdf", "c.pdf"]))
+
+    assert second["a.pdf"] == first["a.pdf"]
+    assert FakeBucket.calls[-1] == ("converted", ["c.pdf"])
+
+
+def test_refresh_signs_again_and_replaces_the_cached_url(monkeypatch):
+    cache = _cache(monkeypatch)
+    first = asyncio.run(cache.sign("converted", ["a.pdf"]))
+
+    refreshed = asyncio.run(cache.sign("converted", ["a.pdf"], refresh=True))
+
+    assert refreshed["a.pdf"] != first["a.pdf"]
+    assert len(FakeBucket.calls) == 2
+    assert cache._redis.values[cache.make_key("converted", "a.pdf")] == refreshed["a.pdf"]
@@ -0,0 +1,50 @@
+import asyncio
+import zipfile
+from io import BytesIO
+
+import httpx
+
+from download_service.api import zip_stream
+
+
+def _storage(objects: dict[str, bytes]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/storage/v1/object/", 1)[1]
+        if path not in objects:
+            return httpx.Response(404)
+        return httpx.Response(200, content=objects[path])
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _archive(entries, missing=None) -> zipfile.ZipFile:
+    async def collect():
+        return b"".join([chunk async for chunk in zip_stream.zip_stream(entries, missing)])
+    return zipfile.ZipFile(BytesIO(asyncio.run(collect())))
+
+
+def test_zip_holds_every_object_under_its_job(monkeypatch):
+    objects = {"converted/u/j1/out.pdf": b"%PDF-1.7 " * 1000,
+               "compressed/u/j2/notes.txt": b"plain text " * 1000}
+    monkeypatch.setattr(zip_stream, "_client", _storage(objects))
+
+    archive = _archive([("j1/out.pdf", "converted", "u/j1/out.pdf"),
+                        ("j2/notes.txt", "compressed", "u/j2/notes.txt")])
+
+    assert archive.testzip() is None
+    assert archive.read("j1/out.pdf") == objects["converted/u/j1/out.pdf"]
+    assert archive.read("j2/notes.txt") == objects["compressed/u/j2/notes.txt"]
+    assert archive.getinfo("j1/out.pdf").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("j2/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert "missing.txt" not in archive.namelist()
+
+
+def test_unfetchable_objects_and_missing_jobs_are_listed(monkeypatch):
+    monkeypatch.setattr(zip_stream, "_client", _storage({"converted/u/j1/out.pdf": b"%PDF"}))
+
+    archive = _archive([("j1/out.pdf", "converted", "u/j1/out.pdf"),
+                        ("j3/gone.pdf", "converted", "u/j3/gone.pdf")],
+                       missing=["j4"])
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ["j1/out.pdf", "missing.txt"]
+    assert archive.read("missing.txt").decode().split() == ["j4", "j3/gone.pdf"]
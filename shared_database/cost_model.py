@@ -0,0 +1,59 @@
+from typing import Optional
+
+MB = 1024 * 1024
+
+# target_format -> (fixed seconds, seconds per MB, seconds per page) used
+# until conversion_costs has learned better numbers
+DEFAULT_COSTS = {
+    "pdf": (1.5, 1.0, 0.15),
+    "docx": (1.0, 2.0, 0.5),
+    "pptx": (0.5, 0.5, 0.1),
+    "compress": (0.5, 0.3, 0.05),
+    "merge": (0.2, 0.05, 0.005),
+    "split": (0.2, 0.05, 0.005),
+    "image": (0.3, 0.2, 0.1),
+}
+FALLBACK_COST = (1.0, 1.0, 0.2)
+
+# Weight of a new observation in the running averages
+EWMA_WEIGHT = 0.1
+
+
+def estimate_seconds(
+    target_format: str,
+    size_bytes: Optional[int],
+    page_count: Optional[int] = None,
+    learned: Optional[tuple[Optional[float], Optional[float]]] = None,
+) -> float:
+    """
+    Predicted conversion time. Uses the page count when there is one,
+    otherwise the file size; ``learned`` (seconds per MB, seconds per
+    page) rates win over the defaults.
+    """
+    fixed, per_mb, per_page = DEFAULT_COSTS.get(target_format, FALLBACK_COST)
+    if learned is not None:
+        per_mb = learned[0] if learned[0] is not None else per_mb
+        per_page = learned[1] if learned[1] is not None else per_page
+
+    if page_count:
+        return fixed + per_page * page_count
+    if size_bytes is not None:
+        return fixed + per_mb * size_bytes / MB
+    # Unknown size: assume a mid-sized document rather than a tiny one
+    return fixed + per_mb * 5
+
+
+def observed_rates(
+    target_format: str,
+    size_bytes: Optional[int],
+    page_count: Optional[int],
+    seconds: float,
+) -> tuple[Optional[float], Optional[float]]:
+    """
+    (seconds per MB, seconds per page) seen in one finished conversion.
+    """
+    fixed = DEFAULT_COSTS.get(target_format, FALLBACK_COST)[0]
+    work = max(0.0, seconds - fixed)
+    per_mb = work / max(size_bytes / MB, 0.01) if size_bytes else None
+    per_page = work / page_count if page_count else None
+    return per_mb, per_page
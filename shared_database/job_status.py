@@ -0,0 +1,42 @@
+import enum
+from datetime import datetime
+from typing import Optional
+
+# Redis layout of the job status cache, shared by the workers that write
+# it and the status service that reads it. Each job is a hash under
+# jobstatus:<job_id>; every update also publishes the job_id on
+# STATUS_CHANNEL so waiting readers wake up.
+STATUS_PREFIX = "jobstatus"
+STATUS_CHANNEL = f"{STATUS_PREFIX}:events"
+STATUS_FIELDS = ("user_id", "status", "conversion_type", "output_url",
+                 "started_at", "finished_at", "updated_at")
+FINAL_STATUSES = ("completed", "failed")
+
+
+def status_key(job_id) -> str:
+    return f"{STATUS_PREFIX}:{job_id}"
+
+
+def to_cache(fields: dict) -> dict[str, str]:
+    """
+    The cached fields among ``fields``, as strings; None becomes "".
+    """
+    cached = {}
+    for name in STATUS_FIELDS:
+        if name not in fields:
+            continue
+        value = fields[name]
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        cached[name] = "" if value is None else str(value)
+    return cached
+
+
+def from_cache(job_id: str, cached: dict[str, str]) -> dict[str, Optional[str]]:
+    """
+    The public status document of a cached entry; the owner is left out.
+    """
+    return {"job_id": job_id,
+            **{name: cached.get(name) or None for name in STATUS_FIELDS if name != "user_id"}}
@@ -0,0 +1,45 @@
+"""added document metadata table
+
+Revision ID: a62d5e9f0c18
+Revises: f3a9c1e04b27
+Create Date: 2026-10-17 14:02:41.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a62d5e9f0c18'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c1e04b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_metadata',
+    sa.Column('input_path', sa.String(), nullable=False),
+    sa.Column('job_id', sa.UUID(), nullable=True),
+    sa.Column('kind', sa.String(length=8), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+    sa.Column('page_count', sa.Integer(), nullable=True),
+    sa.Column('encrypted', sa.Boolean(), nullable=False),
+    sa.Column('scanned', sa.Boolean(), nullable=True),
+    sa.Column('image_ratio', sa.Float(), nullable=True),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('input_path')
+    )
+    op.create_index(op.f('ix_document_metadata_job_id'), 'document_metadata', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_document_metadata_job_id'), table_name='document_metadata')
+    op.drop_table('document_metadata')
@@ -0,0 +1,30 @@
+"""added job timings
+
+Revision ID: b18e4c7d93a5
+Revises: a62d5e9f0c18
+Create Date: 2026-10-17 15:11:27.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b18e4c7d93a5'
+down_revision: Union[str, Sequence[str], None] = 'a62d5e9f0c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('jobs', sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'finished_at')
+    op.drop_column('jobs', 'started_at')
@@ -0,0 +1,32 @@
+"""added split_pdf conversion type
+
+Revision ID: c41e8a7d2f95
+Revises: 4db7013f6dd7
+Create Date: 2026-10-17 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8a7d2f95'
+down_revision: Union[str, Sequence[str], None] = '4db7013f6dd7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_conversion_type ADD VALUE IF NOT EXISTS 'split_pdf'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop a value from an enum type; clear the rows that
+    # use it so older code can still read the table.
+    op.execute("UPDATE jobs SET conversion_type = NULL WHERE conversion_type = 'split_pdf'")
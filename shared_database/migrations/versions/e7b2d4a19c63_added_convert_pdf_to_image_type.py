@@ -0,0 +1,30 @@
+"""added convert_pdf_to_image conversion type
+
+Revision ID: e7b2d4a19c63
+Revises: c41e8a7d2f95
+Create Date: 2026-10-17 11:03:27.914620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2d4a19c63'
+down_revision: Union[str, Sequence[str], None] = 'c41e8a7d2f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_conversion_type ADD VALUE IF NOT EXISTS 'convert_pdf_to_image'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE jobs SET conversion_type = NULL WHERE conversion_type = 'convert_pdf_to_image'")
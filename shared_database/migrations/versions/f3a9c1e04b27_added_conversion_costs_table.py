@@ -0,0 +1,36 @@
+"""added conversion costs table
+
+Revision ID: f3a9c1e04b27
+Revises: e7b2d4a19c63
+Create Date: 2026-10-17 12:20:08.337105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c1e04b27'
+down_revision: Union[str, Sequence[str], None] = 'e7b2d4a19c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversion_costs',
+    sa.Column('target_format', sa.String(length=32), nullable=False),
+    sa.Column('seconds_per_mb', sa.Float(), nullable=True),
+    sa.Column('seconds_per_page', sa.Float(), nullable=True),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('target_format')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('conversion_costs')
@@ -3,8 +3,8 @@ import enum
 import sqlalchemy
 from uuid import uuid4
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, ForeignKey, String, Boolean, Date, Enum, DateTime, ARRAY, Integer
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID, CITEXT
+from sqlalchemy import Column, ForeignKey, String, Boolean, Date, Enum, DateTime, ARRAY, Integer, Float, BigInteger
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, CITEXT, JSONB
 from sqlalchemy.sql import func
 
 from shared_database.connection import Base
@@ -32,6 +32,8 @@ class ConversionType(str, enum.Enum):
     convert_pdf_to_docx = "convert_pdf_to_docx"
     compress_pdf = "compress_pdf"
     merge_pdf = "merge_pdf"
+    split_pdf = "split_pdf"
+    convert_pdf_to_image = "convert_pdf_to_image"
 
 
 class Role(str, enum.Enum):
@@ -226,3 +228,38 @@ class Jobs(Base, TimestampMixin):
     dowload_url = Column(String, nullable=True)
     retry_count = Column(Integer, nullable=True, default=0)
     max_retry = Column(Integer, nullable=True, default=3)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class ConversionCost(TimestampMixin, Base):
+    """
+    Running averages of how long each target_format takes to convert,
+    learned from finished jobs and used to estimate queued ones.
+    """
+    __tablename__ = "conversion_costs"
+
+    target_format = Column(String(32), primary_key=True)
+    seconds_per_mb = Column(Float, nullable=True)
+    seconds_per_page = Column(Float, nullable=True)
+    samples = Column(Integer, nullable=False, default=0)
+
+
+class DocumentMetadata(TimestampMixin, Base):
+    """
+    What an uploaded document looks like, read once from its structure
+    when the upload completes so the queue and the workers do not have to
+    open it to find out.
+    """
+    __tablename__ = "document_metadata"
+
+    input_path = Column(String, primary_key=True)
+    job_id = Column(PG_UUID(as_uuid=True), ForeignKey(
+        "jobs.id", ondelete="CASCADE"), nullable=True, index=True)
+    kind = Column(String(8), nullable=False)
+    size_bytes = Column(BigInteger, nullable=True)
+    page_count = Column(Integer, nullable=True)
+    encrypted = Column(Boolean, nullable=False, default=False)
+    scanned = Column(Boolean, nullable=True)
+    image_ratio = Column(Float, nullable=True)
+    details = Column(JSONB, nullable=True)
@@ -0,0 +1,46 @@
+import re
+from typing import Optional
+
+# Page range syntax shared by the upload API, which checks it before a
+# job is queued, and the workers, which resolve it against the document.
+_SPAN = re.compile(r"(\d+)(?:\s*(-)\s*(\d*))?")
+
+
+def page_spans(spec: str) -> list[tuple[int, Optional[int]]]:
+    """
+    Parses 1-based, inclusive page ranges such as ``"1-3,5,8-"`` into
+    ``(first, last)`` pairs; ``last`` is None for an open end. Raises
+    ValueError on bad syntax or a range that runs backwards.
+    """
+    spans = []
+    for item in spec.split(","):
+        item = item.strip()
+        match = _SPAN.fullmatch(item)
+        if not match:
+            raise ValueError(f"Invalid page range '{item}'")
+
+        first = int(match.group(1))
+        if match.group(2) is None:
+            last = first
+        else:
+            last = int(match.group(3)) if match.group(3) else None
+
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Invalid page range '{item}'")
+        spans.append((first, last))
+    return spans
+
+
+def parse_ranges(spec: str, page_count: int) -> list[range]:
+    """
+    ``page_spans`` resolved against a document: 0-based ``range`` objects,
+    an open end running to the last page.
+    """
+    ranges = []
+    for (first, last), item in zip(page_spans(spec), spec.split(",")):
+        last = page_count if last is None else last
+        if not 1 <= first <= last <= page_count:
+            raise ValueError(
+                f"Page range '{item.strip()}' is outside 1-{page_count}")
+        ranges.append(range(first - 1, last))
+    return ranges
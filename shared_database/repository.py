@@ -1,11 +1,14 @@
 import uuid
+from collections import defaultdict
 from datetime import date, datetime, timezone
 
-from sqlalchemy import select, exists
+from sqlalchemy import select, exists, func, update, values, column, cast
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from api_gateway.handlers.decorators import handle_db_error
-from shared_database.models import User, EmailVerificationToken, PasswordResetToken, APIKey, Jobs
+from shared_database.models import User, EmailVerificationToken, PasswordResetToken, APIKey, Jobs, ConversionCost, DocumentMetadata
+from shared_database.cost_model import EWMA_WEIGHT
 
 
 class UserRepository:
@@ -167,6 +170,11 @@ class JobRepository:
         stmt = select(Jobs).where(Jobs.id == id)
         return self.db.execute(stmt).scalar_one_or_none()
 
+    @handle_db_error("fetch_jobs_using_ids", "Error while fetching jobs using ids")
+    def get_by_job_ids(self, ids: list) -> list[Jobs]:
+        stmt = select(Jobs).where(Jobs.id.in_(ids))
+        return list(self.db.execute(stmt).scalars())
+
     def update_records(self, record, **kwargs):
 
         for key, value in kwargs.items():
@@ -182,3 +190,98 @@ class JobRepository:
     def update_output_url(self, record: Jobs, output_url) -> None:
         record.output_url = output_url
         self.db.commit()
+
+    @handle_db_error("bulk_update_jobs", "Error while updating job records")
+    def bulk_update(self, rows: list[dict]) -> None:
+        """
+        Applies many job updates in one transaction. Each row holds the
+        job ``id`` and the columns to set; rows that set the same columns
+        go out as a single ``UPDATE jobs ... FROM (VALUES ...)``.
+        """
+        table = Jobs.__table__
+        groups = defaultdict(list)
+        for row in rows:
+            groups[tuple(sorted(key for key in row if key != "id"))].append(row)
+
+        for columns, group in groups.items():
+            names = ("id",) + columns
+            # VALUES columns come back as text; cast them to the column types.
+            source = values(*(column(name, table.c[name].type) for name in names), name="v").data(
+                [tuple(row[name] for name in names) for row in group])
+            stmt = (
+                update(table)
+                .where(table.c.id == cast(source.c.id, table.c.id.type))
+                .values({name: cast(source.c[name], table.c[name].type) for name in columns})
+            )
+            self.db.execute(stmt)
+        self.db.commit()
+
+
+class ConversionCostRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @handle_db_error("fetch_conversion_costs", "Error while fetching conversion costs")
+    def get_all(self) -> dict[str, tuple]:
+        """
+        target_format -> (seconds per MB, seconds per page)
+        """
+        return {
+            cost.target_format: (cost.seconds_per_mb, cost.seconds_per_page)
+            for cost in self.db.execute(select(ConversionCost)).scalars()
+        }
+
+    @handle_db_error("observe_conversion_cost", "Error while updating conversion costs")
+    def observe(self, target_format: str, seconds_per_mb, seconds_per_page) -> None:
+        """
+        Folds one observation into the running averages in a single
+        upsert, so concurrent workers do not overwrite each other.
+        """
+        stmt = insert(ConversionCost).values(
+            target_format=target_format,
+            seconds_per_mb=seconds_per_mb,
+            seconds_per_page=seconds_per_page,
+            samples=1,
+        )
+
+        def blend(column, new):
+            # No new value keeps the old one; no old value takes the new one.
+            return func.coalesce(column * (1 - EWMA_WEIGHT) + new * EWMA_WEIGHT, new, column)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConversionCost.target_format],
+            set_={
+                "seconds_per_mb": blend(ConversionCost.seconds_per_mb, stmt.excluded.seconds_per_mb),
+                "seconds_per_page": blend(ConversionCost.seconds_per_page, stmt.excluded.seconds_per_page),
+                "samples": ConversionCost.samples + 1,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+
+class DocumentMetadataRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @handle_db_error("fetch_document_metadata", "Error while fetching document metadata")
+    def get_many(self, input_paths: list[str]) -> dict[str, DocumentMetadata]:
+        stmt = select(DocumentMetadata).where(
+            DocumentMetadata.input_path.in_(input_paths))
+        return {record.input_path: record for record in self.db.execute(stmt).scalars()}
+
+    @handle_db_error("save_document_metadata", "Error while saving document metadata")
+    def save(self, **fields) -> None:
+        """
+        Inserts the metadata of an input, or replaces it when the same
+        path was inspected before.
+        """
+        stmt = insert(DocumentMetadata).values(**fields)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentMetadata.input_path],
+            set_={**{key: stmt.excluded[key] for key in fields if key != "input_path"},
+                  "updated_at": func.now()},
+        )
+        self.db.execute(stmt)
+        self.db.commit()
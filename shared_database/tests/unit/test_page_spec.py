@@ -0,0 +1,22 @@
+import pytest
+
+from shared_database.page_spec import page_spans, parse_ranges
+
+
+def test_page_spans_parses_single_pages_ranges_and_open_ends():
+    assert page_spans("1-3, 5 ,8-") == [(1, 3), (5, 5), (8, None)]
+
+
+@pytest.mark.parametrize("spec", ["", "x", "1-3,", "0", "5-2", "1--2", "-3"])
+def test_page_spans_rejects_bad_syntax(spec):
+    with pytest.raises(ValueError):
+        page_spans(spec)
+
+
+def test_parse_ranges_resolves_against_the_page_count():
+    assert parse_ranges("1-3,5,8-", 10) == [range(0, 3), range(4, 5), range(7, 10)]
+
+
+def test_parse_ranges_rejects_pages_past_the_end():
+    with pytest.raises(ValueError, match="outside 1-10"):
+        parse_ranges("9-12", 10)
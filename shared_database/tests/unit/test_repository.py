@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from shared_database.repository import JobRepository
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_bulk_update_sends_one_update_per_column_set():
+    mock_db = MagicMock()
+    now = datetime.now(timezone.utc)
+
+    JobRepository(mock_db).bulk_update([
+        {"id": str(uuid.uuid4()), "status": "completed", "finished_at": now},
+        {"id": str(uuid.uuid4()), "status": "completed", "finished_at": now},
+        {"id": str(uuid.uuid4()), "output_url": "u/j/out.pdf"},
+    ])
+
+    statements = [_sql(call.args[0]) for call in mock_db.execute.call_args_list]
+    assert len(statements) == 2
+    mock_db.commit.assert_called_once()
+
+    finished = next(sql for sql in statements if "finished_at" in sql)
+    assert finished.startswith("UPDATE jobs SET")
+    assert "FROM (VALUES" in finished
+    assert "CAST(v.id AS UUID)" in finished
+    assert "CAST(v.status AS" in finished
+    assert "output_url" not in finished
+
+
+def test_bulk_update_binds_every_row():
+    mock_db = MagicMock()
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+
+    JobRepository(mock_db).bulk_update([{"id": job_id, "status": "failed"} for job_id in ids])
+
+    statement = mock_db.execute.call_args.args[0]
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert set(ids) <= set(params.values())
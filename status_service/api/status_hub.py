@@ -0,0 +1,69 @@
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from shared_database.job_status import STATUS_CHANNEL
+
+
+class StatusHub:
+    """
+    One Redis subscription to the status channel per process, fanned out
+    to the requests waiting on particular jobs. Long-polls and SSE
+    streams register a queue for their job_ids and receive each job_id
+    whenever that job changes.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self._watchers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._task = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def subscribe(self, job_ids: list[str]) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        for job_id in job_ids:
+            self._watchers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_ids: list[str], queue: asyncio.Queue) -> None:
+        for job_id in job_ids:
+            watchers = self._watchers.get(job_id)
+            if watchers is not None:
+                watchers.discard(queue)
+                if not watchers:
+                    del self._watchers[job_id]
+
+    @contextmanager
+    def watch(self, job_ids: list[str]):
+        queue = self.subscribe(job_ids)
+        try:
+            yield queue
+        finally:
+            self.unsubscribe(job_ids, queue)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(STATUS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    job_id = message["data"]
+                    for queue in self._watchers.get(job_id, ()):
+                        queue.put_nowait(job_id)
+            except RedisError as e:
+                print(f"[status] subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,151 @@
+import json
+import asyncio
+import hashlib
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from shared_database.job_status import FINAL_STATUSES, from_cache
+from status_service.database.repository import JobStatusRepository
+from status_service.settings import settings
+
+status_router = APIRouter()
+
+
+def _etag(document: dict) -> str:
+    body = json.dumps(document, sort_keys=True).encode()
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+async def _document(repo: JobStatusRepository, job_id: str, user_id: str) -> Optional[dict]:
+    """
+    The job's status document, or None when the job does not exist or
+    belongs to someone else.
+    """
+    cached = await repo.get(job_id)
+    if cached is None or cached.get("user_id") != user_id:
+        return None
+    return from_cache(job_id, cached)
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No conversion record found")
+
+
+@status_router.get("/status/stream")
+async def stream_status(
+    request: Request,
+    job_ids: str = Query(..., description="Comma separated job ids"),
+    user_id: str = Header(..., alias="User-Id"),
+):
+    """
+    Server-sent events for many jobs on one connection: the current status
+    of every job first, then one event per change. The stream ends once
+    every job has completed or failed.
+    """
+    ids = list(dict.fromkeys(job_id.strip() for job_id in job_ids.split(",") if job_id.strip()))
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="job_ids required")
+    if len(ids) > settings.STATUS_SSE_MAX_JOBS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {settings.STATUS_SSE_MAX_JOBS} jobs per stream")
+
+    hub = request.app.state.status_hub
+    repo = JobStatusRepository(request.app.state.redis)
+
+    # Subscribe before the first read so no change slips in between;
+    # the stream unsubscribes when it ends.
+    queue = hub.subscribe(ids)
+    try:
+        documents = {job_id: await _document(repo, job_id, user_id) for job_id in ids}
+        if any(document is None for document in documents.values()):
+            raise _not_found()
+    except BaseException:
+        hub.unsubscribe(ids, queue)
+        raise
+
+    async def events():
+        sent: dict[str, str] = {}
+        open_jobs = set(ids)
+
+        def event(document: dict) -> str:
+            etag = _etag(document)
+            sent[document["job_id"]] = etag
+            if document["status"] in FINAL_STATUSES:
+                open_jobs.discard(document["job_id"])
+            return f"event: status\nid: {etag}\ndata: {json.dumps(document)}\n\n"
+
+        try:
+            for document in documents.values():
+                yield event(document)
+
+            while open_jobs:
+                try:
+                    changed = {await asyncio.wait_for(queue.get(), settings.STATUS_SSE_KEEPALIVE)}
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Also covers notifications lost while Redis reconnected.
+                    changed = set(open_jobs)
+                    yield ": keepalive\n\n"
+                while not queue.empty():
+                    changed.add(queue.get_nowait())
+
+                for job_id in changed & open_jobs:
+                    document = await _document(repo, job_id, user_id)
+                    if document is not None and _etag(document) != sent.get(job_id):
+                        yield event(document)
+
+            yield "event: end\ndata: {}\n\n"
+        finally:
+            hub.unsubscribe(ids, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@status_router.get("/status/{job_id}")
+async def get_status(
+    job_id: str,
+    request: Request,
+    wait: int = Query(0, ge=0, description="Seconds to wait for a change of the ETag in If-None-Match"),
+    user_id: str = Header(..., alias="User-Id"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    The job's status from the cache, with an ETag. With ``wait`` and a
+    matching If-None-Match the request is held until the job changes or
+    the wait runs out (then 304).
+    """
+    repo = JobStatusRepository(request.app.state.redis)
+    wait = min(wait, settings.STATUS_MAX_WAIT)
+
+    with request.app.state.status_hub.watch([job_id]) as queue:
+        document = await _document(repo, job_id, user_id)
+        if document is None:
+            raise _not_found()
+        etag = _etag(document)
+
+        if wait and etag == if_none_match and document["status"] not in FINAL_STATUSES:
+            deadline = asyncio.get_running_loop().time() + wait
+            while etag == if_none_match:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                document = await _document(repo, job_id, user_id)
+                if document is None:
+                    raise _not_found()
+                etag = _etag(document)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag == if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(document, headers=headers)
@@ -0,0 +1,63 @@
+from uuid import UUID
+from typing import Optional
+
+from redis.asyncio import Redis
+from fastapi.concurrency import run_in_threadpool
+
+from shared_database.connection import SessionLocal
+from shared_database.repository import JobRepository
+from shared_database.job_status import status_key, to_cache
+from status_service.settings import settings
+
+
+def _load_job(job_id: str) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        record = JobRepository(db).get_by_job_id(UUID(job_id))
+        if record is None:
+            return None
+        return {
+            "user_id": record.user_id,
+            "status": record.status,
+            "conversion_type": record.conversion_type,
+            "output_url": record.output_url,
+            "started_at": record.started_at,
+            "finished_at": record.finished_at,
+            "updated_at": record.updated_at,
+        }
+    finally:
+        db.close()
+
+
+class JobStatusRepository:
+    """
+    Job statuses from the Redis cache the workers write through to.
+    A job that is not cached yet, or whose entry lacks fields only the
+    database knows (the owner), is read from Postgres once and cached.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def get(self, job_id: str) -> Optional[dict[str, str]]:
+        key = status_key(job_id)
+        cached = await self.redis.hgetall(key)
+        if cached.get("user_id"):
+            return cached
+
+        try:
+            UUID(job_id)
+        except ValueError:
+            return None
+        job = await run_in_threadpool(_load_job, job_id)
+        if job is None:
+            return None
+
+        # Fields a worker wrote meanwhile are newer than the row; keep them.
+        loaded = to_cache(job)
+        pipe = self.redis.pipeline(transaction=False)
+        for name, value in loaded.items():
+            pipe.hsetnx(key, name, value)
+        pipe.expire(key, settings.STATUS_CACHE_TTL)
+        await pipe.execute()
+        return {**loaded, **cached}
@@ -0,0 +1,39 @@
+from redis.asyncio import Redis
+from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from status_service.api.status_route import status_router
+from status_service.api.status_hub import StatusHub
+from status_service.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+
+    redis = Redis.from_url(
+        settings.REDIS_URL,
+        encoding="utf-8",
+        decode_responses=True
+    )
+    hub = StatusHub(redis)
+    await hub.start()
+
+    app.state.redis = redis
+    app.state.status_hub = hub
+
+    yield
+
+    await hub.stop()
+    await redis.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# Registered ahead of the router, whose /status/{job_id} would match it
+@app.get("/status/health")
+def health():
+    return {"message": "hi this is status route"}
+
+
+app.include_router(status_router)
@@ -0,0 +1,26 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pathlib import Path
+
+
+class Settings(BaseSettings):
+
+    REDIS_URL: str
+
+    # Cached statuses loaded from Postgres live as long as the ones the
+    # workers write
+    STATUS_CACHE_TTL: int = 24 * 3600
+    # Longest ?wait= a long-poll may ask for, in seconds
+    STATUS_MAX_WAIT: int = 60
+    # SSE: comment line sent when nothing changed for this many seconds,
+    # and how many jobs one stream may watch
+    STATUS_SSE_KEEPALIVE: int = 15
+    STATUS_SSE_MAX_JOBS: int = 100
+
+    model_config = SettingsConfigDict(
+        env_file=Path(__file__).resolve().parents[0]/".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
+
+
+settings = Settings()
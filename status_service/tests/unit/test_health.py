@@ -0,0 +1,12 @@
+from fastapi.testclient import TestClient
+
+from status_service.main import app
+
+
+def test_health_is_not_taken_for_a_job_id():
+    client = TestClient(app)
+
+    response = client.get("/status/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "hi this is status route"}
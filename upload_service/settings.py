@@ -12,6 +12,14 @@ class Settings(BaseSettings):
     RABBITMQ_URL: str
     CONVERSION_QUEUE: str
 
+    # Document inspection at upload completion: ranged reads of this
+    # size, at most INSPECT_MAX_BYTES per document
+    INSPECT_BLOCK_SIZE: int = 64 * 1024
+    INSPECT_MAX_BYTES: int = 4 * 1024 * 1024
+    # Pages whose resources are checked to tell scanned PDFs apart
+    INSPECT_SAMPLE_PAGES: int = 20
+    INSPECT_TIMEOUT: int = 15
+
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parents[0]/".env",
         env_file_encoding="utf-8",
@@ -1,10 +1,11 @@
 import json
 import aio_pika
 from fastapi import APIRouter, HTTPException, Header, status, Request, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from upload_service.src.api.v1.upload_route.schema import PreSignedSchema, ConvertRequest, MergeRequest
-from upload_service.src.api.v1.upload_route.service import build_storage_path
+from upload_service.src.api.v1.upload_route.schema import PreSignedSchema, UploadCompleteSchema, ConvertRequest, MergeRequest, SplitRequest, ImageRequest
+from upload_service.src.api.v1.upload_route.service import build_storage_path, user_plan, annotate_job, inspect_upload
 from upload_service.src.config.rabbitmq_connection import get_rabbit_connection
 from upload_service.src.queue.producer import publish_job
 from upload_service.src.storage.supabase_client import supabase
@@ -64,8 +65,36 @@ async def generate_presigned_url(
     }
 
 
+@upload_service.post("/upload/complete")
+async def complete_upload(
+    body: UploadCompleteSchema,
+    user_id: str = Header(..., alias="User-Id"),
+    db: Session = Depends(get_db)
+):
+    if not body.path.startswith(f"{user_id}/{body.job_id}/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Path does not belong to this upload")
+
+    metadata = await run_in_threadpool(inspect_upload, db, body.path, body.job_id)
+    if metadata is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Uploaded file not found")
+
+    return {
+        "job_id": body.job_id,
+        "path": body.path,
+        "kind": metadata["kind"],
+        "size_bytes": metadata["size_bytes"],
+        "page_count": metadata["page_count"],
+        "encrypted": metadata["encrypted"],
+        "scanned": metadata["scanned"]
+    }
+
+
 @upload_service.post("/merge/start")
-async def merge_files(body: MergeRequest):
+async def merge_files(body: MergeRequest, request: Request, db: Session = Depends(get_db)):
+
+    plan = await run_in_threadpool(user_plan, db, request.headers.get("User-Id"))
 
     message = {
         "job_id": body.job_id,
@@ -73,15 +102,63 @@ async def merge_files(body: MergeRequest):
         "target_format": body.target_format
     }
 
-    await publish_job(message)
+    await run_in_threadpool(annotate_job, db, message)
+
+    await publish_job(message, plan)
 
     return {"message": "Merge job queued", "job_id": body.job_id}
 
 
+@upload_service.post("/split/start")
+async def split_file(body: SplitRequest, request: Request, db: Session = Depends(get_db)):
+
+    plan = await run_in_threadpool(user_plan, db, request.headers.get("User-Id"))
+
+    message = {
+        "job_id": body.job_id,
+        "path": body.path,
+        "target_format": "split",
+        "mode": body.mode,
+        "ranges": body.ranges,
+        "every": body.every
+    }
+
+    await run_in_threadpool(annotate_job, db, message)
+
+    await publish_job(message, plan)
+
+    return {"message": "Split job queued", "job_id": body.job_id}
+
+
+@upload_service.post("/image/start")
+async def render_images(body: ImageRequest, request: Request, db: Session = Depends(get_db)):
+
+    user_id = request.headers.get("User-Id")
+    plan = await run_in_threadpool(user_plan, db, user_id)
+
+    message = {
+        "user_id": user_id,
+        "job_id": body.job_id,
+        "path": body.path,
+        "target_format": "image",
+        "image_format": body.image_format,
+        "dpi": body.dpi,
+        "pages": body.pages,
+        "delivery": body.delivery
+    }
+
+    await run_in_threadpool(annotate_job, db, message)
+
+    await publish_job(message, plan)
+
+    return {"message": "Image job queued", "job_id": body.job_id}
+
+
 @upload_service.post("/conversion/start")
-async def convert_file(body: ConvertRequest, request: Request):
+async def convert_file(body: ConvertRequest, request: Request, db: Session = Depends(get_db)):
 
     user_id = request.headers.get("User-Id")
+    plan = await run_in_threadpool(user_plan, db, user_id)
 
     message = {
         "user_id": user_id,
@@ -90,6 +167,8 @@ async def convert_file(body: ConvertRequest, request: Request):
         "target_format": body.target_format
     }
 
-    await publish_job(message)
+    await run_in_threadpool(annotate_job, db, message)
+
+    await publish_job(message, plan)
 
     return {"message": "Conversion job queued", "job_id": body.job_id}
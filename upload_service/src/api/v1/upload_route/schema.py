@@ -1,11 +1,17 @@
-from typing import List
-from pydantic import BaseModel, Field, Field, field_validator, ValidationError
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, Field, field_validator, model_validator, ValidationError
+
+from shared_database.page_spec import page_spans
 
 
 class PreSignedSchema(BaseModel):
     filename: str
     content_type: str
 
+class UploadCompleteSchema(BaseModel):
+    job_id: str
+    path: str
+
 class MergeRequest(BaseModel):
     job_id: str
     path: List[str] = Field(..., min_items=2, description="List of file paths to be merged")
@@ -27,3 +33,46 @@ class ConvertRequest(BaseModel):
     job_id: str
     path: str
     target_format: str
+
+
+class SplitRequest(BaseModel):
+    job_id: str
+    path: str
+    mode: Literal["ranges", "every", "bookmarks"] = Field("every", description="How to split the document")
+    ranges: Optional[str] = Field(None, description="1-based page ranges for mode 'ranges', e.g. '1-3,5,8-'")
+    every: Optional[int] = Field(None, ge=1, description="Pages per part for mode 'every'")
+
+    @field_validator("path")
+    def validate_path(cls, value):
+        if not value.lower().endswith(".pdf"):
+            raise ValueError("Only PDF files can be split")
+        return value
+
+    @model_validator(mode="after")
+    def validate_ranges(self):
+        if self.mode == "ranges":
+            if not self.ranges:
+                raise ValueError("ranges is required when mode is 'ranges'")
+            page_spans(self.ranges)
+        return self
+
+
+class ImageRequest(BaseModel):
+    job_id: str
+    path: str
+    image_format: Literal["png", "jpeg", "webp"] = Field("png", description="Image format of the rendered pages")
+    dpi: Optional[int] = Field(None, ge=1, le=600, description="Render resolution, 150 by default")
+    pages: Optional[str] = Field(None, description="1-based page ranges to render, e.g. '1-3,5', all pages by default")
+    delivery: Literal["zip", "files"] = Field("zip", description="One ZIP, or one object per page")
+
+    @field_validator("path")
+    def validate_path(cls, value):
+        if not value.lower().endswith(".pdf"):
+            raise ValueError("Only PDF files can be rendered to images")
+        return value
+
+    @field_validator("pages")
+    def validate_pages(cls, value):
+        if value:
+            page_spans(value)
+        return value
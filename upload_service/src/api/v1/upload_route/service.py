@@ -1,7 +1,161 @@
-from uuid import uuid4
+import threading
+from uuid import UUID, uuid4
+from typing import Optional, Union
+
+from cachetools import TTLCache, cached
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from shared_database.models import SubscriptionPlan
+from shared_database.repository import (
+    UserRepository, ConversionCostRepository, DocumentMetadataRepository, JobRepository)
+from shared_database.cost_model import estimate_seconds
+from upload_service.src.storage.supabase_client import supabase
+from upload_service.src.storage.inspection import document_inspector
+from upload_service.settings import settings
 
 
 def build_storage_path(user_id: str, filename: str) -> str:
     ext = filename.split(".")[-1]
     job_id = str(uuid4())
     return f"{user_id}/{job_id}/original.{ext}", job_id
+
+
+def user_plan(db: Session, user_id: Optional[str]) -> SubscriptionPlan:
+    """
+    The user's subscription plan, free when the user is unknown.
+    """
+    if not user_id:
+        return SubscriptionPlan.free
+    try:
+        user = UserRepository(db).get_by_id(UUID(user_id))
+    except ValueError:
+        return SubscriptionPlan.free
+    if user is None or user.plan is None:
+        return SubscriptionPlan.free
+    return user.plan
+
+
+@cached(TTLCache(maxsize=1, ttl=60), key=lambda db: "costs", lock=threading.Lock())
+def _cached_conversion_costs(db: Session) -> dict[str, tuple]:
+    return ConversionCostRepository(db).get_all()
+
+
+def conversion_costs(db: Session) -> dict[str, tuple]:
+    """
+    Learned conversion rates, refreshed at most once a minute. A failed
+    load falls back to the defaults without being cached, so the next
+    request tries again.
+    """
+    try:
+        return _cached_conversion_costs(db)
+    except Exception as e:
+        db.rollback()
+        print(f"[upload] could not load conversion costs: {e}")
+        return {}
+
+
+def object_size(path: str) -> Optional[int]:
+    try:
+        info = supabase.storage.from_(settings.SUPABASE_BUCKET).info(path)
+        size = info.get("size") or (info.get("metadata") or {}).get("size")
+        return int(size) if size is not None else None
+    except Exception:
+        return None
+
+
+def estimate_job_seconds(
+    db: Session,
+    target_format: str,
+    path: Union[str, list[str]],
+    page_count: Optional[int] = None,
+    size_bytes: Optional[int] = None,
+) -> float:
+    """
+    Predicted conversion time of a job, sent with the queue message so
+    workers can run short jobs first.
+    """
+    size = size_bytes
+    if size is None:
+        paths = path if isinstance(path, list) else [path]
+        sizes = [object_size(p) for p in paths]
+        size = None if None in sizes else sum(sizes)
+    return round(estimate_seconds(
+        target_format, size, page_count, conversion_costs(db).get(target_format)), 3)
+
+
+# Columns of DocumentMetadata that travel with the queue message
+MESSAGE_METADATA = ("kind", "size_bytes", "page_count", "encrypted", "scanned", "image_ratio")
+
+
+def inspect_upload(db: Session, path: str, job_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Inspects an uploaded document and stores its metadata. None when the
+    object cannot be read from storage.
+    """
+    metadata = document_inspector.inspect(path)
+    if metadata is None:
+        return None
+
+    if job_id is None:
+        # Uploads are stored as <user_id>/<job_id>/original.<ext>
+        parts = path.split("/")
+        job_id = parts[1] if len(parts) == 3 else None
+    try:
+        if job_id is None or JobRepository(db).get_by_job_id(UUID(job_id)) is None:
+            job_id = None
+    except ValueError:
+        job_id = None
+
+    metadata = {"input_path": path, "job_id": job_id, **metadata}
+    DocumentMetadataRepository(db).save(**metadata)
+    return metadata
+
+
+def inputs_metadata(db: Session, paths: list[str]) -> dict[str, dict]:
+    """
+    Metadata of the given inputs. Inputs that were not inspected when
+    their upload completed are inspected now, once.
+    """
+    stored = DocumentMetadataRepository(db).get_many(paths)
+    found = {}
+    for path in paths:
+        record = stored.get(path)
+        if record is not None:
+            found[path] = {column: getattr(record, column) for column in MESSAGE_METADATA}
+            continue
+        metadata = inspect_upload(db, path)
+        if metadata is not None:
+            found[path] = {column: metadata[column] for column in MESSAGE_METADATA}
+    return found
+
+
+def annotate_job(db: Session, message: dict) -> dict:
+    """
+    Adds what is known about the inputs and the estimated conversion
+    time to a job message, and rejects inputs no engine can open.
+    """
+    paths = message["path"] if isinstance(message["path"], list) else [message["path"]]
+    metadata = inputs_metadata(db, paths)
+
+    locked = [path for path, item in metadata.items() if item["encrypted"]]
+    if locked:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Password protected documents cannot be converted: {', '.join(locked)}")
+
+    page_count = size_bytes = None
+    if len(metadata) == len(paths):
+        if all(item["page_count"] for item in metadata.values()):
+            page_count = sum(item["page_count"] for item in metadata.values())
+        if all(item["size_bytes"] is not None for item in metadata.values()):
+            size_bytes = sum(item["size_bytes"] for item in metadata.values())
+
+    if len(paths) == 1 and paths[0] in metadata:
+        message["metadata"] = metadata[paths[0]]
+    elif page_count is not None:
+        message["metadata"] = {"page_count": page_count}
+
+    message["estimated_seconds"] = estimate_job_seconds(
+        db, message["target_format"], message["path"], page_count, size_bytes)
+    return message
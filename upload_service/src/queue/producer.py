@@ -1,12 +1,22 @@
 import json
+import time
 import aio_pika
 from upload_service.src.config.rabbitmq_connection import get_rabbit_connection
 from upload_service.settings import settings
+from shared_database.models import SubscriptionPlan
 
 connection = None
 channel = None
 main_exchange = None
 
+# Message priority per plan; main_queue is declared with x-max-priority 10
+# by the conversion workers, so paid plans are delivered first.
+PLAN_PRIORITIES = {
+    SubscriptionPlan.free: 1,
+    SubscriptionPlan.pro: 5,
+    SubscriptionPlan.enterprise: 9,
+}
+
 
 async def init_rabbitmq():
 
@@ -18,14 +28,17 @@ async def init_rabbitmq():
     main_exchange = await channel.declare_exchange("main_exchange", durable=True)
 
 
-async def publish_job(message: dict):
+async def publish_job(message: dict, plan: SubscriptionPlan = SubscriptionPlan.free):
     await main_exchange.publish(
         aio_pika.Message(
             body=json.dumps({
                 **message,
-                "retry_count": 0
+                "plan": plan.value,
+                "retry_count": 0,
+                "published_at": time.time()
             }).encode(),
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            priority=PLAN_PRIORITIES[plan]
         ),
         routing_key="main"
     )
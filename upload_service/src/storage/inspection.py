@@ -0,0 +1,243 @@
+import io
+import re
+import zipfile
+from typing import Optional
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+from pypdf import PdfReader
+
+from upload_service.settings import settings
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+EXTENDED = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}"
+# Password protected OOXML files are OLE compound files, not ZIPs
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Share of sampled pages that only carry images above which a PDF
+# counts as scanned
+SCANNED_RATIO = 0.8
+
+
+class ReadBudgetExceeded(Exception):
+    pass
+
+
+class RangedObject(io.RawIOBase):
+    """
+    A read-only, seekable view of a storage object that fetches only the
+    blocks that are read, with ranged GETs. Parsers that seek to the
+    structures they need (the PDF xref, the ZIP central directory) then
+    read a few KB of a document instead of all of it.
+    """
+
+    def __init__(self, client: httpx.Client, url: str, size: int,
+                 block_size: int, max_bytes: int):
+        self._client = client
+        self._url = url
+        self.size = size
+        self._block_size = block_size
+        self._max_bytes = max_bytes
+        self._blocks: dict[int, bytes] = {}
+        self._pos = 0
+        self.fetched = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        n = min(len(view), self.size - self._pos)
+        if n <= 0:
+            return 0
+        done = 0
+        while done < n:
+            index, offset = divmod(self._pos + done, self._block_size)
+            block = self._block(index)
+            take = min(n - done, len(block) - offset)
+            if take <= 0:
+                break
+            view[done:done + take] = block[offset:offset + take]
+            done += take
+        self._pos += done
+        return done
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is None:
+            if self.fetched >= self._max_bytes:
+                raise ReadBudgetExceeded(
+                    f"Read more than {self._max_bytes} bytes")
+            start = index * self._block_size
+            end = min(start + self._block_size, self.size) - 1
+            response = self._client.get(
+                self._url, headers={"Range": f"bytes={start}-{end}"})
+            response.raise_for_status()
+            block = response.content
+            self.fetched += len(block)
+            self._blocks[index] = block
+        return block
+
+
+class DocumentInspector:
+    """
+    Reads what a document is like (pages, encryption, images) from its
+    structure only: the xref and page tree of a PDF, the central
+    directory and document part of a DOCX. Nothing is rendered and at
+    most INSPECT_MAX_BYTES of the object are fetched.
+    """
+
+    def __init__(self):
+        self._base_url = f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1"
+        self._client = httpx.Client(
+            headers={
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+                "apikey": settings.SUPABASE_SERVICE_KEY,
+            },
+            timeout=httpx.Timeout(settings.INSPECT_TIMEOUT, connect=10),
+        )
+
+    def _object_url(self, path: str) -> str:
+        return f"{self._base_url}/object/{settings.SUPABASE_BUCKET}/{quote(path.lstrip('/'))}"
+
+    def inspect(self, path: str) -> Optional[dict]:
+        """
+        Metadata of the object at ``path`` in the upload bucket, or None
+        when it cannot be reached.
+        """
+        url = self._object_url(path)
+        try:
+            response = self._client.head(url)
+            response.raise_for_status()
+            size = int(response.headers["content-length"])
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            print(f"[upload] could not inspect {path}: {e}")
+            return None
+
+        kind = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+        metadata = {"kind": kind[:8], "size_bytes": size, "page_count": None,
+                    "encrypted": False, "scanned": None, "image_ratio": None,
+                    "details": {}}
+        if size == 0 or kind not in ("pdf", "docx"):
+            return metadata
+
+        stream = RangedObject(self._client, url, size,
+                              settings.INSPECT_BLOCK_SIZE, settings.INSPECT_MAX_BYTES)
+        try:
+            if kind == "pdf":
+                _inspect_pdf(stream, metadata)
+            else:
+                _inspect_docx(stream, metadata)
+        except ReadBudgetExceeded:
+            metadata["details"]["partial"] = True
+        except httpx.HTTPError as e:
+            print(f"[upload] could not inspect {path}: {e}")
+            return None
+        except Exception as e:
+            # A document the parser cannot read is still handed to the
+            # workers, whose engines are more forgiving.
+            metadata["details"]["error"] = str(e)[:200]
+        metadata["details"]["bytes_read"] = stream.fetched
+        return metadata
+
+
+def _inspect_pdf(stream: RangedObject, metadata: dict) -> None:
+    reader = PdfReader(stream)
+    details = metadata["details"]
+    details["pdf_version"] = reader.pdf_header.replace("%PDF-", "")
+
+    if reader.is_encrypted and not reader.decrypt(""):
+        metadata["encrypted"] = True
+        return
+
+    root = reader.trailer["/Root"]
+    details["has_forms"] = "/AcroForm" in root
+    count = root["/Pages"].get("/Count")
+    metadata["page_count"] = int(count) if count is not None else len(reader.pages)
+    if not metadata["page_count"]:
+        return
+
+    # Resources only, the content streams are not read. A page that
+    # draws XObjects but has no fonts is an image of a page.
+    page_count = metadata["page_count"]
+    samples = min(page_count, settings.INSPECT_SAMPLE_PAGES)
+    image_pages = 0
+    try:
+        for i in range(samples):
+            page = reader.pages[i * page_count // samples]
+            resources = page.get("/Resources")
+            resources = resources.get_object() if resources is not None else {}
+            if resources.get("/XObject") and not resources.get("/Font"):
+                image_pages += 1
+            details["sampled_pages"] = i + 1
+    except ReadBudgetExceeded:
+        details["partial"] = True
+    sampled = details.get("sampled_pages")
+    if sampled:
+        metadata["image_ratio"] = round(image_pages / sampled, 3)
+        metadata["scanned"] = metadata["image_ratio"] >= SCANNED_RATIO
+
+
+def _inspect_docx(stream: RangedObject, metadata: dict) -> None:
+    if stream.read(len(OLE_MAGIC)) == OLE_MAGIC:
+        metadata["encrypted"] = True
+        return
+    stream.seek(0)
+
+    details = metadata["details"]
+    with zipfile.ZipFile(stream) as archive:
+        names = set(archive.namelist())
+        media = [info for info in archive.infolist() if info.filename.startswith("word/media/")]
+        details["images"] = len(media)
+        metadata["image_ratio"] = round(
+            min(1.0, sum(info.compress_size for info in media) / metadata["size_bytes"]), 3)
+
+        if "docProps/app.xml" in names:
+            app = ElementTree.fromstring(archive.read("docProps/app.xml"))
+            pages = app.findtext(f"{EXTENDED}Pages")
+            if pages and pages.isdigit() and int(pages) > 0:
+                metadata["page_count"] = int(pages)
+
+        if "word/document.xml" in names:
+            with archive.open("word/document.xml") as part:
+                details.update(_document_stats(part))
+            metadata["scanned"] = details["words"] == 0 and bool(media)
+
+
+def _document_stats(part) -> dict:
+    """
+    Counts of the body of ``word/document.xml``, parsed as a stream.
+    """
+    stats = {"paragraphs": 0, "tables": 0, "drawings": 0, "page_breaks": 0, "words": 0}
+    for _, element in ElementTree.iterparse(part):
+        tag = element.tag
+        if tag == f"{W}p":
+            stats["paragraphs"] += 1
+            element.clear()
+        elif tag == f"{W}t":
+            stats["words"] += len(re.findall(r"\S+", element.text or ""))
+        elif tag == f"{W}tbl":
+            stats["tables"] += 1
+        elif tag in (f"{W}drawing", f"{W}pict"):
+            stats["drawings"] += 1
+        elif tag == f"{W}br" and element.get(f"{W}type") == "page":
+            stats["page_breaks"] += 1
+    return stats
+
+
+document_inspector = DocumentInspector()